@@ -1,93 +1,255 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, File, Form, UploadFile
+from pydantic import ValidationError
+from sqlalchemy import insert, or_
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date
-from app.db.database import get_db
+from itertools import groupby
+import csv
+import io
+import numpy as np
+from app.db.database import get_db, get_read_db
 from app.db.models import User, Attendance, Grade, Student, Course
+from app.db.attendance_bitmaps import load_bitmaps, mark_attendance, summarize
+from app.db.bulk import update_rows
+from app.db.grade_scales import load_scales, scale_for_grade
 from app.schemas.academic import (
-    AttendanceCreate, AttendanceUpdate, AttendanceResponse, AttendanceWithDetails,
-    GradeCreate, GradeUpdate, GradeResponse, GradeWithDetails
+    AttendanceCreate, AttendanceUpdate, AttendanceResponse, AttendanceWithDetails, AttendanceSummary,
+    GradeCreate, GradeUpdate, GradeResponse, GradeWithDetails, GradeStatistics, GradeCurveRequest, GradeCurveResult,
+    GRADE_BULK_MAX_ROWS, GradeBulkRow, GradeBulkAssessment, GradeBulkCreate, GradeBulkRowResult, GradeBulkResult
 )
 from app.auth.dependencies import get_current_user, require_faculty
+from app.core.fieldsets import fieldset_model, parse_fields, select_columns
+from app.core.grading import DEFAULT_SCALE, LetterScale, curve, score_statistics
+from app.core.list_query import ListSpec
+from app.core.serialization import json_response
 
 router = APIRouter()
 
+ATTENDANCE_LIST = ListSpec(
+    Attendance,
+    filters=["student_id", "course_id", "date"],
+    sorts=["id", "date"],
+    default_sort="-date",
+)
+
+GRADE_LIST = ListSpec(
+    Grade,
+    filters=["student_id", "course_id", "assessment_type", "date_assessed"],
+    sorts=["id", "date_assessed"],
+    default_sort="date_assessed",
+)
 
-def calculate_letter_grade(percentage: float) -> str:
+
+def calculate_letter_grade(percentage: float, scale: LetterScale = DEFAULT_SCALE) -> str:
     """Calculate letter grade based on percentage"""
-    if percentage >= 90:
-        return 'A+'
-    elif percentage >= 80:
-        return 'A'
-    elif percentage >= 75:
-        return 'B+'
-    elif percentage >= 70:
-        return 'B'
-    elif percentage >= 65:
-        return 'C+'
-    elif percentage >= 60:
-        return 'C'
-    elif percentage >= 50:
-        return 'D'
+    return scale.letter(percentage)
+
+
+def _raw_percentages(scores: np.ndarray, max_scores: np.ndarray) -> np.ndarray:
+    return scores / max_scores * 100
+
+
+def _lock_course(db: Session, course_id: int) -> Optional[Course]:
+    """Load a course and serialize bulk grade entry for it until the transaction ends.
+
+    Postgres takes FOR NO KEY UPDATE on the course row, which still lets single grades be
+    inserted for the course meanwhile. SQLite ignores FOR UPDATE, so a no-op UPDATE takes the
+    database write lock first; a concurrent import then waits and sees the committed rows
+    instead of inserting duplicates. It sets ``updated_at`` to itself so the column's
+    ``onupdate`` does not fire.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        db.query(Course).filter(Course.id == course_id).update(
+            {Course.updated_at: Course.updated_at}, synchronize_session=False
+        )
+    return db.query(Course).filter(Course.id == course_id).with_for_update(key_share=True).first()
+
+
+def _upsert_grades(
+    db: Session,
+    assessment: GradeBulkAssessment,
+    rows: List[Tuple[int, GradeBulkRow]],
+    invalid: List[GradeBulkRowResult]
+) -> dict:
+    """Create or replace the grade of each student for one assessment, keyed by
+    (student, course, assessment_name), in a single transaction.
+
+    Rows that cannot be saved are reported and skipped; ``invalid`` carries rows already
+    rejected while parsing.
+    """
+    if not _lock_course(db, assessment.course_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    
+    ids = {row.student_id for _, row in rows if row.student_id is not None}
+    codes = {row.student_code for _, row in rows if row.student_id is None and row.student_code}
+    programs = {}
+    by_code = {}
+    for student in db.query(Student.id, Student.student_id, Student.program).filter(
+        or_(Student.id.in_(ids), Student.student_id.in_(codes))
+    ):
+        programs[student.id] = student.program
+        by_code[student.student_id] = student.id
+    
+    results = list(invalid)
+    valid = []
+    seen = set()
+    for row_no, row in rows:
+        student_id = row.student_id if row.student_id is not None else by_code.get(row.student_code)
+        if row.student_id is None and not row.student_code:
+            detail = "student_id or student_code is required"
+        elif student_id not in programs:
+            detail = "Student not found"
+        elif student_id in seen:
+            detail = "Student appears more than once in this batch"
+        else:
+            seen.add(student_id)
+            valid.append((row_no, student_id, row))
+            continue
+        results.append(GradeBulkRowResult(row=row_no, student_id=student_id, status="error", detail=detail))
+    
+    # Percentages and letter grades for the whole batch at once.
+    percentages = _raw_percentages(np.array([row.score for _, _, row in valid], dtype=float), assessment.max_score).round(2)
+    letters = load_scales(db).letters(assessment.course_id, [programs[student_id] for _, student_id, _ in valid], percentages)
+    
+    existing = {}
+    if valid:
+        for grade_id, student_id in db.query(Grade.id, Grade.student_id).filter(
+            Grade.course_id == assessment.course_id,
+            Grade.assessment_name == assessment.assessment_name,
+            Grade.student_id.in_(seen)
+        ).order_by(Grade.id).with_for_update(of=Grade):
+            existing.setdefault(student_id, []).append(grade_id)
+    
+    inserts, updates, created = [], [], []
+    for (row_no, student_id, row), percentage, letter_grade in zip(valid, percentages.tolist(), letters.tolist()):
+        values = {
+            "assessment_type": assessment.assessment_type,
+            "score": row.score,
+            "max_score": assessment.max_score,
+            "percentage": percentage,
+            "letter_grade": row.letter_grade or letter_grade,
+            "letter_grade_manual": bool(row.letter_grade),
+            "date_assessed": assessment.date_assessed,
+            "remarks": row.remarks,
+        }
+        result = GradeBulkRowResult(
+            row=row_no, student_id=student_id, status="updated" if student_id in existing else "created",
+            percentage=percentage, letter_grade=values["letter_grade"]
+        )
+        if student_id in existing:
+            # Earlier duplicates of the same assessment are all brought in line.
+            result.grade_id = existing[student_id][0]
+            updates.extend({"id": grade_id, **values} for grade_id in existing[student_id])
+        else:
+            inserts.append({"student_id": student_id, "course_id": assessment.course_id, "assessment_name": assessment.assessment_name, **values})
+            created.append(result)
+        results.append(result)
+    
+    if not assessment.dry_run:
+        grades = Grade.__table__
+        update_rows(db, grades, "id", updates)
+        if inserts:
+            new_ids = db.execute(insert(grades).returning(grades.c.id, sort_by_parameter_order=True), inserts).scalars().all()
+            for result, grade_id in zip(created, new_ids):
+                result.grade_id = grade_id
+        db.commit()
     else:
-        return 'F'
+        db.rollback()
+    
+    results.sort(key=lambda result: result.row)
+    return {
+        "course_id": assessment.course_id,
+        "assessment_name": assessment.assessment_name,
+        "dry_run": assessment.dry_run,
+        "created": len(created),
+        "updated": len(valid) - len(created),
+        "errors": len(results) - len(valid),
+        "rows": results,
+    }
+
+
+ATTENDANCE_DETAIL_COLUMNS = dict(
+    Attendance.__table__.columns.items(),
+    student_name=User.full_name,
+    student_code=Student.student_id,
+    course_name=Course.course_name,
+    course_code=Course.course_code,
+)
+
+GRADE_DETAIL_COLUMNS = dict(
+    Grade.__table__.columns.items(),
+    student_name=User.full_name,
+    student_code=Student.student_id,
+    course_name=Course.course_name,
+    course_code=Course.course_code,
+)
+
+
+def _attendance_details_query(db: Session, fields: Optional[List[str]] = None):
+    return db.query(*select_columns(ATTENDANCE_DETAIL_COLUMNS, fields)).join(
+        Student, Attendance.student_id == Student.id
+    ).join(
+        User, Student.user_id == User.id
+    ).join(
+        Course, Attendance.course_id == Course.id
+    )
+
+
+def _grade_details_query(db: Session, fields: Optional[List[str]] = None):
+    return db.query(*select_columns(GRADE_DETAIL_COLUMNS, fields)).join(
+        Student, Grade.student_id == Student.id
+    ).join(
+        User, Student.user_id == User.id
+    ).join(
+        Course, Grade.course_id == Course.id
+    )
+
+
+def _attendance_summaries(db: Session, student_id: Optional[int], course_ids: Optional[List[int]], date_from: Optional[date], date_to: Optional[date]):
+    rows = []
+    for bitmap in load_bitmaps(db.connection(), student_id, course_ids):
+        summary = summarize(bitmap, date_from, date_to)
+        if summary["sessions"]:
+            rows.append({"student_id": bitmap.student_id, "course_id": bitmap.course_id, **summary})
+    return rows
+
+
+def _sync_attendance_bitmap(db: Session, before: tuple, attendance: Attendance) -> None:
+    if before != (attendance.student_id, attendance.course_id, attendance.date):
+        mark_attendance(db, *before, None)
+    mark_attendance(db, attendance.student_id, attendance.course_id, attendance.date, attendance.status)
 
 
-@router.get("/attendance/", response_model=List[AttendanceWithDetails])
+@router.get("/attendance/", response_model=List[AttendanceWithDetails], openapi_extra=ATTENDANCE_LIST.openapi_extra())
 async def get_attendance(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
-    student_id: Optional[int] = None,
-    course_id: Optional[int] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_faculty)
 ):
+    wanted = parse_fields(fields, AttendanceWithDetails)
     # Use joins for efficient querying (Student -> User for full_name)
-    query = db.query(
-        Attendance,
-        User.full_name.label('student_name'),
-        Student.student_id.label('student_code'),
-        Course.course_name.label('course_name'),
-        Course.course_code.label('course_code')
-    ).join(
-        Student, Attendance.student_id == Student.id
-    ).join(
-        User, Student.user_id == User.id
-    ).join(
-        Course, Attendance.course_id == Course.id
-    )
+    query = _attendance_details_query(db, ATTENDANCE_LIST.projection(wanted, sort))
     
-    if student_id:
-        query = query.filter(Attendance.student_id == student_id)
-    if course_id:
-        query = query.filter(Attendance.course_id == course_id)
     if date_from:
         query = query.filter(Attendance.date >= date_from)
     if date_to:
         query = query.filter(Attendance.date <= date_to)
     
-    records = query.order_by(Attendance.date.desc()).offset(skip).limit(limit).all()
-    
-    result = []
-    for record, student_name, student_code, course_name, course_code in records:
-        record_dict = {
-            "id": record.id,
-            "student_id": record.student_id,
-            "course_id": record.course_id,
-            "date": record.date,
-            "status": record.status,
-            "notes": record.notes,
-            "created_at": record.created_at,
-            "student_name": student_name,
-            "student_code": student_code,
-            "course_name": course_name,
-            "course_code": course_code
-        }
-        result.append(AttendanceWithDetails(**record_dict))
-    
-    return result
+    page = ATTENDANCE_LIST.apply(query, request.query_params, sort, cursor, skip)
+    records = page.query.offset(skip).limit(limit)
+    rows = [dict(record._mapping) for record in records]
+    return json_response(rows, List[fieldset_model(AttendanceWithDetails, wanted)], headers=page.headers(rows, limit))
 
 
 @router.post("/attendance/", response_model=AttendanceResponse, status_code=status.HTTP_201_CREATED)
@@ -110,6 +272,7 @@ async def create_attendance(
     
     db_attendance = Attendance(**attendance.model_dump())
     db.add(db_attendance)
+    mark_attendance(db, attendance.student_id, attendance.course_id, attendance.date, attendance.status)
     db.commit()
     db.refresh(db_attendance)
     return AttendanceResponse.model_validate(db_attendance)
@@ -122,7 +285,7 @@ async def get_my_attendance(
     course_id: Optional[int] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get attendance records for the currently logged-in student only"""
@@ -135,19 +298,7 @@ async def get_my_attendance(
         )
     
     # Query attendance only for this student
-    query = db.query(
-        Attendance,
-        User.full_name.label('student_name'),
-        Student.student_id.label('student_code'),
-        Course.course_name.label('course_name'),
-        Course.course_code.label('course_code')
-    ).join(
-        Student, Attendance.student_id == Student.id
-    ).join(
-        User, Student.user_id == User.id
-    ).join(
-        Course, Attendance.course_id == Course.id
-    ).filter(
+    query = _attendance_details_query(db).filter(
         Attendance.student_id == student.id
     )
     
@@ -158,26 +309,47 @@ async def get_my_attendance(
     if date_to:
         query = query.filter(Attendance.date <= date_to)
     
-    records = query.order_by(Attendance.date.desc()).offset(skip).limit(limit).all()
-    
-    result = []
-    for record, student_name, student_code, course_name, course_code in records:
-        record_dict = {
-            "id": record.id,
-            "student_id": record.student_id,
-            "course_id": record.course_id,
-            "date": record.date,
-            "status": record.status,
-            "notes": record.notes,
-            "created_at": record.created_at,
-            "student_name": student_name,
-            "student_code": student_code,
-            "course_name": course_name,
-            "course_code": course_code
-        }
-        result.append(AttendanceWithDetails(**record_dict))
-    
-    return result
+    records = query.order_by(Attendance.date.desc()).offset(skip).limit(limit)
+    rows = [dict(record._mapping) for record in records]
+    return json_response(rows, List[AttendanceWithDetails])
+
+
+@router.get("/attendance/summary", response_model=List[AttendanceSummary])
+async def get_attendance_summary(
+    student_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_faculty)
+):
+    """Attendance totals and percentage per student and course, from the attendance bitmaps"""
+    if student_id is None and course_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pass a student_id, a course_id or both"
+        )
+    rows = _attendance_summaries(db, student_id, [course_id] if course_id else None, date_from, date_to)
+    return json_response(rows, List[AttendanceSummary])
+
+
+@router.get("/attendance/me/summary", response_model=List[AttendanceSummary])
+async def get_my_attendance_summary(
+    course_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Attendance totals per course for the currently logged-in student only"""
+    student = db.query(Student).filter(Student.user_id == current_user.id).first()
+    if not student:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student profile not found"
+        )
+    rows = _attendance_summaries(db, student.id, [course_id] if course_id else None, date_from, date_to)
+    return json_response(rows, List[AttendanceSummary])
 
 
 @router.get("/attendance/{attendance_id}", response_model=AttendanceWithDetails)
@@ -236,9 +408,11 @@ async def update_attendance(
             detail="Attendance record not found"
         )
     
+    before = (attendance.student_id, attendance.course_id, attendance.date)
     update_data = attendance_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(attendance, field, value)
+    _sync_attendance_bitmap(db, before, attendance)
     
     db.commit()
     db.refresh(attendance)
@@ -259,9 +433,11 @@ async def update_attendance_full(
             detail="Attendance record not found"
         )
     
+    before = (attendance.student_id, attendance.course_id, attendance.date)
     update_data = attendance_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(attendance, field, value)
+    _sync_attendance_bitmap(db, before, attendance)
     
     db.commit()
     db.refresh(attendance)
@@ -282,66 +458,28 @@ async def delete_attendance(
         )
     
     db.delete(attendance)
+    mark_attendance(db, attendance.student_id, attendance.course_id, attendance.date, None)
     db.commit()
     return None
 
 
-@router.get("/grades/", response_model=List[GradeWithDetails])
+@router.get("/grades/", response_model=List[GradeWithDetails], openapi_extra=GRADE_LIST.openapi_extra())
 async def get_grades(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(500, ge=1, le=500),
-    student_id: Optional[int] = None,
-    course_id: Optional[int] = None,
-    assessment_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = db.query(
-        Grade,
-        User.full_name.label('student_name'),
-        Student.student_id.label('student_code'),
-        Course.course_name.label('course_name'),
-        Course.course_code.label('course_code')
-    ).join(
-        Student, Grade.student_id == Student.id
-    ).join(
-        User, Student.user_id == User.id
-    ).join(
-        Course, Grade.course_id == Course.id
-    )
-    
-    if student_id:
-        query = query.filter(Grade.student_id == student_id)
-    if course_id:
-        query = query.filter(Grade.course_id == course_id)
-    if assessment_type:
-        query = query.filter(Grade.assessment_type == assessment_type)
-    
-    records = query.order_by(Grade.date_assessed.asc().nullslast(), Grade.id.asc()).offset(skip).limit(limit).all()
-    
-    result = []
-    for record, student_name, student_code, course_name, course_code in records:
-        record_dict = {
-            "id": record.id,
-            "student_id": record.student_id,
-            "course_id": record.course_id,
-            "assessment_type": record.assessment_type,
-            "assessment_name": record.assessment_name,
-            "score": record.score,
-            "max_score": record.max_score,
-            "percentage": record.percentage,
-            "letter_grade": record.letter_grade,
-            "date_assessed": record.date_assessed,
-            "remarks": record.remarks,
-            "created_at": record.created_at,
-            "student_name": student_name,
-            "student_code": student_code,
-            "course_name": course_name,
-            "course_code": course_code
-        }
-        result.append(GradeWithDetails(**record_dict))
-    
-    return result
+    wanted = parse_fields(fields, GradeWithDetails)
+    query = _grade_details_query(db, GRADE_LIST.projection(wanted, sort))
+    page = GRADE_LIST.apply(query, request.query_params, sort, cursor, skip)
+    records = page.query.offset(skip).limit(limit)
+    rows = [dict(record._mapping) for record in records]
+    return json_response(rows, List[fieldset_model(GradeWithDetails, wanted)], headers=page.headers(rows, limit))
 
 
 @router.post("/grades/", response_model=GradeResponse, status_code=status.HTTP_201_CREATED)
@@ -351,6 +489,7 @@ async def create_grade(
     current_user: User = Depends(require_faculty)
 ):
     db_grade = Grade(**grade.model_dump())
+    setattr(db_grade, 'letter_grade_manual', bool(grade.letter_grade))
     
     if grade.max_score > 0:
         percentage_value = (grade.score / grade.max_score) * 100
@@ -358,7 +497,7 @@ async def create_grade(
         
         # Auto-calculate letter grade if not provided
         if not grade.letter_grade:
-            letter_grade = calculate_letter_grade(percentage_value)
+            letter_grade = calculate_letter_grade(percentage_value, scale_for_grade(db, grade.course_id, grade.student_id))
             setattr(db_grade, 'letter_grade', letter_grade)
     
     db.add(db_grade)
@@ -367,6 +506,159 @@ async def create_grade(
     return GradeResponse.model_validate(db_grade)
 
 
+@router.get("/grades/statistics", response_model=List[GradeStatistics])
+async def get_grade_statistics(
+    course_id: int,
+    assessment_name: Optional[str] = None,
+    raw: bool = Query(False, description="Use score / max_score instead of the (possibly curved) percentage"),
+    bins: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_faculty)
+):
+    """Score statistics and histogram for each assessment of a course"""
+    query = db.query(
+        Grade.assessment_name, Grade.assessment_type, Grade.score, Grade.max_score, Grade.percentage
+    ).filter(Grade.course_id == course_id, Grade.max_score > 0)
+    if assessment_name:
+        query = query.filter(Grade.assessment_name == assessment_name)
+    
+    result = []
+    for name, rows in groupby(query.order_by(Grade.assessment_name), key=lambda row: row.assessment_name):
+        rows = list(rows)
+        if raw:
+            percentages = _raw_percentages(np.array([row.score for row in rows], dtype=float), np.array([row.max_score for row in rows], dtype=float))
+        else:
+            percentages = np.array([row.percentage for row in rows if row.percentage is not None], dtype=float)
+        result.append({
+            "course_id": course_id,
+            "assessment_type": rows[0].assessment_type,
+            "assessment_name": name,
+            **score_statistics(percentages, bins),
+        })
+    return json_response(result, List[GradeStatistics])
+
+
+@router.post("/grades/curve", response_model=GradeCurveResult)
+async def curve_grades(
+    request: GradeCurveRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_faculty)
+):
+    """Rewrite percentage and letter grade of every grade of an assessment from its raw scores"""
+    rows = db.query(Grade.id, Grade.score, Grade.max_score, Grade.percentage, Student.program).join(
+        Student, Grade.student_id == Student.id
+    ).filter(
+        Grade.course_id == request.course_id,
+        Grade.assessment_name == request.assessment_name,
+        Grade.max_score > 0
+    ).order_by(Grade.id).with_for_update(of=Grade).all()
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No grades found for this assessment"
+        )
+    
+    raw = _raw_percentages(np.array([row.score for row in rows], dtype=float), np.array([row.max_score for row in rows], dtype=float))
+    try:
+        curved = curve(raw, request.method, request.target_mean, request.target_max, request.target_std)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    letters = load_scales(db).letters(request.course_id, [row.program for row in rows], curved)
+    
+    if not request.dry_run:
+        update_rows(db, Grade.__table__, "id", [
+            {"id": row.id, "percentage": percentage, "letter_grade": letter_grade, "letter_grade_manual": False}
+            for row, percentage, letter_grade in zip(rows, curved.tolist(), letters.tolist())
+        ])
+        db.commit()
+    else:
+        db.rollback()
+    
+    current = np.array([row.percentage for row in rows if row.percentage is not None], dtype=float)
+    names, counts = np.unique(letters.astype(str), return_counts=True)
+    return {
+        "course_id": request.course_id,
+        "assessment_name": request.assessment_name,
+        "method": request.method,
+        "dry_run": request.dry_run,
+        "updated": 0 if request.dry_run else len(rows),
+        "letter_grades": dict(zip(names.tolist(), counts.tolist())),
+        "before": score_statistics(current),
+        "after": score_statistics(curved),
+    }
+
+
+@router.post("/grades/bulk", response_model=GradeBulkResult)
+async def bulk_upsert_grades(
+    request: GradeBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_faculty)
+):
+    """Enter the marks of many students for one assessment; re-submitting replaces them"""
+    return _upsert_grades(db, request, list(enumerate(request.grades, start=1)), [])
+
+
+@router.post("/grades/import", response_model=GradeBulkResult)
+async def import_grades(
+    file: UploadFile = File(..., description="CSV with a score column, student_id or student_code, and optional letter_grade and remarks"),
+    course_id: int = Form(...),
+    assessment_type: str = Form(...),
+    assessment_name: str = Form(..., min_length=1, max_length=255),
+    max_score: float = Form(..., gt=0),
+    date_assessed: Optional[date] = Form(None),
+    dry_run: bool = Form(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_faculty)
+):
+    """Bulk grade entry from a CSV file; ``row`` in the report counts data rows from 1"""
+    try:
+        content = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The file must be UTF-8 encoded CSV"
+        )
+    reader = csv.DictReader(io.StringIO(content))
+    columns = set(reader.fieldnames or [])
+    if "score" not in columns or not columns & {"student_id", "student_code"}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The CSV needs a score column and a student_id or student_code column"
+        )
+    
+    rows, invalid = [], []
+    for row_no, record in enumerate(reader, start=1):
+        if row_no > GRADE_BULK_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {GRADE_BULK_MAX_ROWS} grades can be imported at once"
+            )
+        values = {key: value.strip() for key, value in record.items() if key in GradeBulkRow.model_fields and value and value.strip()}
+        try:
+            rows.append((row_no, GradeBulkRow(**values)))
+        except ValidationError as exc:
+            detail = "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors())
+            invalid.append(GradeBulkRowResult(row=row_no, status="error", detail=detail))
+    if not rows and not invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The CSV has no grades"
+        )
+    
+    assessment = GradeBulkAssessment(
+        course_id=course_id,
+        assessment_type=assessment_type,
+        assessment_name=assessment_name,
+        max_score=max_score,
+        date_assessed=date_assessed,
+        dry_run=dry_run
+    )
+    return _upsert_grades(db, assessment, rows, invalid)
+
+
 @router.get("/grades/{grade_id}", response_model=GradeWithDetails)
 async def get_grade_by_id(
     grade_id: int,
@@ -431,6 +723,8 @@ async def update_grade(
     update_data = grade_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(grade, field, value)
+    if "letter_grade" in update_data:
+        setattr(grade, 'letter_grade_manual', bool(update_data["letter_grade"]))
     
     if "score" in update_data or "max_score" in update_data:
         max_score_val = getattr(grade, 'max_score', 0)
@@ -441,7 +735,7 @@ async def update_grade(
             
             # Auto-calculate letter grade if not provided
             if not getattr(grade, 'letter_grade', None):
-                letter_grade = calculate_letter_grade(percentage_value)
+                letter_grade = calculate_letter_grade(percentage_value, scale_for_grade(db, grade.course_id, grade.student_id))
                 setattr(grade, 'letter_grade', letter_grade)
     
     db.commit()
@@ -466,6 +760,8 @@ async def update_grade_full(
     update_data = grade_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(grade, field, value)
+    if "letter_grade" in update_data:
+        setattr(grade, 'letter_grade_manual', bool(update_data["letter_grade"]))
     
     if "score" in update_data or "max_score" in update_data:
         max_score_val = getattr(grade, 'max_score', 0)
@@ -476,7 +772,7 @@ async def update_grade_full(
             
             # Auto-calculate letter grade if not provided
             if not getattr(grade, 'letter_grade', None):
-                letter_grade = calculate_letter_grade(percentage_value)
+                letter_grade = calculate_letter_grade(percentage_value, scale_for_grade(db, grade.course_id, grade.student_id))
                 setattr(grade, 'letter_grade', letter_grade)
     
     db.commit()
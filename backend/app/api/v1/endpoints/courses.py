@@ -1,27 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import date as DateType
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.db.database import get_db
-from app.db.models import User, Course
-from app.schemas.course import CourseCreate, CourseUpdate, CourseResponse, CourseWithFaculty
+from app.db.database import get_db, get_read_db
+from app.db.fee_balances import refresh_fee_balances
+from app.db.semesters import ensure_semester, find_semester
+from app.db.models import User, Course, Enrollment, Student, Attendance, StudentCourseFee
+from app.schemas.course import CourseCreate, CourseUpdate, CourseResponse, CourseWithFaculty, CourseRosterEntry
 from app.auth.dependencies import get_current_user, require_admin, require_faculty
+from app.core import response_cache
+from app.core.serialization import json_response
+from app.jobs.cascade_delete import start_background_delete
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[CourseWithFaculty])
 async def get_courses(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     semester: Optional[str] = None,
+    semester_id: Optional[int] = None,
     is_active: Optional[bool] = None,
     db: Session = Depends(get_db),
     _current_user: User = Depends(get_current_user)
 ):
+    cache = response_cache.CachedRequest(request, "courses", "users")
+    if cache.hit is not None:
+        return cache.hit
+    
     query = db.query(Course)
     
-    if semester:
-        query = query.filter(Course.semester == semester)
+    if semester and semester_id is None:
+        semester_id = find_semester(db, semester)
+        if semester_id is None:
+            return cache.respond([], List[CourseWithFaculty])
+    if semester_id is not None:
+        query = query.filter(Course.semester_id == semester_id)
     if is_active is not None:
         query = query.filter(Course.is_active == is_active)
     
@@ -37,15 +54,20 @@ async def get_courses(
             })
         result.append(CourseWithFaculty(**course_dict))
     
-    return result
+    return cache.respond(result, List[CourseWithFaculty])
 
 
 @router.get("/{course_id}", response_model=CourseWithFaculty)
 async def get_course(
     course_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     _current_user: User = Depends(get_current_user)
 ):
+    cache = response_cache.CachedRequest(request, "courses", "users")
+    if cache.hit is not None:
+        return cache.hit
+    
     course = db.query(Course).filter(Course.id == course_id).first()
     if not course:
         raise HTTPException(
@@ -59,7 +81,49 @@ async def get_course(
             "faculty_name": course.faculty.full_name,
             "faculty_email": course.faculty.email
         })
-    return CourseWithFaculty(**course_dict)
+    return cache.respond(CourseWithFaculty(**course_dict), CourseWithFaculty)
+
+
+@router.get("/{course_id}/roster", response_model=List[CourseRosterEntry])
+async def get_course_roster(
+    course_id: int,
+    date: Optional[DateType] = None,
+    db: Session = Depends(get_read_db),
+    _current_user: User = Depends(require_faculty)
+):
+    """Students enrolled in the course, each with their attendance for ``date`` (default today) if already marked."""
+    date = date or DateType.today()
+    rows = db.query(
+        Student.id.label("student_id"),
+        Student.student_id.label("student_code"),
+        User.full_name.label("full_name"),
+        User.email.label("email"),
+        Enrollment.status.label("enrollment_status"),
+        Enrollment.enrollment_date.label("enrollment_date"),
+        Attendance.id.label("attendance_id"),
+        Attendance.status.label("attendance_status"),
+        Attendance.notes.label("attendance_notes"),
+    ).join(
+        Student, Enrollment.student_id == Student.id
+    ).join(
+        User, Student.user_id == User.id
+    ).outerjoin(
+        Attendance, and_(
+            Attendance.course_id == Enrollment.course_id,
+            Attendance.date == date,
+            Attendance.student_id == Enrollment.student_id,
+        )
+    ).filter(
+        Enrollment.course_id == course_id,
+        Enrollment.status.in_(["active", "completed"]),
+    ).order_by(Student.student_id).all()
+
+    if not rows and not db.query(Course.id).filter(Course.id == course_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    return json_response([dict(row._mapping) for row in rows], List[CourseRosterEntry])
 
 
 @router.post("/", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
@@ -83,9 +147,10 @@ async def create_course(
                 detail="Invalid faculty ID"
             )
     
-    db_course = Course(**course.model_dump())
+    db_course = Course(**course.model_dump(), semester_id=ensure_semester(db, course.semester))
     db.add(db_course)
     db.commit()
+    response_cache.invalidate("courses")
     db.refresh(db_course)
     return CourseResponse.model_validate(db_course)
 
@@ -126,10 +191,14 @@ async def update_course(
                 detail="Invalid faculty ID"
             )
     
+    if "semester" in update_data:
+        update_data["semester_id"] = ensure_semester(db, update_data["semester"])
+    
     for field, value in update_data.items():
         setattr(course, field, value)
     
     db.commit()
+    response_cache.invalidate("courses")
     db.refresh(course)
     return CourseResponse.model_validate(course)
 
@@ -141,14 +210,20 @@ async def bulk_update_course_semester(
     _current_user: User = Depends(require_faculty)
 ):
     """Update semester for all courses at once (Admin/Faculty only)"""
-    result = db.query(Course).update({"semester": semester})
+    semester_id = ensure_semester(db, semester)
+    # Courses already in the semester are left untouched.
+    result = db.query(Course).filter(Course.semester_id.is_distinct_from(semester_id)).update(
+        {"semester": semester, "semester_id": semester_id}, synchronize_session=False
+    )
     db.commit()
+    response_cache.invalidate("courses")
     return {"message": f"Successfully updated semester to '{semester}' for {result} courses", "updated_count": result}
 
 
 @router.delete("/{course_id}")
 async def delete_course(
     course_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     _current_user: User = Depends(require_admin)
 ):
@@ -159,8 +234,17 @@ async def delete_course(
             detail="Course not found"
         )
     
+    job = start_background_delete(db, "courses", course_id)
+    if job is not None:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {"message": "Course deletion started", "job_id": job.id}
+
+    # The course's fee records are deleted with it, which changes those students' fee totals.
+    fee_student_ids = [row.student_id for row in db.query(StudentCourseFee.student_id).filter(StudentCourseFee.course_id == course_id)]
     db.delete(course)
+    refresh_fee_balances(db, fee_student_ids)
     db.commit()
+    response_cache.invalidate("courses")
     return {"message": "Course deleted successfully"}
 
 
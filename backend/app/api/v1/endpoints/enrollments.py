@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.database import get_db
@@ -7,44 +7,57 @@ from app.schemas.enrollment import (
     EnrollmentCreate, EnrollmentUpdate, EnrollmentResponse, EnrollmentWithDetails
 )
 from app.auth.dependencies import get_current_user, require_admin, require_faculty
+from app.core.fieldsets import fieldset_model, parse_fields, select_columns
+from app.core.list_query import ListSpec
+from app.core.serialization import json_response
 
 router = APIRouter()
 
+ENROLLMENT_LIST = ListSpec(
+    Enrollment,
+    filters=["student_id", "course_id", "status", "enrollment_date"],
+    sorts=["id", "enrollment_date"],
+    default_sort="id",
+)
+
+
+ENROLLMENT_DETAIL_COLUMNS = dict(
+    Enrollment.__table__.columns.items(),
+    student_name=User.full_name,
+    student_email=User.email,
+    student_code=Student.student_id,
+    course_name=Course.course_name,
+    course_code=Course.course_code,
+)
+
+
+def _enrollment_details_query(db: Session, fields: Optional[List[str]] = None):
+    return db.query(*select_columns(ENROLLMENT_DETAIL_COLUMNS, fields)).join(
+        Student, Enrollment.student_id == Student.id
+    ).join(
+        User, Student.user_id == User.id
+    ).join(
+        Course, Enrollment.course_id == Course.id
+    )
 
-@router.get("/", response_model=List[EnrollmentWithDetails])
+
+@router.get("/", response_model=List[EnrollmentWithDetails], openapi_extra=ENROLLMENT_LIST.openapi_extra())
 async def get_enrollments(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    student_id: Optional[int] = None,
-    course_id: Optional[int] = None,
-    status: Optional[str] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_faculty)
 ):
-    query = db.query(Enrollment).join(Student).join(Course)
-    
-    if student_id:
-        query = query.filter(Enrollment.student_id == student_id)
-    if course_id:
-        query = query.filter(Enrollment.course_id == course_id)
-    if status:
-        query = query.filter(Enrollment.status == status)
-    
-    enrollments = query.offset(skip).limit(limit).all()
+    wanted = parse_fields(fields, EnrollmentWithDetails)
+    query = _enrollment_details_query(db, ENROLLMENT_LIST.projection(wanted, sort))
+    page = ENROLLMENT_LIST.apply(query, request.query_params, sort, cursor, skip)
     
-    result = []
-    for enrollment in enrollments:
-        enrollment_dict = EnrollmentResponse.model_validate(enrollment).model_dump()
-        enrollment_dict.update({
-            "student_name": enrollment.student.user.full_name,
-            "student_email": enrollment.student.user.email,
-            "student_code": enrollment.student.student_id,
-            "course_name": enrollment.course.course_name,
-            "course_code": enrollment.course.course_code
-        })
-        result.append(EnrollmentWithDetails(**enrollment_dict))
-    
-    return result
+    rows = [dict(row._mapping) for row in page.query.offset(skip).limit(limit)]
+    return json_response(rows, List[fieldset_model(EnrollmentWithDetails, wanted)], headers=page.headers(rows, limit))
 
 
 @router.get("/{enrollment_id}", response_model=EnrollmentWithDetails)
@@ -166,18 +179,5 @@ async def get_student_enrollments(
                 detail="Access forbidden"
             )
     
-    enrollments = db.query(Enrollment).filter(Enrollment.student_id == student_id).all()
-    
-    result = []
-    for enrollment in enrollments:
-        enrollment_dict = EnrollmentResponse.model_validate(enrollment).model_dump()
-        enrollment_dict.update({
-            "student_name": enrollment.student.user.full_name,
-            "student_email": enrollment.student.user.email,
-            "student_code": enrollment.student.student_id,
-            "course_name": enrollment.course.course_name,
-            "course_code": enrollment.course.course_code
-        })
-        result.append(EnrollmentWithDetails(**enrollment_dict))
-    
-    return result
+    rows = [dict(row._mapping) for row in _enrollment_details_query(db).filter(Enrollment.student_id == student_id)]
+    return json_response(rows, List[EnrollmentWithDetails])
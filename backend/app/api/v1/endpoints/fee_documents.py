@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.auth.dependencies import get_current_user
+from app.core import documents
+from app.core.fee_pdfs import LAYOUT_VERSION, RECEIPT, STATEMENT, render_receipt, render_statement
+from app.db.database import get_read_db
+from app.db.models import RoleEnum, Student, User
+from app.jobs.fee_statements import load_receipt, load_statements
+
+router = APIRouter()
+
+
+def _ensure_can_view(db: Session, current_user: User, student_id: int) -> None:
+    if current_user.role == RoleEnum.ADMIN:
+        return
+    if current_user.role == RoleEnum.STUDENT:
+        own = db.query(Student.id).filter(Student.user_id == current_user.id).scalar()
+        if own == student_id:
+            return
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Not allowed to view this student's fee documents",
+    )
+
+
+async def _statement_response(request: Request, db: Session, student_id: int) -> Response:
+    data = load_statements(db.connection(), [student_id]).get(student_id)
+    if data is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+    digest, body = await documents.get_or_render(STATEMENT, LAYOUT_VERSION, render_statement, data)
+    return documents.pdf_response(request, body, digest, f"fee-statement-{data['student']['code']}.pdf")
+
+
+@router.get("/students/{student_id}/statement")
+async def get_fee_statement(
+    student_id: int,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    _ensure_can_view(db, current_user, student_id)
+    return await _statement_response(request, db, student_id)
+
+
+@router.get("/my-statement")
+async def get_my_fee_statement(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    if current_user.role != RoleEnum.STUDENT:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only students can access this endpoint")
+
+    student = db.query(Student.id).filter(Student.user_id == current_user.id).first()
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student profile not found")
+    return await _statement_response(request, db, student.id)
+
+
+@router.get("/payments/{payment_no}/receipt")
+async def get_payment_receipt(
+    payment_no: str,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    data = load_receipt(db.connection(), payment_no)
+    if data is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payment not found")
+    _ensure_can_view(db, current_user, data["student_id"])
+    digest, body = await documents.get_or_render(RECEIPT, LAYOUT_VERSION, render_receipt, data)
+    return documents.pdf_response(request, body, digest, f"receipt-{data['payment_no']}.pdf")
@@ -1,13 +1,18 @@
-from datetime import date, datetime
+from datetime import datetime
 from decimal import Decimal
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only
 
 from app.auth.dependencies import get_current_user, require_admin
-from app.db.database import get_db
+from app.core.fees import recalculate_fee_record, to_decimal
+from app.core.fieldsets import fieldset_model, parse_fields
+from app.core.serialization import json_response
+from app.db.database import get_db, get_read_db, is_read_only
+from app.db.fee_balances import refresh_fee_balances
 from app.db.models import (
     Course,
     Enrollment,
@@ -19,6 +24,7 @@ from app.db.models import (
 )
 from app.schemas.fee import (
     EnrolledCourseOption,
+    FeePaymentVoid,
     FeeRecordCreate,
     FeeRecordPaymentCreate,
     FeeRecordPaymentResponse,
@@ -30,63 +36,73 @@ from app.schemas.fee import (
 
 router = APIRouter()
 
+IDEMPOTENT_REPLAY_HEADER = "Idempotent-Replayed"
 
-def _to_decimal(value: Optional[Decimal]) -> Decimal:
-    if value is None:
-        return Decimal("0.00")
-    return Decimal(str(value)).quantize(Decimal("0.01"))
-
-
-def _compute_status(due_date: date, balance_amount: Decimal) -> str:
-    if balance_amount <= Decimal("0.00"):
-        return "paid"
-    if date.today() > due_date:
-        return "overdue"
-    return "pending"
-
-
-def _is_late_fee_applicable(due_date: date, fee_amount: Decimal, late_fee_amount: Decimal, paid_amount: Decimal) -> bool:
-    if late_fee_amount <= Decimal("0.00"):
-        return False
-    if date.today() <= due_date:
-        return False
-    return paid_amount < (fee_amount + late_fee_amount)
-
-
-def _recalculate_fee_record(record: StudentCourseFee) -> bool:
-    r: Any = record
-    fee_amount = _to_decimal(r.fee_amount)
-    late_fee = _to_decimal(r.late_fee_amount)
-    paid_amount = _to_decimal(r.paid_amount)
-
-    effective_late = late_fee if _is_late_fee_applicable(r.due_date, fee_amount, late_fee, paid_amount) else Decimal("0.00")
-    total_amount = fee_amount + effective_late
-    balance_amount = total_amount - paid_amount
-    if balance_amount < Decimal("0.00"):
-        balance_amount = Decimal("0.00")
-
-    status = _compute_status(r.due_date, balance_amount)
-
-    changed = (
-        _to_decimal(r.total_amount) != total_amount
-        or _to_decimal(r.balance_amount) != balance_amount
-        or r.status != status
-    )
-
-    if changed:
-        setattr(r, "total_amount", total_amount)
-        setattr(r, "balance_amount", balance_amount)
-        setattr(r, "status", status)
+# Columns recalculate_fee_record reads or writes; loaded even when a narrower fieldset is requested.
+_FEE_LEDGER_COLUMNS = (
+    "id", "student_id", "course_id", "due_date", "fee_amount", "late_fee_amount",
+    "total_amount", "paid_amount", "balance_amount", "status",
+)
 
-    return changed
+_FEE_RECORD_RELATED_FIELDS = {
+    "student_name": lambda r: r.student.user.full_name if r.student and r.student.user else "",
+    "student_code": lambda r: r.student.student_id if r.student else "",
+    "course_name": lambda r: r.course.course_name if r.course else "",
+    "course_code": lambda r: r.course.course_code if r.course else "",
+}
 
 
-def _generate_payment_no(db: Session) -> str:
+def _generate_payment_no(db: Session, record_id: int) -> str:
     stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
     count_today = db.query(StudentCourseFeePayment).filter(
         StudentCourseFeePayment.payment_no.like(f"FEEPAY{datetime.utcnow().strftime('%Y%m%d')}%")
     ).count()
-    return f"FEEPAY{stamp}{count_today + 1:03d}"
+    # Postings on the same record are serialized by its lock; the record id keeps numbers
+    # generated in parallel for different records from colliding.
+    return f"FEEPAY{stamp}{count_today + 1:03d}-{record_id}"
+
+
+def _lock_fee_record(db: Session, record_id: int) -> Optional[StudentCourseFee]:
+    """Load a fee record and hold a write lock on it until the transaction ends.
+
+    Postgres locks the row with SELECT ... FOR UPDATE. SQLite ignores FOR UPDATE, so a no-op
+    UPDATE takes the database write lock first; a concurrent posting then waits and reads the
+    committed balance instead of a stale one. It sets ``updated_at`` to itself so the column's
+    ``onupdate`` does not fire.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        db.query(StudentCourseFee).filter(StudentCourseFee.id == record_id).update(
+            {StudentCourseFee.updated_at: StudentCourseFee.updated_at}, synchronize_session=False
+        )
+    return (
+        db.query(StudentCourseFee)
+        .filter(StudentCourseFee.id == record_id)
+        .populate_existing()
+        .with_for_update()
+        .first()
+    )
+
+
+def _find_idempotent_payment(
+    db: Session, idempotency_key: str, record_id: int, payload: FeeRecordPaymentCreate
+) -> Optional[StudentCourseFeePayment]:
+    payment = db.query(StudentCourseFeePayment).filter(
+        StudentCourseFeePayment.idempotency_key == idempotency_key
+    ).first()
+    if payment is None:
+        return None
+    p: Any = payment
+    if (
+        p.fee_record_id != record_id
+        or to_decimal(p.amount) != to_decimal(payload.amount)
+        or p.mode != payload.mode
+        or p.payment_date != payload.payment_date
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Idempotency-Key was already used for a different payment",
+        )
+    return payment
 
 
 def _record_to_response(record: StudentCourseFee) -> FeeRecordResponse:
@@ -118,6 +134,25 @@ def _record_to_response(record: StudentCourseFee) -> FeeRecordResponse:
     )
 
 
+def _fee_record_load_options(fields: List[str]) -> List[Any]:
+    columns = [name for name in StudentCourseFee.__table__.columns.keys() if name in fields or name in _FEE_LEDGER_COLUMNS]
+    options: List[Any] = [load_only(*(getattr(StudentCourseFee, name) for name in columns))]
+    if "student_code" in fields or "student_name" in fields:
+        options.append(joinedload(StudentCourseFee.student).load_only(Student.student_id))
+    if "student_name" in fields:
+        options.append(joinedload(StudentCourseFee.student).joinedload(Student.user).load_only(User.full_name))
+    if "course_code" in fields or "course_name" in fields:
+        options.append(joinedload(StudentCourseFee.course).load_only(Course.course_code, Course.course_name))
+    return options
+
+
+def _record_to_row(record: StudentCourseFee, fields: List[str]) -> Dict[str, Any]:
+    return {
+        name: _FEE_RECORD_RELATED_FIELDS[name](record) if name in _FEE_RECORD_RELATED_FIELDS else getattr(record, name)
+        for name in fields
+    }
+
+
 def _payment_to_response(payment: StudentCourseFeePayment) -> FeeRecordPaymentResponse:
     p: Any = payment
     student_name = p.student.user.full_name if p.student and p.student.user else ""
@@ -136,6 +171,8 @@ def _payment_to_response(payment: StudentCourseFeePayment) -> FeeRecordPaymentRe
         reference_no=p.reference_no,
         notes=p.notes,
         status=p.status,
+        voided_at=p.voided_at,
+        void_reason=p.void_reason,
         created_at=p.created_at,
     )
 
@@ -181,10 +218,14 @@ async def get_fee_records(
     status_filter: Optional[str] = Query(default=None, alias="status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     _current_user: User = Depends(require_admin),
 ):
+    wanted = parse_fields(fields, FeeRecordResponse)
     query = db.query(StudentCourseFee)
+    if wanted is not None:
+        query = query.options(*_fee_record_load_options(wanted))
 
     if student_id:
         query = query.filter(StudentCourseFee.student_id == student_id)
@@ -196,14 +237,24 @@ async def get_fee_records(
     records = query.order_by(StudentCourseFee.created_at.desc()).offset(skip).limit(limit).all()
 
     # Keep late-fee application and status accurate whenever records are fetched.
-    dirty = False
+    # Replica sessions still return the recalculated values but leave persisting them to the primary.
+    dirty = set()
     for record in records:
-        if _recalculate_fee_record(record):
-            dirty = True
-    if dirty:
+        if recalculate_fee_record(record):
+            dirty.add(record.student_id)
+
+    # Build the payload before committing so expired attributes are not reloaded row by row.
+    if wanted is None:
+        response: Any = [_record_to_response(record) for record in records]
+    else:
+        rows = [_record_to_row(record, wanted) for record in records]
+        response = json_response(rows, List[fieldset_model(FeeRecordResponse, wanted)])
+
+    if dirty and not is_read_only(db):
+        refresh_fee_balances(db, dirty)
         db.commit()
 
-    return [_record_to_response(record) for record in records]
+    return response
 
 
 @router.post("/records", response_model=FeeRecordResponse, status_code=status.HTTP_201_CREATED)
@@ -232,8 +283,8 @@ async def create_fee_record(
     if existing:
         raise HTTPException(status_code=400, detail="Fee record already exists for this student and course")
 
-    late_fee = _to_decimal(payload.late_fee_amount)
-    fee_amount = _to_decimal(payload.fee_amount)
+    late_fee = to_decimal(payload.late_fee_amount)
+    fee_amount = to_decimal(payload.fee_amount)
     total_amount = fee_amount
 
     record = StudentCourseFee(
@@ -252,8 +303,9 @@ async def create_fee_record(
         updated_by=current_user.id,
     )
 
-    _recalculate_fee_record(record)
+    recalculate_fee_record(record)
     db.add(record)
+    refresh_fee_balances(db, [payload.student_id])
     db.commit()
     db.refresh(record)
     return _record_to_response(record)
@@ -277,13 +329,13 @@ async def update_fee_record(
     if due_date_val < issue_date_val:
         raise HTTPException(status_code=400, detail="Due date cannot be before issue date")
 
-    fee_amount = _to_decimal(update_data.get("fee_amount", record.fee_amount))
-    late_fee = _to_decimal(update_data.get("late_fee_amount", record.late_fee_amount))
+    fee_amount = to_decimal(update_data.get("fee_amount", record.fee_amount))
+    late_fee = to_decimal(update_data.get("late_fee_amount", record.late_fee_amount))
 
     for field, value in update_data.items():
         setattr(record, field, value)
 
-    paid_amount = _to_decimal(getattr(record, "paid_amount"))
+    paid_amount = to_decimal(getattr(record, "paid_amount"))
     # Prevent lowering amounts below what is already paid.
     max_effective_total = fee_amount + late_fee
     if paid_amount > max_effective_total:
@@ -292,7 +344,8 @@ async def update_fee_record(
     setattr(record, "fee_amount", fee_amount)
     setattr(record, "late_fee_amount", late_fee)
     setattr(record, "updated_by", current_user.id)
-    _recalculate_fee_record(record)
+    recalculate_fee_record(record)
+    refresh_fee_balances(db, [record.student_id])
 
     db.commit()
     db.refresh(record)
@@ -312,6 +365,7 @@ async def delete_fee_record(
     # Delete associated payments first
     db.query(StudentCourseFeePayment).filter(StudentCourseFeePayment.fee_record_id == record_id).delete()
     db.delete(record)
+    refresh_fee_balances(db, [record.student_id])
     db.commit()
     return None
 
@@ -320,22 +374,39 @@ async def delete_fee_record(
 async def add_fee_payment(
     record_id: int,
     payload: FeeRecordPaymentCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(default=None, max_length=100),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
-    record = db.query(StudentCourseFee).filter(StudentCourseFee.id == record_id).first()
+    # A retried request returns the payment it already created instead of posting it twice.
+    if idempotency_key:
+        existing = _find_idempotent_payment(db, idempotency_key, record_id, payload)
+        if existing is not None:
+            response.headers[IDEMPOTENT_REPLAY_HEADER] = "true"
+            return _payment_to_response(existing)
+
+    record = _lock_fee_record(db, record_id)
     if not record:
         raise HTTPException(status_code=404, detail="Fee record not found")
 
-    _recalculate_fee_record(record)
+    if idempotency_key:
+        # The same key may have been committed by a concurrent request while we waited for the lock.
+        existing = _find_idempotent_payment(db, idempotency_key, record_id, payload)
+        if existing is not None:
+            db.rollback()
+            response.headers[IDEMPOTENT_REPLAY_HEADER] = "true"
+            return _payment_to_response(existing)
 
-    amount = _to_decimal(payload.amount)
-    balance = _to_decimal(getattr(record, "balance_amount"))
+    recalculate_fee_record(record)
+
+    amount = to_decimal(payload.amount)
+    balance = to_decimal(getattr(record, "balance_amount"))
     if amount > balance:
         raise HTTPException(status_code=400, detail="Payment exceeds pending balance")
 
     payment = StudentCourseFeePayment(
-        payment_no=_generate_payment_no(db),
+        payment_no=_generate_payment_no(db, record_id),
         fee_record_id=record.id,
         student_id=record.student_id,
         payment_date=payload.payment_date,
@@ -345,22 +416,106 @@ async def add_fee_payment(
         notes=payload.notes,
         received_by=current_user.id,
         status="posted",
+        idempotency_key=idempotency_key,
     )
     db.add(payment)
 
-    paid_amount = _to_decimal(getattr(record, "paid_amount")) + amount
+    paid_amount = to_decimal(getattr(record, "paid_amount")) + amount
     setattr(record, "paid_amount", paid_amount)
-    _recalculate_fee_record(record)
+    recalculate_fee_record(record)
     setattr(record, "updated_by", current_user.id)
+    refresh_fee_balances(db, [record.student_id])
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # The key was committed concurrently for another fee record and the unique index rejected this one.
+        db.rollback()
+        existing = _find_idempotent_payment(db, idempotency_key, record_id, payload) if idempotency_key else None
+        if existing is None:
+            raise
+        response.headers[IDEMPOTENT_REPLAY_HEADER] = "true"
+        return _payment_to_response(existing)
+    db.refresh(payment)
+    return _payment_to_response(payment)
+
+
+@router.get("/records/{record_id}/payments", response_model=List[FeeRecordPaymentResponse])
+async def get_fee_payments(
+    record_id: int,
+    db: Session = Depends(get_read_db),
+    _current_user: User = Depends(require_admin),
+):
+    record = db.query(StudentCourseFee).filter(StudentCourseFee.id == record_id).first()
+    if not record:
+        raise HTTPException(status_code=404, detail="Fee record not found")
+
+    payments = db.query(StudentCourseFeePayment).filter(
+        StudentCourseFeePayment.fee_record_id == record_id
+    ).order_by(StudentCourseFeePayment.payment_date.asc(), StudentCourseFeePayment.id.asc()).all()
+    return [_payment_to_response(payment) for payment in payments]
+
+
+def _cancel_payment(db: Session, payment_id: int, new_status: str, reason: str, current_user: User) -> FeeRecordPaymentResponse:
+    """Flip a posted payment to ``new_status`` and take its amount off the parent record.
+
+    The parent record is locked first and the payment re-read under that lock, so two
+    concurrent cancellations of one payment cannot both subtract it. The balance is
+    adjusted by the payment amount rather than re-summed from all payments.
+    """
+    payment = db.query(StudentCourseFeePayment).filter(StudentCourseFeePayment.id == payment_id).first()
+    if not payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
+
+    record = _lock_fee_record(db, getattr(payment, "fee_record_id"))
+    db.refresh(payment)
+    p: Any = payment
+    if p.status != "posted":
+        raise HTTPException(status_code=400, detail=f"Payment is already {p.status}")
+
+    paid_amount = to_decimal(getattr(record, "paid_amount")) - to_decimal(p.amount)
+    if paid_amount < Decimal("0.00"):
+        paid_amount = Decimal("0.00")
+    setattr(record, "paid_amount", paid_amount)
+    recalculate_fee_record(record)
+    setattr(record, "updated_by", current_user.id)
+
+    p.status = new_status
+    p.voided_at = datetime.utcnow()
+    p.voided_by = current_user.id
+    p.void_reason = reason
+    refresh_fee_balances(db, [p.student_id])
 
     db.commit()
     db.refresh(payment)
     return _payment_to_response(payment)
 
 
+@router.post("/payments/{payment_id}/void", response_model=FeeRecordPaymentResponse)
+async def void_fee_payment(
+    payment_id: int,
+    payload: FeePaymentVoid,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    """Cancel a payment that was posted in error."""
+    return _cancel_payment(db, payment_id, "voided", payload.reason, current_user)
+
+
+@router.post("/payments/{payment_id}/reverse", response_model=FeeRecordPaymentResponse)
+async def reverse_fee_payment(
+    payment_id: int,
+    payload: FeePaymentVoid,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    """Record that a received payment was refunded to the student."""
+    return _cancel_payment(db, payment_id, "reversed", payload.reason, current_user)
+
+
 @router.get("/my-records", response_model=StudentFeeDashboardResponse)
 async def get_my_fee_records(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     normalized_role = str(current_user.role).lower().replace("roleenum.", "")
@@ -377,16 +532,17 @@ async def get_my_fee_records(
 
     dirty = False
     for record in records:
-        if _recalculate_fee_record(record):
+        if recalculate_fee_record(record):
             dirty = True
-    if dirty:
+    if dirty and not is_read_only(db):
+        refresh_fee_balances(db, [student.id])
         db.commit()
 
     response_records = [_record_to_response(record) for record in records]
 
-    total_fee_assigned = sum((_to_decimal(getattr(r, "total_amount")) for r in records), Decimal("0.00"))
-    total_collected = sum((_to_decimal(getattr(r, "paid_amount")) for r in records), Decimal("0.00"))
-    total_outstanding = sum((_to_decimal(getattr(r, "balance_amount")) for r in records), Decimal("0.00"))
+    total_fee_assigned = sum((to_decimal(getattr(r, "total_amount")) for r in records), Decimal("0.00"))
+    total_collected = sum((to_decimal(getattr(r, "paid_amount")) for r in records), Decimal("0.00"))
+    total_outstanding = sum((to_decimal(getattr(r, "balance_amount")) for r in records), Decimal("0.00"))
 
     summary = FeeSummaryResponse(
         total_fee_assigned=total_fee_assigned,
@@ -406,15 +562,18 @@ async def get_fee_summary(
     _current_user: User = Depends(require_admin),
 ):
     records = db.query(StudentCourseFee).all()
-    dirty = False
+    dirty = set()
     for record in records:
-        if _recalculate_fee_record(record):
-            dirty = True
+        if recalculate_fee_record(record):
+            dirty.add(record.student_id)
     if dirty:
+        refresh_fee_balances(db, dirty)
         db.commit()
 
     total_fee_assigned = db.query(func.coalesce(func.sum(StudentCourseFee.total_amount), 0)).scalar()
-    total_collected = db.query(func.coalesce(func.sum(StudentCourseFeePayment.amount), 0)).scalar()
+    total_collected = db.query(func.coalesce(func.sum(StudentCourseFeePayment.amount), 0)).filter(
+        StudentCourseFeePayment.status == "posted"
+    ).scalar()
     total_outstanding = db.query(func.coalesce(func.sum(StudentCourseFee.balance_amount), 0)).scalar()
 
     total_records = db.query(StudentCourseFee).count()
@@ -422,9 +581,9 @@ async def get_fee_summary(
     overdue_records = db.query(StudentCourseFee).filter(StudentCourseFee.status == "overdue").count()
 
     return FeeSummaryResponse(
-        total_fee_assigned=_to_decimal(total_fee_assigned),
-        total_collected=_to_decimal(total_collected),
-        total_outstanding=_to_decimal(total_outstanding),
+        total_fee_assigned=to_decimal(total_fee_assigned),
+        total_collected=to_decimal(total_collected),
+        total_outstanding=to_decimal(total_outstanding),
         total_records=total_records,
         paid_records=paid_records,
         overdue_records=overdue_records,
@@ -0,0 +1,136 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session, selectinload
+from typing import List
+from app.db.database import get_db
+from app.db.models import User, Course, GradeScale, GradeScaleStep
+from app.schemas.grade_scale import GradeStep, GradeScaleCreate, GradeScaleUpdate, GradeScaleResponse
+from app.auth.dependencies import require_admin, require_faculty
+from app.core import jobs
+from app.jobs.grade_letters import recompute_letter_grades
+
+router = APIRouter()
+
+
+def _scale_steps(steps: List[GradeStep]) -> List[GradeScaleStep]:
+    # Stored as Numeric(5, 2), so compare the cutoffs as they will be saved.
+    cutoffs = [round(step.min_percentage, 2) for step in steps]
+    if len(set(cutoffs)) != len(cutoffs):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each step needs a different min_percentage"
+        )
+    return [GradeScaleStep(min_percentage=cutoff, letter_grade=step.letter_grade) for cutoff, step in zip(cutoffs, steps)]
+
+
+def _recompute(course_id, program) -> str:
+    # Letters stored under the old scale are rewritten in the background; hand-entered ones are kept.
+    return jobs.submit("grade_letters", recompute_letter_grades, course_id=course_id, program=program).id
+
+
+@router.get("/", response_model=List[GradeScaleResponse])
+async def get_grade_scales(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_faculty)
+):
+    scales = db.query(GradeScale).options(selectinload(GradeScale.steps)).order_by(GradeScale.id).all()
+    return [GradeScaleResponse.model_validate(scale) for scale in scales]
+
+
+@router.post("/", response_model=GradeScaleResponse, status_code=status.HTTP_201_CREATED)
+async def create_grade_scale(
+    grade_scale: GradeScaleCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Create the scale for a course, a program, or (neither given) the default scale"""
+    if grade_scale.course_id is not None and grade_scale.program is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A grade scale is for a course or a program, not both"
+        )
+    if grade_scale.course_id is not None and not db.query(Course.id).filter(Course.id == grade_scale.course_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    existing = db.query(GradeScale).filter(
+        GradeScale.course_id.is_(None) if grade_scale.course_id is None else GradeScale.course_id == grade_scale.course_id,
+        GradeScale.program.is_(None) if grade_scale.program is None else GradeScale.program == grade_scale.program
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Grade scale '{existing.name}' already covers these grades"
+        )
+    if db.query(GradeScale.id).filter(GradeScale.name == grade_scale.name).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Grade scale '{grade_scale.name}' already exists"
+        )
+
+    scale = GradeScale(
+        name=grade_scale.name,
+        course_id=grade_scale.course_id,
+        program=grade_scale.program,
+        steps=_scale_steps(grade_scale.steps)
+    )
+    db.add(scale)
+    db.commit()
+    db.refresh(scale)
+    response = GradeScaleResponse.model_validate(scale)
+    response.recompute_job_id = _recompute(scale.course_id, scale.program)
+    return response
+
+
+@router.put("/{scale_id}", response_model=GradeScaleResponse)
+async def update_grade_scale(
+    scale_id: int,
+    grade_scale: GradeScaleUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    scale = db.query(GradeScale).filter(GradeScale.id == scale_id).first()
+    if not scale:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Grade scale not found"
+        )
+    if grade_scale.name is not None and grade_scale.name != scale.name:
+        if db.query(GradeScale.id).filter(GradeScale.name == grade_scale.name).first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Grade scale '{grade_scale.name}' already exists"
+            )
+        scale.name = grade_scale.name
+    if grade_scale.steps is not None:
+        steps = _scale_steps(grade_scale.steps)
+        # Remove the old steps first, so a step keeping its min_percentage does not collide.
+        scale.steps.clear()
+        db.flush()
+        scale.steps = steps
+
+    db.commit()
+    db.refresh(scale)
+    response = GradeScaleResponse.model_validate(scale)
+    if grade_scale.steps is not None:
+        response.recompute_job_id = _recompute(scale.course_id, scale.program)
+    return response
+
+
+@router.delete("/{scale_id}")
+async def delete_grade_scale(
+    scale_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    scale = db.query(GradeScale).filter(GradeScale.id == scale_id).first()
+    if not scale:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Grade scale not found"
+        )
+
+    course_id, program = scale.course_id, scale.program
+    db.delete(scale)
+    db.commit()
+    return {"message": "Grade scale deleted successfully", "job_id": _recompute(course_id, program)}
@@ -0,0 +1,103 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional
+from app.db.models import User
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.schemas.job import JobResponse, FeeLedgerCheckRequest, FeeStatementsRequest, SemesterRolloverRequest, TermArchiveRequest, ReportingSnapshotRequest, GradeLettersRequest
+from app.auth.dependencies import require_admin
+from app.core import jobs
+from app.jobs.fee_ledger import check_fee_ledger
+from app.jobs.fee_statements import generate_outstanding_statements
+from app.jobs.grade_letters import recompute_letter_grades
+from app.jobs.reporting_snapshot import snapshot_reporting_store
+from app.jobs.semester_rollover import resolve_semesters, roll_over_semester
+from app.jobs.term_archive import archive_closed_terms, default_cutoff
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[JobResponse])
+async def get_jobs(
+    name: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(require_admin)
+):
+    return jobs.recent(name)[:limit]
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(require_admin)
+):
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.post("/fee-ledger-check", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_fee_ledger_check(
+    request: FeeLedgerCheckRequest,
+    current_user: User = Depends(require_admin)
+):
+    return jobs.submit("fee_ledger", check_fee_ledger, repair=request.repair, chunk_size=request.chunk_size)
+
+
+@router.post("/fee-statements", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_fee_statements(
+    request: FeeStatementsRequest,
+    current_user: User = Depends(require_admin)
+):
+    return jobs.submit("fee_statements", generate_outstanding_statements, chunk_size=request.chunk_size)
+
+
+@router.post("/semester-rollover", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_semester_rollover(
+    request: SemesterRolloverRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    try:
+        resolve_semesters(db.connection(), request.from_semester_id, request.to_semester_id)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    db.rollback()
+    return jobs.submit("semester_rollover", roll_over_semester, **request.model_dump())
+
+
+@router.post("/term-archive", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_term_archive(
+    request: TermArchiveRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    if request.before is None and default_cutoff(db.connection()) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No archived semester with an end date; pass the date to archive before"
+        )
+    db.rollback()
+    return jobs.submit("term_archive", archive_closed_terms, **request.model_dump())
+
+
+@router.post("/reporting-snapshot", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_reporting_snapshot(
+    request: ReportingSnapshotRequest,
+    current_user: User = Depends(require_admin)
+):
+    return jobs.submit("reporting_snapshot", snapshot_reporting_store, full=request.full, chunk_size=request.chunk_size)
+
+
+@router.post("/grade-letters", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_grade_letters(
+    request: GradeLettersRequest,
+    current_user: User = Depends(require_admin)
+):
+    return jobs.submit("grade_letters", recompute_letter_grades, **request.model_dump())
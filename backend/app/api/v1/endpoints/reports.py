@@ -0,0 +1,172 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional, Sequence, Tuple
+from datetime import date
+from app.db.models import User
+from app.db.reporting import reporting_store, snapshot_state, snapshot_time
+from app.schemas.report import (
+    SnapshotTableStatus, AttendanceByProgramReport, GradeDistributionReport, FeeAgingReport, EnrollmentByProgramReport
+)
+from app.auth.dependencies import require_admin, require_faculty
+
+router = APIRouter()
+
+# Days past due -> bucket, checked in order; anything later is "90+".
+FEE_AGING_BUCKETS = [(0, "current"), (30, "1-30"), (60, "31-60"), (90, "61-90")]
+
+# Late fees are applied lazily, so the stored balance can miss one; recompute it as of the report date
+# the way app.core.fees.recalculate_fee_record does.
+FEE_BALANCE_AS_OF = (
+    "greatest(fee_amount - paid_amount + CASE WHEN late_fee_amount > 0 AND due_date < ? "
+    "AND paid_amount < fee_amount + late_fee_amount THEN late_fee_amount ELSE 0 END, 0)"
+)
+
+
+def _snapshot_at(store: Any, tables: Sequence[str]):
+    snapshot_at = snapshot_time(store, tables)
+    if snapshot_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Reporting snapshot has not been built yet"
+        )
+    return snapshot_at
+
+
+def _where(*conditions: Tuple[str, Any]) -> Tuple[str, List[Any]]:
+    """SQL WHERE clause and parameters for the conditions whose value is given."""
+    given = [(sql, value) for sql, value in conditions if value is not None]
+    if not given:
+        return "", []
+    return " WHERE " + " AND ".join(sql for sql, _ in given), [value for _, value in given]
+
+
+# Blocking DuckDB queries, so these are plain functions run in the threadpool.
+@router.get("/status", response_model=List[SnapshotTableStatus])
+def get_snapshot_status(current_user: User = Depends(require_faculty)):
+    with reporting_store() as store:
+        state = snapshot_state(store)
+    return [
+        SnapshotTableStatus(table=name, rows=table_state["rows"], refreshed_at=table_state["refreshed_at"])
+        for name, table_state in sorted(state.items())
+    ]
+
+
+@router.get("/attendance-by-program", response_model=AttendanceByProgramReport)
+def get_attendance_by_program(
+    semester_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user: User = Depends(require_faculty)
+):
+    where, params = _where(
+        ("c.semester_id = ?", semester_id),
+        ("a.date >= ?", date_from),
+        ("a.date <= ?", date_to),
+    )
+    with reporting_store() as store:
+        snapshot_at = _snapshot_at(store, ["attendance", "students", "courses"])
+        rows = store.execute(
+            "SELECT s.program, count(DISTINCT a.student_id), count(*), count(*) FILTER (WHERE a.status = 'present') "
+            "FROM attendance a JOIN students s ON s.id = a.student_id JOIN courses c ON c.id = a.course_id"
+            f"{where} GROUP BY s.program ORDER BY s.program NULLS LAST",
+            params,
+        ).fetchall()
+    return {
+        "snapshot_at": snapshot_at,
+        "rows": [
+            {
+                "program": program,
+                "students": students,
+                "sessions": sessions,
+                "present": present,
+                "percentage": round(present * 100 / sessions, 2) if sessions else None,
+            }
+            for program, students, sessions, present in rows
+        ],
+    }
+
+
+@router.get("/grade-distribution", response_model=GradeDistributionReport)
+def get_grade_distribution(
+    course_id: Optional[int] = None,
+    semester_id: Optional[int] = None,
+    assessment_type: Optional[str] = None,
+    current_user: User = Depends(require_faculty)
+):
+    where, params = _where(
+        ("g.course_id = ?", course_id),
+        ("c.semester_id = ?", semester_id),
+        ("g.assessment_type = ?", assessment_type),
+    )
+    source = f"FROM grades g JOIN courses c ON c.id = g.course_id{where}"
+    with reporting_store() as store:
+        snapshot_at = _snapshot_at(store, ["grades", "courses"])
+        count, mean, p25, median, p75 = store.execute(
+            "SELECT count(*), avg(g.percentage), quantile_cont(g.percentage, 0.25), median(g.percentage), "
+            f"quantile_cont(g.percentage, 0.75) {source}",
+            params,
+        ).fetchone()
+        buckets = store.execute(
+            f"SELECT g.letter_grade, count(*) {source} GROUP BY g.letter_grade ORDER BY g.letter_grade NULLS LAST",
+            params,
+        ).fetchall()
+    return {
+        "snapshot_at": snapshot_at,
+        "count": count,
+        "mean": round(float(mean), 2) if mean is not None else None,
+        "p25": round(float(p25), 2) if p25 is not None else None,
+        "median": round(float(median), 2) if median is not None else None,
+        "p75": round(float(p75), 2) if p75 is not None else None,
+        "grades": [
+            {"letter_grade": letter_grade, "count": bucket_count, "share": round(bucket_count / count, 4)}
+            for letter_grade, bucket_count in buckets
+        ],
+    }
+
+
+@router.get("/fee-aging", response_model=FeeAgingReport)
+def get_fee_aging(
+    as_of: Optional[date] = None,
+    current_user: User = Depends(require_admin)
+):
+    as_of = as_of or date.today()
+    bucket = "CASE " + " ".join(f"WHEN ? - due_date <= {days} THEN '{label}'" for days, label in FEE_AGING_BUCKETS) + " ELSE '90+' END"
+    with reporting_store() as store:
+        snapshot_at = _snapshot_at(store, ["student_course_fees"])
+        totals = {
+            label: (records, outstanding)
+            for label, records, outstanding in store.execute(
+                f"SELECT {bucket}, count(*), sum(balance) FROM ("
+                f"SELECT due_date, {FEE_BALANCE_AS_OF} AS balance FROM student_course_fees WHERE issue_date <= ?"
+                ") WHERE balance > 0 GROUP BY 1",
+                [as_of] * len(FEE_AGING_BUCKETS) + [as_of, as_of],
+            ).fetchall()
+        }
+    labels = [label for _, label in FEE_AGING_BUCKETS] + ["90+"]
+    return {
+        "snapshot_at": snapshot_at,
+        "as_of": as_of,
+        "buckets": [
+            {"bucket": label, "records": totals.get(label, (0, 0))[0], "outstanding": totals.get(label, (0, 0))[1]}
+            for label in labels
+        ],
+    }
+
+
+@router.get("/enrollments-by-program", response_model=EnrollmentByProgramReport)
+def get_enrollments_by_program(
+    semester_id: Optional[int] = None,
+    current_user: User = Depends(require_faculty)
+):
+    where, params = _where(("c.semester_id = ?", semester_id))
+    with reporting_store() as store:
+        snapshot_at = _snapshot_at(store, ["enrollments", "students", "courses"])
+        rows = store.execute(
+            "SELECT s.program, e.status, count(*) "
+            "FROM enrollments e JOIN students s ON s.id = e.student_id JOIN courses c ON c.id = e.course_id"
+            f"{where} GROUP BY s.program, e.status ORDER BY s.program NULLS LAST, e.status",
+            params,
+        ).fetchall()
+    return {
+        "snapshot_at": snapshot_at,
+        "rows": [{"program": program, "status": enrollment_status, "enrollments": count} for program, enrollment_status, count in rows],
+    }
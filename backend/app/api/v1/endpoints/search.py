@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.db.database import get_read_db
+from app.db.models import User, RoleEnum
+from app.db.search_index import SEARCH_KINDS, search as run_search
+from app.schemas.search import SearchResult
+from app.auth.dependencies import require_faculty
+
+router = APIRouter()
+
+
+# The full-text query blocks, so this is a plain function run in the threadpool.
+@router.get("/", response_model=List[SearchResult])
+def search(
+    q: str = Query(..., min_length=2, max_length=100),
+    types: Optional[List[str]] = Query(None, alias="type", description="Restrict to student, course and/or user"),
+    limit: int = Query(20, ge=1, le=50),
+    current_user: User = Depends(require_faculty),
+    db: Session = Depends(get_read_db)
+):
+    kinds = [kind for kind in (types or SEARCH_KINDS) if kind in SEARCH_KINDS]
+    # Staff accounts are only searchable by admins.
+    if current_user.role != RoleEnum.ADMIN:
+        kinds = [kind for kind in kinds if kind != "user"]
+    if not kinds:
+        return []
+
+    hits = run_search(db, q.strip(), kinds, limit)
+    return [
+        SearchResult(type=hit["kind"], id=hit["id"], title=hit["title"] or "", subtitle=hit["subtitle"] or "", score=hit["score"] or 0)
+        for hit in hits
+    ]
@@ -1,21 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.database import get_db
-from app.db.models import User, Semester
-from app.schemas.semester import SemesterCreate, SemesterUpdate, SemesterResponse
+from app.db.models import User, Semester, Course, Student
+from app.db import semesters as semester_lookup
+from app.schemas.semester import SemesterCreate, SemesterUpdate, SemesterResponse, CurrentSemesterResponse
 from app.auth.dependencies import get_current_user, require_faculty
+from app.core import response_cache
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[SemesterResponse])
 async def get_semesters(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    cache = response_cache.CachedRequest(request, "semesters")
+    if cache.hit is not None:
+        return cache.hit
+    
     semesters = db.query(Semester).order_by(Semester.id.desc()).all()
-    return semesters
+    return cache.respond([SemesterResponse.model_validate(s) for s in semesters], List[SemesterResponse])
+
+
+@router.get("/current", response_model=CurrentSemesterResponse)
+async def get_current_semester(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    current = semester_lookup.current_semester(db)
+    if current is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No current semester is set"
+        )
+    return CurrentSemesterResponse(id=current.id, name=current.name)
 
 
 @router.post("/", response_model=SemesterResponse)
@@ -40,6 +61,8 @@ async def create_semester(
     )
     db.add(new_semester)
     db.commit()
+    semester_lookup.invalidate()
+    response_cache.invalidate("semesters")
     db.refresh(new_semester)
     return new_semester
 
@@ -64,6 +87,8 @@ async def set_current_semester(
     # Set this one as current
     db.query(Semester).filter(Semester.id == semester_id).update({"is_current": True})
     db.commit()
+    semester_lookup.invalidate()
+    response_cache.invalidate("semesters")
     
     return {"message": f"'{semester.name}' is now the current semester"}
 
@@ -82,6 +107,11 @@ async def delete_semester(
             detail="Semester not found"
         )
     
+    # The foreign keys clear these too, but databases migrated in place on SQLite lack the constraint.
+    db.query(Course).filter(Course.semester_id == semester_id).update({"semester_id": None}, synchronize_session=False)
+    db.query(Student).filter(Student.current_semester_id == semester_id).update({"current_semester_id": None}, synchronize_session=False)
     db.delete(semester)
     db.commit()
+    semester_lookup.invalidate()
+    response_cache.invalidate("semesters", "courses", "students")
     return {"message": f"Semester '{semester.name}' deleted successfully"}
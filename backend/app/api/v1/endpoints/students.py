@@ -1,56 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.database import get_db
-from app.db.models import User, Student, RoleEnum
-from app.schemas.student import StudentCreate, StudentCreateWithUser, StudentUpdate, StudentResponse, StudentWithUser
+from app.db.models import User, Student, StudentFeeBalance, RoleEnum
+from app.db.semesters import ensure_semester
+from app.schemas.student import StudentCreate, StudentCreateWithUser, StudentUpdate, StudentResponse, StudentWithUser, StudentListItem
 from app.auth.dependencies import get_current_user, require_admin, require_faculty
 from app.core.security import hash_password
+from app.core import response_cache
+from app.core.fieldsets import fieldset_model, parse_fields, select_columns
+from app.core.list_query import ListSpec
+from app.core.serialization import json_response
+from app.jobs.cascade_delete import start_background_delete
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+STUDENT_LIST = ListSpec(
+    Student,
+    filters=["id", "student_id", "program", "current_semester", "current_semester_id", "status", "gpa", "enrollment_date", "fee_outstanding", "fee_overdue_count"],
+    sorts=["id", "student_id", "gpa", "enrollment_date", "fee_outstanding", "fee_overdue_count"],
+    default_sort="id",
+    joined=[StudentFeeBalance],
+)
+
+STUDENT_LIST_COLUMNS = dict(
+    Student.__table__.columns.items(),
+    email=User.email,
+    full_name=User.full_name,
+    profile_picture=User.profile_picture,
+    is_active=User.is_active,
+    # Inner joined: every student has a balance row (created on insert, backfilled at startup).
+    fee_assigned=StudentFeeBalance.fee_assigned,
+    fee_paid=StudentFeeBalance.fee_paid,
+    fee_outstanding=StudentFeeBalance.fee_outstanding,
+    fee_overdue_count=StudentFeeBalance.fee_overdue_count,
+)
 
 
-@router.get("/", response_model=List[StudentWithUser])
+@router.get("/", response_model=List[StudentListItem], openapi_extra=STUDENT_LIST.openapi_extra())
 async def get_students(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    program: Optional[str] = None,
-    current_semester: Optional[str] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_faculty)
 ):
-    print(f"[DEBUG] get_students called by user: {current_user.email}, role: {current_user.role}")
-    query = db.query(Student).join(User)
+    wanted = parse_fields(fields, StudentListItem)
+    # Project flat columns in one joined query and serialize the row mappings in a single pass.
+    query = db.query(
+        *select_columns(STUDENT_LIST_COLUMNS, STUDENT_LIST.projection(wanted, sort))
+    ).join(User, Student.user_id == User.id).join(StudentFeeBalance, StudentFeeBalance.student_id == Student.id)
+    page = STUDENT_LIST.apply(query, request.query_params, sort, cursor, skip)
     
-    if program:
-        query = query.filter(Student.program == program)
-    if current_semester:
-        query = query.filter(Student.current_semester == current_semester)
+    rows = [dict(row._mapping) for row in page.query.offset(skip).limit(limit)]
     
-    students = query.offset(skip).limit(limit).all()
-    print(f"[DEBUG] Found {len(students)} students in database")
-    
-    result = []
-    for student in students:
-        student_dict = StudentResponse.model_validate(student).model_dump()
-        student_dict.update({
-            "email": student.user.email,
-            "full_name": student.user.full_name,
-            "profile_picture": student.user.profile_picture,
-            "is_active": student.user.is_active
-        })
-        result.append(StudentWithUser(**student_dict))
-    
-    print(f"[DEBUG] Returning {len(result)} students")
-    return result
+    logger.debug("get_students returned %s rows", len(rows), extra={"user_id": current_user.id, "skip": skip, "limit": limit})
+    return json_response(rows, List[fieldset_model(StudentListItem, wanted)], headers=page.headers(rows, limit))
 
 
 @router.get("/{student_id}", response_model=StudentWithUser)
 async def get_student(
     student_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_faculty)
 ):
+    cache = response_cache.CachedRequest(request, "students", "users")
+    if cache.hit is not None:
+        return cache.hit
+    
     student = db.query(Student).filter(Student.id == student_id).first()
     if not student:
         raise HTTPException(
@@ -65,7 +89,7 @@ async def get_student(
         "profile_picture": student.user.profile_picture,
         "is_active": student.user.is_active
     })
-    return StudentWithUser(**student_dict)
+    return cache.respond(StudentWithUser(**student_dict), StudentWithUser)
 
 
 @router.post("/", response_model=StudentResponse, status_code=status.HTTP_201_CREATED)
@@ -97,6 +121,7 @@ async def create_student(
         )
     
     student_data = student.model_dump()
+    student_data["current_semester_id"] = ensure_semester(db, student.current_semester)
     if not student_data.get('user_id'):
         student_data.pop('user_id', None)
         db_student = Student(**student_data)
@@ -108,6 +133,7 @@ async def create_student(
     
     db.add(db_student)
     db.commit()
+    response_cache.invalidate("students")
     db.refresh(db_student)
     return StudentResponse.model_validate(db_student)
 
@@ -147,10 +173,12 @@ async def create_student_with_user(
             year_level=student.year_level,
             program=student.program,
             current_semester=student.current_semester,
+            current_semester_id=ensure_semester(db, student.current_semester),
             status=student.status or "active"
         )
         db.add(db_student)
         db.commit()
+        response_cache.invalidate("students", "users")
         db.refresh(db_student)
         
         student_dict = StudentResponse.model_validate(db_student).model_dump()
@@ -184,10 +212,12 @@ async def create_student_with_user(
         year_level=student.year_level,
         program=student.program,
         current_semester=student.current_semester,
+        current_semester_id=ensure_semester(db, student.current_semester),
         status=student.status or "active"
     )
     db.add(db_student)
     db.commit()
+    response_cache.invalidate("students", "users")
     db.refresh(db_student)
     db.refresh(new_user)
     
@@ -216,10 +246,13 @@ async def update_student(
         )
     
     update_data = student_update.model_dump(exclude_unset=True)
+    if "current_semester" in update_data:
+        update_data["current_semester_id"] = ensure_semester(db, update_data["current_semester"])
     for field, value in update_data.items():
         setattr(student, field, value)
     
     db.commit()
+    response_cache.invalidate("students")
     db.refresh(student)
     return StudentResponse.model_validate(student)
 
@@ -231,14 +264,20 @@ async def bulk_update_semester(
     current_user: User = Depends(require_admin)
 ):
     """Update semester for all students at once (Admin only)"""
-    result = db.query(Student).update({Student.current_semester: semester})
+    semester_id = ensure_semester(db, semester)
+    # Students already in the semester are left untouched.
+    result = db.query(Student).filter(Student.current_semester_id.is_distinct_from(semester_id)).update(
+        {Student.current_semester: semester, Student.current_semester_id: semester_id}, synchronize_session=False
+    )
     db.commit()
+    response_cache.invalidate("students")
     return {"message": f"Successfully updated semester to '{semester}' for {result} students", "updated_count": result}
 
 
 @router.delete("/{student_id}")
 async def delete_student(
     student_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
@@ -249,8 +288,14 @@ async def delete_student(
             detail="Student not found"
         )
     
+    job = start_background_delete(db, "students", student_id)
+    if job is not None:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {"message": "Student deletion started", "job_id": job.id}
+
     db.delete(student)
     db.commit()
+    response_cache.invalidate("students")
     return {"message": "Student deleted successfully"}
 
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.database import get_db
@@ -6,6 +6,8 @@ from app.db.models import User, RoleEnum
 from app.schemas.user import UserResponse, UserUpdate
 from app.auth.dependencies import require_admin
 from app.core.security import hash_password
+from app.core import response_cache
+from app.jobs.cascade_delete import start_background_delete
 
 router = APIRouter()
 
@@ -72,6 +74,7 @@ async def update_user(
         setattr(user, field, value)
     
     db.commit()
+    response_cache.invalidate("users")
     db.refresh(user)
     return UserResponse.model_validate(user)
 
@@ -79,6 +82,7 @@ async def update_user(
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
@@ -95,6 +99,12 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
     
+    job = start_background_delete(db, "users", user_id)
+    if job is not None:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {"message": "User deletion started", "job_id": job.id}
+
     db.delete(user)
     db.commit()
+    response_cache.invalidate("users", "students", "courses")
     return {"message": "User deleted successfully"}
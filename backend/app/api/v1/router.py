@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, students, courses, enrollments, academic, semesters, contact, password_reset, fees
+from app.api.v1.endpoints import auth, users, students, courses, enrollments, academic, semesters, contact, password_reset, fees, fee_documents, search, jobs, reports, grade_scales
 
 api_router = APIRouter()
 
@@ -11,5 +11,10 @@ api_router.include_router(courses.router, prefix="/courses", tags=["Courses"])
 api_router.include_router(enrollments.router, prefix="/enrollments", tags=["Enrollments"])
 api_router.include_router(academic.router, prefix="/academic", tags=["Academic"])
 api_router.include_router(fees.router, prefix="/fees", tags=["Fees"])
+api_router.include_router(fee_documents.router, prefix="/fees", tags=["Fees"])
 api_router.include_router(semesters.router, prefix="/semesters", tags=["Semesters"])
+api_router.include_router(grade_scales.router, prefix="/grade-scales", tags=["Grade Scales"])
+api_router.include_router(search.router, prefix="/search", tags=["Search"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
 api_router.include_router(contact.router, tags=["Contact"])
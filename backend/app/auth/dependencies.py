@@ -1,3 +1,5 @@
+import logging
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -6,6 +8,7 @@ from app.db.database import get_db
 from app.db.models import User, RoleEnum
 
 security = HTTPBearer()
+logger = logging.getLogger(__name__)
 
 
 async def get_current_user(
@@ -14,9 +17,6 @@ async def get_current_user(
 ) -> User:
     token = credentials.credentials
     payload = verify_token(token)
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info("Auth debug: token len=%s payload=%s", len(token) if token else None, payload)
     
     if not payload:
         raise HTTPException(
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.db.models import User, RoleEnum
 from app.core.config import settings
+from app.core import response_cache
 from typing import Dict, Any
 
 
@@ -43,5 +44,6 @@ def create_or_update_user(db: Session, user_data: Dict[str, Any]) -> User:
         db.add(user)
     
     db.commit()
+    response_cache.invalidate("users")
     db.refresh(user)
     return user
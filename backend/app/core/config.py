@@ -7,6 +7,10 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = ""
+    # Optional read replica for report-heavy GET endpoints
+    DATABASE_REPLICA_URL: str = ""
+    # How long a user's reads stay on the primary after they write
+    REPLICA_READ_YOUR_WRITES_SECONDS: int = 5
     
     # JWT
     SECRET_KEY: str = ""
@@ -44,8 +48,48 @@ class Settings(BaseSettings):
     FACULTY_EMAILS: str = ""
     STUDENT_EMAILS: str = ""
 
+    # In-memory response cache for reference data (courses, semesters, student profiles)
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+
     # Startup seeding (useful on platforms without interactive shell)
     SEED_ON_STARTUP: bool = False
+
+    # Logging: LOG_FORMAT is "json" or "text"; LOG_LEVELS takes per-module overrides like "app.auth=DEBUG,sqlalchemy.engine=INFO"
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_LEVELS: str = ""
+    # Fraction of DEBUG records kept, so per-request debug events don't flood the log
+    LOG_DEBUG_SAMPLE_RATE: float = 0.01
+
+    # Query inspector (dev/staging): logs slow queries and N+1 patterns per request
+    QUERY_INSPECTOR_ENABLED: bool = False
+    QUERY_INSPECTOR_MAX_QUERIES: int = 20
+    QUERY_INSPECTOR_REPEAT_THRESHOLD: int = 5
+    QUERY_INSPECTOR_SLOW_QUERY_MS: float = 200.0
+
+    # Background maintenance jobs (ledger checks, bulk deletes, recomputations)
+    JOB_WORKERS: int = 2
+    # Deletes cascading to more rows than this run as a chunked background job
+    BULK_DELETE_THRESHOLD: int = 5000
+    BULK_DELETE_CHUNK_SIZE: int = 1000
+    # Semester rollover completes students in their program's final year; programs not given a length use this
+    DEFAULT_PROGRAM_YEARS: int = 4
+
+    # Generated PDF documents (fee statements, receipts): rendered in worker processes, cached on disk by content hash
+    DOCUMENT_CACHE_DIR: str = "generated/documents"
+    DOCUMENT_WORKERS: int = 2
+    DOCUMENT_CACHE_MAX_AGE_DAYS: int = 7
+
+    # Attendance and grades history: monthly partitions kept ready ahead of time (PostgreSQL, once
+    # partitioned) and where rows of closed terms are archived as compressed files
+    PARTITION_MONTHS_AHEAD: int = 3
+    ARCHIVE_DIR: str = "generated/archive"
+
+    # Reporting store: a local DuckDB copy of attendance, grades, enrollments and fees that /api/reports queries,
+    # refreshed every REPORTING_SNAPSHOT_INTERVAL_MINUTES by the API process (0 turns the schedule off)
+    REPORTING_DB_PATH: str = "generated/reporting.duckdb"
+    REPORTING_SNAPSHOT_INTERVAL_MINUTES: int = 15
     
     @property
     def admin_emails_list(self) -> List[str]:
@@ -0,0 +1,158 @@
+"""Rendered documents (PDF statements and receipts): worker pool, disk cache and responses.
+
+Rendering is CPU-bound, so it runs in a small process pool instead of on the event loop or
+the request thread. Each document is cached on disk under the SHA-256 of its kind, layout
+version and input data, so an unchanged statement is served without re-rendering and the
+hash doubles as a strong ETag. Responses honour single byte ranges for resumable downloads.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.response_cache import etag_matches
+
+
+logger = logging.getLogger(__name__)
+
+Renderer = Callable[[Dict[str, Any]], bytes]
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned rather than forked: the server process has threads (DB pool, job workers).
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.DOCUMENT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def content_hash(kind: str, version: int, data: Dict[str, Any]) -> str:
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{kind}|{version}|{payload}".encode()).hexdigest()
+
+
+def _path(kind: str, digest: str) -> Path:
+    return Path(settings.DOCUMENT_CACHE_DIR) / kind / f"{digest}.pdf"
+
+
+def cached(kind: str, digest: str) -> Optional[bytes]:
+    try:
+        return _path(kind, digest).read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def exists(kind: str, digest: str) -> bool:
+    return _path(kind, digest).exists()
+
+
+def prune(kind: str, max_age_days: int) -> int:
+    """Delete cached documents of ``kind`` not written in the last ``max_age_days``."""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in (Path(settings.DOCUMENT_CACHE_DIR) / kind).glob("*.pdf"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def _store(kind: str, digest: str, body: bytes) -> None:
+    path = _path(kind, digest)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so concurrent readers never see a partial file.
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(body)
+    os.replace(tmp, path)
+
+
+def render(kind: str, digest: str, renderer: Renderer, data: Dict[str, Any]) -> "Future[bytes]":
+    """Render ``data`` on the worker pool; the result is written to the cache when it completes."""
+    future = _get_executor().submit(renderer, data)
+
+    def _on_done(done: "Future[bytes]") -> None:
+        if done.exception() is None:
+            _store(kind, digest, done.result())
+        else:
+            logger.error("Rendering %s document %s failed", kind, digest, exc_info=done.exception())
+
+    future.add_done_callback(_on_done)
+    return future
+
+
+async def get_or_render(kind: str, version: int, renderer: Renderer, data: Dict[str, Any]) -> Tuple[str, bytes]:
+    digest = content_hash(kind, version, data)
+    body = cached(kind, digest)
+    if body is None:
+        body = await asyncio.wrap_future(render(kind, digest, renderer, data))
+    return digest, body
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """``(start, end)`` inclusive for a single ``bytes=`` range; ``(-1, -1)`` if unsatisfiable, None to ignore."""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            length = int(last)
+            start, end = max(size - length, 0), size - 1
+            if length == 0:
+                return (-1, -1)
+    except ValueError:
+        return None
+    if start >= size:
+        return (-1, -1)
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def pdf_response(request: Request, body: bytes, digest: str, filename: str) -> Response:
+    etag = f'"{digest}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": f'inline; filename="{filename}"',
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range == etag):
+        byte_range = _parse_range(range_header, len(body))
+        if byte_range == (-1, -1):
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{len(body)}"})
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            return Response(body[start:end + 1], status_code=206, media_type="application/pdf", headers=headers)
+
+    return Response(body, media_type="application/pdf", headers=headers)
@@ -0,0 +1,103 @@
+"""Layout of the fee statement and payment receipt PDFs.
+
+Renderers take the plain dicts built by ``app.jobs.fee_statements`` and run in the document
+worker processes (``app.core.documents``), so this module only imports the PDF writer and the
+fee arithmetic, not the database or the API.
+"""
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from app.core.fees import to_decimal
+from app.core.pdf import MARGIN, PAGE_WIDTH, PdfDocument
+
+
+STATEMENT = "fee-statement"
+RECEIPT = "fee-receipt"
+# Bump when the layout changes so cached documents are rebuilt.
+LAYOUT_VERSION = 1
+
+_RIGHT = PAGE_WIDTH - MARGIN
+
+
+def _money(value: Any) -> str:
+    return f"{to_decimal(value):,.2f}"
+
+
+def _clip(value: Optional[str], length: int) -> str:
+    value = value or ""
+    return value if len(value) <= length else value[:length - 1] + "..."
+
+
+def _header(doc: PdfDocument, title: str, student: Dict[str, Any]) -> None:
+    doc.text("EduManage SMS", size=18, bold=True)
+    doc.text(title, size=13, bold=True)
+    doc.space(4)
+    doc.text(f"Student: {student['name']} ({student['code']})")
+    if student.get("program"):
+        doc.text(f"Program: {student['program']}")
+
+
+def render_statement(data: Dict[str, Any]) -> bytes:
+    doc = PdfDocument(f"Fee statement - {data['student']['code']}")
+    _header(doc, "Fee Statement", data["student"])
+    doc.text(f"Statement date: {data['as_of']}")
+    doc.text("All amounts in INR", size=8)
+    doc.rule()
+
+    doc.text("Fees", size=11, bold=True)
+    columns = [(MARGIN, "left"), (215, "left"), (345, "right"), (410, "right"), (475, "right"), (_RIGHT, "right")]
+    doc.row([(x, label, align) for (x, align), label in zip(columns, ("Course", "Due date", "Total", "Paid", "Balance", "Status"))], size=9, bold=True)
+    for record in data["records"]:
+        values = (
+            _clip(record["course"], 32), record["due_date"], _money(record["total_amount"]),
+            _money(record["paid_amount"]), _money(record["balance_amount"]), record["status"].title(),
+        )
+        doc.row([(x, value, align) for (x, align), value in zip(columns, values)], size=9)
+    if not data["records"]:
+        doc.text("No fee records.", size=9)
+
+    total = sum((Decimal(r["total_amount"]) for r in data["records"]), Decimal("0.00"))
+    paid = sum((Decimal(r["paid_amount"]) for r in data["records"]), Decimal("0.00"))
+    balance = sum((Decimal(r["balance_amount"]) for r in data["records"]), Decimal("0.00"))
+    doc.rule(4)
+    doc.row([(MARGIN, "Total", "left"), (345, _money(total), "right"), (410, _money(paid), "right"), (475, _money(balance), "right")], size=9, bold=True)
+    doc.space(10)
+
+    doc.text("Payments", size=11, bold=True)
+    columns = [(MARGIN, "left"), (115, "left"), (275, "left"), (345, "left"), (475, "right"), (_RIGHT, "right")]
+    doc.row([(x, label, align) for (x, align), label in zip(columns, ("Date", "Payment no", "Course", "Mode", "Amount", "Status"))], size=9, bold=True)
+    for payment in data["payments"]:
+        values = (
+            payment["payment_date"], _clip(payment["payment_no"], 28), payment["course"],
+            payment["mode"].replace("_", " ").title(), _money(payment["amount"]), payment["status"].title(),
+        )
+        doc.row([(x, value, align) for (x, align), value in zip(columns, values)], size=9)
+    if not data["payments"]:
+        doc.text("No payments.", size=9)
+
+    doc.rule()
+    doc.row([(MARGIN, "Outstanding balance", "left"), (_RIGHT, f"INR {_money(balance)}", "right")], size=12, bold=True)
+    return doc.render()
+
+
+def render_receipt(data: Dict[str, Any]) -> bytes:
+    doc = PdfDocument(f"Payment receipt - {data['payment_no']}")
+    _header(doc, "Payment Receipt", data["student"])
+    doc.rule()
+    for label, value in (
+        ("Receipt no", data["payment_no"]),
+        ("Payment date", data["payment_date"]),
+        ("Course", data["course"]),
+        ("Mode", data["mode"].replace("_", " ").title()),
+        ("Reference no", data["reference_no"] or "-"),
+        ("Status", data["status"].title()),
+    ):
+        doc.row([(MARGIN, label, "left"), (180, value, "left")])
+    if data["status"] != "posted" and data["void_reason"]:
+        doc.row([(MARGIN, "Reason", "left"), (180, _clip(data["void_reason"], 70), "left")])
+    doc.rule()
+    doc.row([(MARGIN, "Amount received", "left"), (_RIGHT, f"INR {_money(data['amount'])}", "right")], size=12, bold=True)
+    if data["status"] != "posted":
+        doc.space(6)
+        doc.text(f"This payment was {data['status']} and no longer counts towards the balance.", size=9)
+    return doc.render()
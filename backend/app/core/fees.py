@@ -0,0 +1,59 @@
+"""Fee record arithmetic shared by the fee endpoints and the fee jobs.
+
+Late fees are applied lazily: a record's total, balance and status are recomputed from its
+fee, late fee and paid amounts as of today whenever it is read for display or changed.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Any, Optional
+
+
+def to_decimal(value: Optional[Decimal]) -> Decimal:
+    if value is None:
+        return Decimal("0.00")
+    return Decimal(str(value)).quantize(Decimal("0.01"))
+
+
+def compute_status(due_date: date, balance_amount: Decimal) -> str:
+    if balance_amount <= Decimal("0.00"):
+        return "paid"
+    if date.today() > due_date:
+        return "overdue"
+    return "pending"
+
+
+def is_late_fee_applicable(due_date: date, fee_amount: Decimal, late_fee_amount: Decimal, paid_amount: Decimal) -> bool:
+    if late_fee_amount <= Decimal("0.00"):
+        return False
+    if date.today() <= due_date:
+        return False
+    return paid_amount < (fee_amount + late_fee_amount)
+
+
+def recalculate_fee_record(record: Any) -> bool:
+    """Update ``total_amount``, ``balance_amount`` and ``status`` in place; returns whether any changed."""
+    r: Any = record
+    fee_amount = to_decimal(r.fee_amount)
+    late_fee = to_decimal(r.late_fee_amount)
+    paid_amount = to_decimal(r.paid_amount)
+
+    effective_late = late_fee if is_late_fee_applicable(r.due_date, fee_amount, late_fee, paid_amount) else Decimal("0.00")
+    total_amount = fee_amount + effective_late
+    balance_amount = total_amount - paid_amount
+    if balance_amount < Decimal("0.00"):
+        balance_amount = Decimal("0.00")
+
+    status = compute_status(r.due_date, balance_amount)
+
+    changed = (
+        to_decimal(r.total_amount) != total_amount
+        or to_decimal(r.balance_amount) != balance_amount
+        or r.status != status
+    )
+
+    if changed:
+        setattr(r, "total_amount", total_amount)
+        setattr(r, "balance_amount", balance_amount)
+        setattr(r, "status", status)
+
+    return changed
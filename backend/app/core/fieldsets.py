@@ -0,0 +1,50 @@
+"""Sparse fieldsets: ``?fields=id,student_id,full_name`` narrows a list response.
+
+The requested names are checked against the response model, the query selects only the
+matching columns, and the rows are serialized with a model reduced to those fields. ``id``
+is always included so clients can key the rows.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, create_model
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[List[str]]:
+    """Validate a comma-separated ``fields`` value; ``None`` means every field."""
+    if fields is None or not fields.strip():
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in model.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available fields: {', '.join(model.model_fields)}",
+        )
+    selected = ["id"] if "id" in model.model_fields else []
+    for name in requested:
+        if name not in selected:
+            selected.append(name)
+    return selected
+
+
+def select_columns(columns: Dict[str, Any], fields: Optional[Sequence[str]]) -> List[Any]:
+    """Labelled column expressions for ``fields`` (all of ``columns`` when ``fields`` is None)."""
+    names = list(columns) if fields is None else [name for name in fields if name in columns]
+    return [columns[name].label(name) for name in names]
+
+
+@lru_cache(maxsize=256)
+def _partial_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    definitions: Dict[str, Any] = {
+        name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields
+    }
+    return create_model(f"{model.__name__}Fields", __config__=model.model_config, **definitions)
+
+
+def fieldset_model(model: Type[BaseModel], fields: Optional[Sequence[str]]) -> Type[BaseModel]:
+    """``model`` reduced to ``fields``; columns selected only for sorting are dropped on output."""
+    if fields is None:
+        return model
+    return _partial_model(model, tuple(fields))
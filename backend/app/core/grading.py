@@ -0,0 +1,110 @@
+"""Letter grade scales, and score statistics and curving over a whole assessment at once.
+
+Works on NumPy arrays of percentages (0-100), so an assessment with thousands of grades is
+summarised, curved and given letter grades in a few vectorised passes instead of row by row.
+"""
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+# Built-in scale: lowest percentage for each letter grade, best first; anything below the last is "F".
+LETTER_GRADE_CUTOFFS = (
+    (90, "A+"),
+    (80, "A"),
+    (75, "B+"),
+    (70, "B"),
+    (65, "C+"),
+    (60, "C"),
+    (50, "D"),
+)
+FAILING_GRADE = "F"
+
+CURVE_METHODS = ("none", "linear", "zscore")
+
+
+class LetterScale:
+    """Letter grades by lowest percentage; percentages below every cutoff get ``FAILING_GRADE``."""
+
+    def __init__(self, cutoffs: Iterable[Tuple[float, str]]):
+        ordered = sorted((float(cutoff), letter) for cutoff, letter in cutoffs)
+        self.cutoffs = [cutoff for cutoff, _ in ordered]
+        # Index 0 is for percentages below the lowest cutoff.
+        self.letters = [FAILING_GRADE] + [letter for _, letter in ordered]
+        self._cutoff_array = np.array(self.cutoffs, dtype=float)
+        self._letter_array = np.array(self.letters, dtype=object)
+
+    def letter(self, percentage: float) -> str:
+        return self.letters[bisect_right(self.cutoffs, percentage)]
+
+    def letters_for(self, percentages: np.ndarray) -> np.ndarray:
+        return self._letter_array[np.searchsorted(self._cutoff_array, percentages, side="right")]
+
+
+DEFAULT_SCALE = LetterScale(LETTER_GRADE_CUTOFFS)
+
+
+def letter_grades(percentages: np.ndarray, scale: LetterScale = DEFAULT_SCALE) -> np.ndarray:
+    """Letter grade for each percentage, by the same cutoffs as a single grade."""
+    return scale.letters_for(percentages)
+
+
+def score_statistics(percentages: np.ndarray, bins: int = 10) -> Dict[str, Any]:
+    """Count, mean, median, standard deviation, percentiles and a 0-100 histogram of ``bins`` bins."""
+    counts, edges = np.histogram(percentages, bins=bins, range=(0, 100))
+    if not percentages.size:
+        return {
+            "count": 0, "mean": None, "median": None, "std": None, "min": None, "max": None,
+            "percentiles": {}, "histogram": {"edges": edges.round(2).tolist(), "counts": counts.tolist()},
+        }
+    p10, p25, p75, p90 = np.percentile(percentages, [10, 25, 75, 90])
+    return {
+        "count": int(percentages.size),
+        "mean": round(float(percentages.mean()), 2),
+        "median": round(float(np.median(percentages)), 2),
+        "std": round(float(percentages.std()), 2),
+        "min": round(float(percentages.min()), 2),
+        "max": round(float(percentages.max()), 2),
+        "percentiles": {"p10": round(float(p10), 2), "p25": round(float(p25), 2), "p75": round(float(p75), 2), "p90": round(float(p90), 2)},
+        "histogram": {"edges": edges.round(2).tolist(), "counts": counts.tolist()},
+    }
+
+
+def curve(
+    percentages: np.ndarray,
+    method: str,
+    target_mean: Optional[float] = None,
+    target_max: float = 100,
+    target_std: Optional[float] = None,
+) -> np.ndarray:
+    """Curved percentages, clipped to 0-100 and rounded to 2 places.
+
+    - ``none``: unchanged (resets an earlier curve when given the raw percentages).
+    - ``linear``: ``a * p + b``, scaling the top score to ``target_max`` and, when
+      ``target_mean`` is given, also moving the mean there.
+    - ``zscore``: ``target_mean + z * target_std``; ``target_std`` defaults to the current spread.
+    """
+    if method not in CURVE_METHODS:
+        raise ValueError(f"Unknown curve method {method!r}")
+    if method == "linear" and target_mean is not None and target_mean >= target_max:
+        # The scale factor would be zero or negative, flattening or inverting the ranking.
+        raise ValueError("A linear curve needs a target mean below the target max")
+    curved = percentages.astype(float)
+    if percentages.size and method == "linear":
+        top, mean = curved.max(), curved.mean()
+        if target_mean is None:
+            curved = curved * (target_max / top) if top > 0 else curved
+        elif top > mean:
+            scale = (target_max - target_mean) / (top - mean)
+            curved = target_mean + (curved - mean) * scale
+        else:
+            # Every score is the same: only the shift is defined.
+            curved = curved + (target_mean - mean)
+    elif percentages.size and method == "zscore":
+        if target_mean is None:
+            raise ValueError("A z-score curve needs a target mean")
+        mean, std = curved.mean(), curved.std()
+        spread = std if target_std is None else target_std
+        curved = target_mean + ((curved - mean) / std if std > 0 else 0) * spread
+    return np.clip(curved, 0, 100).round(2)
@@ -0,0 +1,102 @@
+"""In-process background jobs with progress reporting.
+
+Long maintenance tasks (ledger checks, bulk deletes, recomputations) run on a small thread
+pool so the request that starts them returns immediately with a job id; clients poll
+``GET /api/jobs/{id}``. Job state lives in process memory, matching the single worker this
+app is deployed with, and only the most recent jobs are kept.
+"""
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_MAX_FINISHED_JOBS = 100
+
+_executor: Optional[ThreadPoolExecutor] = None
+_jobs: Dict[str, "Job"] = {}
+_lock = threading.Lock()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Job:
+    def __init__(self, name: str, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.params = params
+        self.status = "pending"
+        self.progress: Dict[str, Any] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = _now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    def update(self, **progress: Any) -> None:
+        self.progress = {**self.progress, **progress}
+
+    def _run(self, fn: Callable[..., Any]) -> None:
+        self.status = "running"
+        self.started_at = _now()
+        try:
+            self.result = fn(self, **self.params)
+            self.status = "succeeded"
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", self.id, self.name)
+            self.error = str(exc)
+            self.status = "failed"
+        finally:
+            self.finished_at = _now()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="job")
+    return _executor
+
+
+def _prune() -> None:
+    finished = [job for job in _jobs.values() if job.finished_at is not None]
+    finished.sort(key=lambda job: job.finished_at)
+    for job in finished[:-_MAX_FINISHED_JOBS]:
+        del _jobs[job.id]
+
+
+def submit(name: str, fn: Callable[..., Any], **params: Any) -> Job:
+    """Queue ``fn(job, **params)`` on the job pool and return its handle."""
+    job = Job(name, params)
+    with _lock:
+        _prune()
+        _jobs[job.id] = job
+    _get_executor().submit(job._run, fn)
+    return job
+
+
+def get(job_id: str) -> Optional[Job]:
+    return _jobs.get(job_id)
+
+
+def recent(name: Optional[str] = None) -> List[Job]:
+    jobs = [job for job in list(_jobs.values()) if name is None or job.name == name]
+    return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+
+class CommandLineJob(Job):
+    """Stand-in handle for running a job function from the command line, logging progress."""
+
+    def __init__(self, name: str):
+        super().__init__(name, {})
+
+    def update(self, **progress: Any) -> None:
+        super().update(**progress)
+        logger.info("%s progress: %s", self.name, self.progress)
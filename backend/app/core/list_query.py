@@ -0,0 +1,224 @@
+"""Whitelisted filtering, sorting and keyset pagination for list endpoints.
+
+Filters are query parameters named after a whitelisted column, with an optional operator
+prefix; repeating a parameter ANDs the conditions:
+
+    ?status=in:active,graduated&gpa=gte:3&gpa=lt:3.8&sort=-enrollment_date,student_id
+
+Operators: eq (default), ne, gt, gte, lt, lte, in, nin, null (``null:true``/``null:false``).
+Sorts list columns separated by commas, ``-`` for descending; NULLs always sort last and
+the primary key is appended as a tiebreaker so the order is total.
+
+When a page is full the response carries an ``X-Next-Cursor`` header. Passing it back as
+``cursor=`` continues after the last row with a keyset predicate instead of OFFSET, so deep
+pages cost the same as the first one; ``skip`` cannot be combined with a cursor.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Column, and_, or_
+from starlette.datastructures import QueryParams
+
+
+OPERATORS = ("eq", "ne", "gt", "gte", "lt", "lte", "in", "nin", "null")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SortKey = Tuple[Column, bool]
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _is_indexed(column: Column) -> bool:
+    if column.primary_key or column.index or column.unique:
+        return True
+    return any(list(index.columns)[0] is column for index in column.table.indexes)
+
+
+def _parse_bool(raw: Any) -> bool:
+    if str(raw).lower() in ("true", "1"):
+        return True
+    if str(raw).lower() in ("false", "0"):
+        return False
+    raise ValueError(raw)
+
+
+def _coerce(column: Column, raw: Any) -> Any:
+    if raw is None:
+        return None
+    python_type = column.type.python_type
+    try:
+        if python_type is bool:
+            return _parse_bool(raw)
+        if python_type is datetime:
+            return datetime.fromisoformat(str(raw))
+        if python_type is date:
+            return date.fromisoformat(str(raw))
+        return python_type(raw)
+    except (ValueError, TypeError, InvalidOperation):
+        raise _bad_request(f"Invalid value for '{column.name}': {raw!r}")
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class ListSpec:
+    """The filterable and sortable columns of one list endpoint.
+
+    Only indexed columns may be whitelisted, so every filter and sort a client can ask for
+    is served by an index; this is checked when the spec is declared. Names are looked up on
+    ``model`` first, then on the ``joined`` models, which the endpoint's query must inner-join.
+    """
+
+    def __init__(self, model: Any, filters: Sequence[str], sorts: Sequence[str], default_sort: str, joined: Sequence[Any] = ()):
+        table = model.__table__
+        columns: Dict[str, Column] = {}
+        for source in reversed([model, *joined]):
+            columns.update(source.__table__.c.items())
+        self.filters: Dict[str, Column] = {name: columns[name] for name in filters}
+        self.sorts: Dict[str, Column] = {name: columns[name] for name in sorts}
+        self.primary_key: Column = list(table.primary_key.columns)[0]
+        self.default_sort = default_sort
+        unindexed = [
+            name for name, column in {**self.filters, **self.sorts}.items() if not _is_indexed(column)
+        ]
+        if unindexed:
+            raise ValueError(f"{table.name}: cannot filter or sort on unindexed columns {unindexed}")
+
+    def _filter_clause(self, column: Column, raw: str) -> Any:
+        operator, separator, value = raw.partition(":")
+        if not separator or operator not in OPERATORS:
+            operator, value = "eq", raw
+
+        if operator == "null":
+            try:
+                is_null = _parse_bool(value)
+            except ValueError:
+                raise _bad_request(f"'{column.name}=null:' expects true or false")
+            return column.is_(None) if is_null else column.isnot(None)
+        if operator in ("in", "nin"):
+            values = [_coerce(column, item) for item in value.split(",") if item != ""]
+            if not values:
+                raise _bad_request(f"'{column.name}={operator}:' needs at least one value")
+            return column.in_(values) if operator == "in" else column.notin_(values)
+
+        value = _coerce(column, value)
+        return {
+            "eq": column.__eq__,
+            "ne": column.__ne__,
+            "gt": column.__gt__,
+            "gte": column.__ge__,
+            "lt": column.__lt__,
+            "lte": column.__le__,
+        }[operator](value)
+
+    def _sort_keys(self, sort: Optional[str]) -> List[SortKey]:
+        keys: List[SortKey] = []
+        for item in (sort or self.default_sort).split(","):
+            item = item.strip()
+            name = item.lstrip("-")
+            if name not in self.sorts:
+                raise _bad_request(f"Cannot sort by '{name}'. Sortable fields: {', '.join(self.sorts)}")
+            keys.append((self.sorts[name], item.startswith("-")))
+        if all(column is not self.primary_key for column, _ in keys):
+            keys.append((self.primary_key, False))
+        return keys
+
+    def projection(self, fields: Optional[List[str]], sort: Optional[str] = None) -> Optional[List[str]]:
+        """``fields`` plus the sort columns the next-page cursor is built from."""
+        if fields is None:
+            return None
+        return fields + [column.name for column, _ in self._sort_keys(sort) if column.name not in fields]
+
+    def openapi_extra(self) -> Dict[str, Any]:
+        """The filter parameters for the route's ``openapi_extra``; they are read from the raw query string."""
+        return {"parameters": [
+            {
+                "name": name,
+                "in": "query",
+                "required": False,
+                "description": f"Filter on {name}: a value or operator:value ({', '.join(OPERATORS)}); repeat to combine",
+                "schema": {"type": "array", "items": {"type": "string"}},
+                "style": "form",
+                "explode": True,
+            }
+            for name in self.filters
+        ]}
+
+    def apply(
+        self, query: Any, params: QueryParams, sort: Optional[str] = None, cursor: Optional[str] = None, skip: int = 0
+    ) -> "ListPage":
+        """Add the requested filters, ordering and cursor predicate to ``query``."""
+        if cursor and skip:
+            raise _bad_request("Pass either skip or cursor, not both")
+        for name, column in self.filters.items():
+            for raw in params.getlist(name):
+                query = query.filter(self._filter_clause(column, raw))
+
+        keys = self._sort_keys(sort)
+        sort_id = ",".join(f"{'-' if descending else ''}{column.name}" for column, descending in keys)
+        if cursor:
+            query = query.filter(_after(keys, _decode_cursor(cursor, keys, sort_id)))
+
+        order_by = []
+        for column, descending in keys:
+            clause = column.desc() if descending else column.asc()
+            order_by.append(clause.nullslast() if column.nullable else clause)
+        return ListPage(query.order_by(*order_by), keys, sort_id)
+
+
+class ListPage:
+    def __init__(self, query: Any, keys: List[SortKey], sort_id: str):
+        self.query = query
+        self.keys = keys
+        self.sort_id = sort_id
+
+    def headers(self, rows: Sequence[Mapping[str, Any]], limit: int) -> Dict[str, str]:
+        """``X-Next-Cursor`` pointing after the last row, when the page came back full."""
+        if not rows or len(rows) < limit:
+            return {}
+        last = rows[-1]
+        payload = {"sort": self.sort_id, "after": [_encode(last[column.name]) for column, _ in self.keys]}
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+        return {NEXT_CURSOR_HEADER: token}
+
+
+def _decode_cursor(cursor: str, keys: List[SortKey], sort_id: str) -> List[Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = payload["after"]
+        cursor_sort = payload["sort"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise _bad_request("Invalid cursor")
+    if cursor_sort != sort_id or not isinstance(values, list) or len(values) != len(keys):
+        raise _bad_request("Cursor does not match the requested sort order")
+    return [_coerce(column, value) for (column, _), value in zip(keys, values)]
+
+
+def _after(keys: List[SortKey], values: List[Any]) -> Any:
+    """Rows strictly after ``values`` in the (NULLS LAST) sort order described by ``keys``."""
+    branches = []
+    equal_so_far: List[Any] = []
+    for (column, descending), value in zip(keys, values):
+        if value is None:
+            # Nothing sorts after NULL within this key; only ties can continue.
+            equal_so_far.append(column.is_(None))
+            continue
+        beyond = column < value if descending else column > value
+        if column.nullable:
+            beyond = or_(beyond, column.is_(None))
+        branches.append(and_(*equal_so_far, beyond))
+        equal_so_far.append(column == value)
+    return or_(*branches)
@@ -0,0 +1,295 @@
+"""In-process Prometheus metrics for HTTP routes and database activity (per worker process)."""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+ROW_COUNT_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+
+LabelValues = Tuple[str, ...]
+MetricT = TypeVar("MetricT", bound="_Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        lines = self.header()
+        for key, value in sorted(items):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Gauge whose samples are read from a callback at scrape time."""
+
+    metric_type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[Tuple[LabelValues, float]]],
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._collect = collect
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, value in self._collect():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = [0] * len(self.buckets)
+                self._counts[key] = counts
+                self._sums[key] = 0.0
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._sums[key] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        lines = self.header()
+        bucket_labels = self.labelnames + ("le",)
+        for key, counts, total in sorted(items):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(bucket_labels, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: MetricT) -> MetricT:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status code.",
+    ("method", "route", "status"),
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route"),
+))
+http_request_db_queries = registry.register(Histogram(
+    "http_request_db_queries",
+    "Database statements executed per HTTP request.",
+    ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+))
+http_request_db_seconds = registry.register(Histogram(
+    "http_request_db_seconds",
+    "Time spent in database statements per HTTP request.",
+    ("method", "route"),
+))
+http_request_db_rows = registry.register(Histogram(
+    "http_request_db_rows",
+    "Rows returned by queries per HTTP request (where the driver reports SELECT row counts).",
+    ("method", "route"),
+    buckets=ROW_COUNT_BUCKETS,
+))
+db_queries_total = registry.register(Counter(
+    "db_queries_total",
+    "Database statements executed.",
+    ("engine",),
+))
+db_query_duration_seconds = registry.register(Histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time.",
+    ("engine",),
+))
+db_rows_loaded_total = registry.register(Counter(
+    "db_rows_loaded_total",
+    "Rows returned by queries (where the driver reports SELECT row counts).",
+    ("engine",),
+))
+db_rows_affected_total = registry.register(Counter(
+    "db_rows_affected_total",
+    "Rows affected by INSERT, UPDATE and DELETE statements.",
+    ("engine",),
+))
+
+
+class RequestStats:
+    """Database activity attributed to the request currently being served."""
+
+    __slots__ = ("queries", "db_seconds", "rows_loaded")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows_loaded = 0
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+_instrumented_engines: Dict[str, Engine] = {}
+
+
+def _collect_pool_stats(attribute: str) -> Callable[[], Iterable[Tuple[LabelValues, float]]]:
+    def collect() -> Iterable[Tuple[LabelValues, float]]:
+        for engine_name, engine in list(_instrumented_engines.items()):
+            reader = getattr(engine.pool, attribute, None)
+            if callable(reader):
+                yield (engine_name,), float(reader())
+    return collect
+
+
+for _attribute, _documentation in (
+    ("size", "Configured size of the connection pool."),
+    ("checkedout", "Connections currently checked out of the pool."),
+    ("checkedin", "Idle connections currently held in the pool."),
+    ("overflow", "Connections opened beyond the configured pool size."),
+):
+    registry.register(Gauge(f"db_pool_{_attribute}", _documentation, ("engine",), _collect_pool_stats(_attribute)))
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Attach statement counters and timers to an engine (idempotent per name)."""
+    if name in _instrumented_engines:
+        return
+    _instrumented_engines[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        db_queries_total.inc(engine=name)
+        db_query_duration_seconds.observe(elapsed, engine=name)
+        is_write = context is not None and (context.isinsert or context.isupdate or context.isdelete)
+        if is_write and cursor.rowcount and cursor.rowcount > 0:
+            db_rows_affected_total.inc(cursor.rowcount, engine=name)
+        # Rows a SELECT returns, whether they become ORM objects or plain tuples. PostgreSQL drivers
+        # report the count once the statement completes; SQLite and server-side cursors report -1.
+        rows = cursor.rowcount if not is_write and cursor.description is not None and cursor.rowcount > 0 else 0
+        if rows:
+            db_rows_loaded_total.inc(rows, engine=name)
+
+        stats = _current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+            stats.rows_loaded += rows
+
+
+def begin_request() -> RequestStats:
+    stats = RequestStats()
+    _current_request.set(stats)
+    return stats
+
+
+def observe_request(method: str, route: str, status_code: int, elapsed: float, stats: RequestStats) -> None:
+    http_requests_total.inc(method=method, route=route, status=str(status_code))
+    http_request_duration_seconds.observe(elapsed, method=method, route=route)
+    http_request_db_queries.observe(stats.queries, method=method, route=route)
+    http_request_db_seconds.observe(stats.db_seconds, method=method, route=route)
+    http_request_db_rows.observe(stats.rows_loaded, method=method, route=route)
+
+
+def render() -> str:
+    return registry.render()
@@ -0,0 +1,104 @@
+"""Minimal PDF writer for text documents (statements, receipts).
+
+Supports the built-in Helvetica fonts, left/right aligned text, horizontal rules and
+automatic page breaks, which is all the fee documents need, without adding a PDF library.
+Output is deterministic: the same content always produces the same bytes.
+"""
+import zlib
+from typing import List, Sequence, Tuple
+
+
+PAGE_WIDTH = 595  # A4 in points
+PAGE_HEIGHT = 842
+MARGIN = 50
+
+# Helvetica advance widths (1/1000 em) for characters that appear in right-aligned amounts.
+_NARROW_WIDTHS = {".": 278, ",": 278, " ": 278, "-": 333, "/": 278, ":": 278}
+_DEFAULT_WIDTH = 556
+
+Cell = Tuple[float, str, str]  # (x, text, "left" | "right")
+
+
+def _escape(value: str) -> str:
+    encoded = value.encode("cp1252", errors="replace").decode("latin-1")
+    return encoded.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def text_width(value: str, size: float) -> float:
+    return sum(_NARROW_WIDTHS.get(char, _DEFAULT_WIDTH) for char in value) * size / 1000
+
+
+class PdfDocument:
+    """Lays out lines top to bottom, starting a new page when the current one is full."""
+
+    def __init__(self, title: str):
+        self.title = title
+        self._pages: List[List[str]] = []
+        self._y = 0.0
+        self.new_page()
+
+    def new_page(self) -> None:
+        self._pages.append([])
+        self._y = PAGE_HEIGHT - MARGIN
+
+    def _ensure_space(self, height: float) -> None:
+        if self._y - height < MARGIN:
+            self.new_page()
+
+    def row(self, cells: Sequence[Cell], size: float = 10, bold: bool = False, leading: float = 1.5) -> None:
+        height = size * leading
+        self._ensure_space(height)
+        self._y -= height
+        font = "F2" if bold else "F1"
+        for x, value, align in cells:
+            if align == "right":
+                x -= text_width(value, size)
+            self._pages[-1].append(f"BT /{font} {size:g} Tf {x:.2f} {self._y:.2f} Td ({_escape(value)}) Tj ET")
+
+    def text(self, value: str, size: float = 10, bold: bool = False) -> None:
+        self.row([(MARGIN, value, "left")], size=size, bold=bold)
+
+    def rule(self, gap: float = 6) -> None:
+        self._ensure_space(gap * 2)
+        self._y -= gap
+        self._pages[-1].append(f"0.6 w {MARGIN} {self._y:.2f} m {PAGE_WIDTH - MARGIN} {self._y:.2f} l S")
+        self._y -= gap
+
+    def space(self, height: float = 8) -> None:
+        self._y -= height
+
+    def render(self) -> bytes:
+        objects: List[bytes] = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"",  # page tree, filled in once the page object numbers are known
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+            f"<< /Title ({_escape(self.title)}) /Producer (EduManage) >>".encode("latin-1"),
+        ]
+        page_refs = []
+        for number, operations in enumerate(self._pages, start=1):
+            footer = f"Page {number} of {len(self._pages)}"
+            operations = operations + [
+                f"BT /F1 8 Tf {PAGE_WIDTH - MARGIN - text_width(footer, 8):.2f} {MARGIN / 2:.2f} Td ({footer}) Tj ET"
+            ]
+            stream = zlib.compress("\n".join(operations).encode("latin-1"))
+            objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+            content_ref = len(objects)
+            objects.append(
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_ref} 0 R >>".encode("latin-1")
+            )
+            page_refs.append(f"{len(objects)} 0 R")
+        objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(page_refs)} >>".encode("latin-1")
+
+        output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(output))
+            output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        xref_offset = len(output)
+        output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        for offset in offsets:
+            output += b"%010d 00000 n \n" % offset
+        output += b"trailer\n<< /Size %d /Root 1 0 R /Info 5 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+        return bytes(output)
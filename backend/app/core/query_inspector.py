@@ -0,0 +1,116 @@
+"""Development aid that flags slow requests and N+1 query patterns."""
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s|(?<!:):\w+|\$\d+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse literals, placeholders and whitespace so equivalent statements compare equal."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryLog:
+    """Statements executed while serving one request."""
+
+    __slots__ = ("statements", "parameters", "durations")
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self.parameters: Dict[str, Set[str]] = {}
+        self.durations: Dict[str, float] = {}
+
+    def record(self, statement: str, parameters, elapsed: float) -> None:
+        normalized = normalize_sql(statement)
+        self.statements.append(normalized)
+        self.parameters.setdefault(normalized, set()).add(repr(parameters))
+        self.durations[normalized] = self.durations.get(normalized, 0.0) + elapsed
+
+    @property
+    def query_count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def db_seconds(self) -> float:
+        return sum(self.durations.values())
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int, int]]:
+        """Statements run at least ``threshold`` times with varying parameters (the N+1 signature)."""
+        repeated = []
+        for statement, count in Counter(self.statements).most_common():
+            if count < threshold:
+                break
+            distinct_parameters = len(self.parameters[statement])
+            if distinct_parameters > 1:
+                repeated.append((statement, count, distinct_parameters))
+        return repeated
+
+
+_current_log: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+_inspected_engines: Set[int] = set()
+
+
+def inspect_engine(engine: Engine) -> None:
+    if id(engine) in _inspected_engines:
+        return
+    _inspected_engines.add(id(engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("inspector_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["inspector_start_time"].pop()
+        query_log = _current_log.get()
+        if query_log is not None:
+            query_log.record(statement, parameters, elapsed)
+        if elapsed * 1000 >= settings.QUERY_INSPECTOR_SLOW_QUERY_MS:
+            logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, normalize_sql(statement))
+
+
+def begin_request() -> QueryLog:
+    query_log = QueryLog()
+    _current_log.set(query_log)
+    return query_log
+
+
+def report_request(method: str, path: str, query_log: QueryLog) -> None:
+    repeated = query_log.repeated_statements(settings.QUERY_INSPECTOR_REPEAT_THRESHOLD)
+    too_many = query_log.query_count > settings.QUERY_INSPECTOR_MAX_QUERIES
+    if not repeated and not too_many:
+        return
+
+    lines = [
+        f"{method} {path} ran {query_log.query_count} queries in {query_log.db_seconds * 1000:.1f} ms"
+    ]
+    for statement, count, distinct_parameters in repeated:
+        lines.append(
+            f"  possible N+1: {count}x ({distinct_parameters} distinct params, "
+            f"{query_log.durations[statement] * 1000:.1f} ms) {statement}"
+        )
+    if too_many and not repeated:
+        for statement, count in Counter(query_log.statements).most_common(5):
+            lines.append(f"  {count}x ({query_log.durations[statement] * 1000:.1f} ms) {statement}")
+    logger.warning("\n".join(lines))
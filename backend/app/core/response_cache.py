@@ -0,0 +1,102 @@
+"""ETag revalidation and an in-memory body cache for slowly changing reference data.
+
+Each cached endpoint declares the tables its response is built from. Write handlers call
+``invalidate`` for the tables they modify, which bumps that table's version; the ETag is
+derived from the request URL and the current versions, so a conditional request can be
+answered with 304 without running any query.
+
+Versions live in process memory, matching the single uvicorn worker this app is deployed
+with. Running several workers would need a shared version store.
+"""
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.serialization import dump_json
+
+
+# Distinguishes versions from a previous process so stale ETags never match after a restart.
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+_versions: Dict[str, int] = {}
+_versions_lock = threading.Lock()
+
+_entries: "OrderedDict[Tuple[str, str], Tuple[float, bytes]]" = OrderedDict()
+_entries_lock = threading.Lock()
+
+
+def invalidate(*tables: str) -> None:
+    with _versions_lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+
+def _cache_key(request: Request, tables: Sequence[str]) -> Tuple[str, str]:
+    with _versions_lock:
+        versions = ",".join(f"{table}:{_versions.get(table, 0)}" for table in tables)
+    url = request.url.path
+    if request.url.query:
+        url += "?" + "&".join(sorted(request.url.query.split("&")))
+    digest = hashlib.sha1(f"{_BOOT_ID}|{versions}|{url}".encode()).hexdigest()[:20]
+    return url, f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _json_response(body: bytes, etag: str) -> Response:
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+    )
+
+
+class CachedRequest:
+    """Cache key for one request, captured before the endpoint queries.
+
+    Taking the versions up front means a write that lands mid-request is never cached
+    under the newer version.
+    """
+
+    def __init__(self, request: Request, *tables: str):
+        self.url, self.etag = _cache_key(request, tables)
+        self.hit = self._lookup(request)
+
+    def _lookup(self, request: Request) -> Optional[Response]:
+        if etag_matches(request, self.etag):
+            return Response(status_code=304, headers={"ETag": self.etag, "Cache-Control": "private, no-cache"})
+
+        key = (self.url, self.etag)
+        with _entries_lock:
+            entry = _entries.get(key)
+            if entry is None:
+                return None
+            stored_at, body = entry
+            if time.monotonic() - stored_at > settings.RESPONSE_CACHE_TTL_SECONDS:
+                del _entries[key]
+                return None
+            _entries.move_to_end(key)
+        return _json_response(body, self.etag)
+
+    def respond(self, content: Any, response_model: Any) -> Response:
+        """Serialize ``content`` as ``response_model``, cache the bytes and return them with the ETag."""
+        body = dump_json(content, response_model)
+        key = (self.url, self.etag)
+        with _entries_lock:
+            _entries[key] = (time.monotonic(), body)
+            _entries.move_to_end(key)
+            while len(_entries) > settings.RESPONSE_CACHE_MAX_ENTRIES:
+                _entries.popitem(last=False)
+        return _json_response(body, self.etag)
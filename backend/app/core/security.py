@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
@@ -5,6 +6,9 @@ import bcrypt
 from app.core.config import settings
 
 
+logger = logging.getLogger(__name__)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     
@@ -17,11 +21,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         to_encode["sub"] = str(to_encode["sub"])
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    import logging
-    logging.getLogger(__name__).info(
-        "JWT created: sub=%s email=%s role=%s len=%s", 
-        data.get("sub"), data.get("email"), data.get("role"), len(encoded_jwt)
-    )
+    logger.debug("JWT created", extra={"sub": to_encode.get("sub"), "role": data.get("role")})
     return encoded_jwt
 
 
@@ -30,8 +30,7 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError as exc:
-        import logging
-        logging.getLogger(__name__).warning("JWT decode failed: %s", exc)
+        logger.warning("JWT decode failed: %s", exc)
         return None
 
 
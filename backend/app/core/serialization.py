@@ -0,0 +1,25 @@
+from typing import Any, Dict
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def _adapter(response_model: Any) -> TypeAdapter:
+    adapter = _adapters.get(response_model)
+    if adapter is None:
+        adapter = _adapters.setdefault(response_model, TypeAdapter(response_model))
+    return adapter
+
+
+def dump_json(content: Any, response_model: Any) -> bytes:
+    """Validate ``content`` (models, dicts or row mappings) against ``response_model`` once and encode it to JSON bytes."""
+    adapter = _adapter(response_model)
+    return adapter.dump_json(adapter.validate_python(content))
+
+
+def json_response(content: Any, response_model: Any, **kwargs: Any) -> Response:
+    """Serialize list endpoints in one pass and skip FastAPI's second ``response_model`` validation."""
+    return Response(content=dump_json(content, response_model), media_type="application/json", **kwargs)
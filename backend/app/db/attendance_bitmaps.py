@@ -0,0 +1,161 @@
+"""Compact present/absent history per student and course offering (``attendance_bitmaps``).
+
+Each row holds two bitsets with one bit per calendar day from ``start_date``: ``recorded``
+(a mark exists for that day) and ``present``. A term of daily sessions fits in a few dozen
+bytes, and attendance percentages and streaks over any date range are popcounts on a single
+row instead of scans over ``attendance``. Courses are per-term offerings (the semester
+rollover clones them), so one row covers one student's term in one course.
+
+The attendance endpoints update the bitmap in the transaction that writes the mark, after
+locking its row. Rows archived out of ``attendance`` (``app.jobs.term_archive``) stay counted
+here, so summaries keep covering closed terms.
+"""
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.db.models import Attendance, AttendanceBitmap
+
+
+logger = logging.getLogger(__name__)
+
+bitmaps = AttendanceBitmap.__table__
+attendance = Attendance.__table__
+
+PRESENT = "present"
+
+
+def _to_int(bits: Optional[bytes]) -> int:
+    return int.from_bytes(bits or b"", "little")
+
+
+def _to_bytes(value: int) -> bytes:
+    return value.to_bytes((value.bit_length() + 7) // 8, "little")
+
+
+def _connection(db: Union[Session, Connection]) -> Connection:
+    if isinstance(db, Session):
+        db.flush()
+        return db.connection()
+    return db
+
+
+def mark_attendance(db: Union[Session, Connection], student_id: int, course_id: int, day: date, status: Optional[str]) -> None:
+    """Set the bits for ``day`` to ``status`` (None clears the day) in the caller's transaction."""
+    conn = _connection(db)
+    insert = postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert
+    conn.execute(
+        insert(bitmaps)
+        .values(student_id=student_id, course_id=course_id, start_date=day, recorded=b"", present=b"")
+        .on_conflict_do_nothing(index_elements=["student_id", "course_id"])
+    )
+    row = conn.execute(
+        select(bitmaps).where(bitmaps.c.student_id == student_id, bitmaps.c.course_id == course_id).with_for_update()
+    ).one()
+
+    start, recorded, present = row.start_date, _to_int(row.recorded), _to_int(row.present)
+    if day < start:
+        # Marks before the first recorded day move the origin back.
+        shift = (start - day).days
+        start, recorded, present = day, recorded << shift, present << shift
+    bit = 1 << (day - start).days
+    if status is None:
+        recorded &= ~bit
+        present &= ~bit
+    else:
+        recorded |= bit
+        present = present | bit if status == PRESENT else present & ~bit
+
+    conn.execute(
+        update(bitmaps)
+        .where(bitmaps.c.student_id == student_id, bitmaps.c.course_id == course_id)
+        .values(start_date=start, recorded=_to_bytes(recorded), present=_to_bytes(present))
+    )
+
+
+def _window(start: date, date_from: Optional[date], date_to: Optional[date], length: int) -> int:
+    low = max((date_from - start).days, 0) if date_from else 0
+    high = min((date_to - start).days + 1, length) if date_to else length
+    return ((1 << (high - low)) - 1) << low if high > low else 0
+
+
+def summarize(row: Any, date_from: Optional[date] = None, date_to: Optional[date] = None) -> Dict[str, Any]:
+    """Sessions, presences, percentage and current present streak of one bitmap row within the dates."""
+    recorded, present = _to_int(row.recorded), _to_int(row.present)
+    mask = _window(row.start_date, date_from, date_to, recorded.bit_length())
+    recorded &= mask
+    present &= mask
+    sessions, attended = recorded.bit_count(), present.bit_count()
+
+    streak = 0
+    remaining = recorded
+    while remaining:
+        last = remaining.bit_length() - 1
+        if not present >> last & 1:
+            break
+        streak += 1
+        remaining ^= 1 << last
+    return {
+        "sessions": sessions,
+        "present": attended,
+        "absent": sessions - attended,
+        "percentage": round(attended * 100 / sessions, 2) if sessions else None,
+        "current_streak": streak,
+    }
+
+
+def load_bitmaps(conn: Any, student_id: Optional[int] = None, course_ids: Optional[Sequence[int]] = None) -> List[Any]:
+    query = select(bitmaps)
+    if student_id is not None:
+        query = query.where(bitmaps.c.student_id == student_id)
+    if course_ids is not None:
+        query = query.where(bitmaps.c.course_id.in_(course_ids))
+    return conn.execute(query.order_by(bitmaps.c.student_id, bitmaps.c.course_id)).all()
+
+
+def build_bitmaps(marks: Iterable[Tuple[int, int, date, str]]) -> List[Dict[str, Any]]:
+    """Bitmap rows for ``(student_id, course_id, date, status)`` marks sorted by student, course and date."""
+    rows: List[Dict[str, Any]] = []
+    key = None
+    start = None
+    recorded = present = 0
+    for student_id, course_id, day, status in marks:
+        if (student_id, course_id) != key:
+            if key is not None:
+                rows.append({"student_id": key[0], "course_id": key[1], "start_date": start, "recorded": _to_bytes(recorded), "present": _to_bytes(present)})
+            key, start, recorded, present = (student_id, course_id), day, 0, 0
+        bit = 1 << (day - start).days
+        recorded |= bit
+        if status == PRESENT:
+            present |= bit
+    if key is not None:
+        rows.append({"student_id": key[0], "course_id": key[1], "start_date": start, "recorded": _to_bytes(recorded), "present": _to_bytes(present)})
+    return rows
+
+
+def rebuild_attendance_bitmaps(conn: Connection, chunk_size: int = 5000) -> int:
+    """Replace every bitmap with one built from the ``attendance`` rows; returns the rows written."""
+    conn.execute(bitmaps.delete())
+    marks = conn.execution_options(yield_per=50000).execute(
+        select(attendance.c.student_id, attendance.c.course_id, attendance.c.date, attendance.c.status)
+        .order_by(attendance.c.student_id, attendance.c.course_id, attendance.c.date)
+    )
+    rows = build_bitmaps(marks)
+    for start in range(0, len(rows), chunk_size):
+        conn.execute(bitmaps.insert(), rows[start:start + chunk_size])
+    return len(rows)
+
+
+def backfill_attendance_bitmaps(engine: Engine) -> None:
+    """Build the bitmaps when the table is new (empty) but attendance already has rows."""
+    with engine.begin() as conn:
+        if conn.execute(select(bitmaps.c.student_id).limit(1)).first() is not None:
+            return
+        if conn.execute(select(attendance.c.id).limit(1)).first() is None:
+            return
+        logger.info("Built attendance bitmaps for %s student courses", rebuild_attendance_bitmaps(conn))
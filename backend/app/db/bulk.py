@@ -0,0 +1,45 @@
+"""Update many rows, each with its own values, without a round trip per row.
+
+On Postgres, ``UPDATE t SET ... FROM unnest(:ids, :values, ...) AS batch (...) WHERE t.id =
+batch.id`` writes a chunk in one statement with one array parameter per column, so it compiles
+once and costs one round trip; an executemany of a single-row UPDATE is sent row by row by
+pg8000. SQLite runs in process, where an executemany of one prepared statement is already the
+fastest way.
+"""
+from typing import Any, Dict, Sequence, Union
+
+from sqlalchemy import Table, bindparam, column, func, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+
+# Rows per statement on Postgres, to bound the size of the array parameters.
+_CHUNK = 5000
+
+
+def update_rows(db: Union[Session, Connection], table: Table, key: str, rows: Sequence[Dict[str, Any]]) -> int:
+    """Update the rows of ``table`` whose ``key`` column matches each dict in ``rows`` with that
+    dict's other columns (the same columns in every dict), in the caller's transaction; returns
+    the number of rows updated."""
+    if not rows:
+        return 0
+    conn = db.connection() if isinstance(db, Session) else db
+    names = [name for name in rows[0] if name != key]
+
+    if conn.dialect.name != "postgresql":
+        return conn.execute(
+            update(table).where(table.c[key] == bindparam(f"b_{key}")),
+            [{f"b_{key}": row[key], **{name: row[name] for name in names}} for row in rows],
+        ).rowcount
+
+    columns = [key, *names]
+    batch = func.unnest(
+        *(bindparam(f"batch_{name}", type_=ARRAY(table.c[name].type)) for name in columns)
+    ).table_valued(*(column(name, table.c[name].type) for name in columns)).render_derived(name="batch")
+    statement = update(table).where(table.c[key] == batch.c[key]).values({name: batch.c[name] for name in names})
+    updated = 0
+    for start in range(0, len(rows), _CHUNK):
+        chunk = rows[start:start + _CHUNK]
+        updated += conn.execute(statement, {f"batch_{name}": [row[name] for row in chunk] for name in columns}).rowcount
+    return updated
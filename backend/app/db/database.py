@@ -1,35 +1,59 @@
 import logging
+import threading
+import time
+from typing import Dict, Optional
 
-from sqlalchemy import create_engine, text
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.security import verify_token
 
 
 logger = logging.getLogger(__name__)
 
+SQLITE_FALLBACK_URL = "sqlite:///./edumanage_dev.db"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
 
-def _build_engine():
-    configured_database_url = settings.DATABASE_URL
-    database_url = configured_database_url or "sqlite:///./edumanage_dev.db"
 
+def _normalize_database_url(database_url: str) -> str:
     # Render usually provides postgresql:// URLs; map them to pg8000 since that is the installed driver.
     if database_url.startswith("postgresql://") and "+" not in database_url.split("://", 1)[0]:
-        database_url = database_url.replace("postgresql://", "postgresql+pg8000://", 1)
-    elif database_url.startswith("postgres://"):
-        database_url = database_url.replace("postgres://", "postgresql+pg8000://", 1)
+        return database_url.replace("postgresql://", "postgresql+pg8000://", 1)
+    if database_url.startswith("postgres://"):
+        return database_url.replace("postgres://", "postgresql+pg8000://", 1)
+    return database_url
+
+
+def _create_engine_for(database_url: str):
+    if database_url.startswith("sqlite"):
+        sqlite_engine = create_engine(database_url, connect_args={"check_same_thread": False})
+
+        @event.listens_for(sqlite_engine, "connect")
+        def _enable_foreign_keys(dbapi_connection, _record):
+            # SQLite ignores foreign keys (and so ON DELETE CASCADE) unless enabled per connection.
+            dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+        return sqlite_engine
+    return create_engine(
+        database_url,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+    )
+
+
+def _build_engine():
+    configured_database_url = settings.DATABASE_URL
+    database_url = _normalize_database_url(configured_database_url or SQLITE_FALLBACK_URL)
 
     # SQLite path works without external services and is useful as a safe local fallback.
     if database_url.startswith("sqlite"):
-        return create_engine(database_url, connect_args={"check_same_thread": False})
+        return _create_engine_for(database_url)
 
     try:
-        primary_engine = create_engine(
-            database_url,
-            pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=20,
-        )
+        primary_engine = _create_engine_for(database_url)
         with primary_engine.connect() as conn:
             conn.execute(text("SELECT 1"))
         return primary_engine
@@ -39,20 +63,102 @@ def _build_engine():
             # If a DB URL is explicitly configured (production), fail fast instead of silently using SQLite.
             raise
 
-        fallback_url = "sqlite:///./edumanage_dev.db"
-        logger.warning("Falling back to local SQLite database: %s", fallback_url)
-        return create_engine(fallback_url, connect_args={"check_same_thread": False})
+        logger.warning("Falling back to local SQLite database: %s", SQLITE_FALLBACK_URL)
+        return _create_engine_for(SQLITE_FALLBACK_URL)
+
+
+def _build_replica_engine():
+    if not settings.DATABASE_REPLICA_URL:
+        return None
+
+    replica_url = _normalize_database_url(settings.DATABASE_REPLICA_URL)
+    try:
+        replica = _create_engine_for(replica_url)
+        with replica.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return replica
+    except Exception as exc:
+        # A broken replica should never take reads down with it; serve everything from the primary.
+        logger.error("Replica database connection failed, reads will use the primary: %s", exc)
+        return None
+
 
 engine = _build_engine()
+replica_engine = _build_replica_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None
+    else None
+)
 
 Base = declarative_base()
 
+# Last write time per user, used to pin that user's reads to the primary until the replica catches up.
+# This is process-local, which matches a single uvicorn worker; each worker tracks its own writers.
+_recent_writes: Dict[str, float] = {}
+_recent_writes_lock = threading.Lock()
+
+
+def _request_identity(request: Request) -> Optional[str]:
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = verify_token(token)
+    if not payload or payload.get("sub") is None:
+        return None
+    return str(payload["sub"])
+
+
+def _mark_recent_write(identity: str) -> None:
+    now = time.monotonic()
+    with _recent_writes_lock:
+        _recent_writes[identity] = now
+        # Opportunistically drop entries that no longer pin anyone to the primary.
+        if len(_recent_writes) > 1000:
+            cutoff = now - settings.REPLICA_READ_YOUR_WRITES_SECONDS
+            for key in [k for k, ts in _recent_writes.items() if ts < cutoff]:
+                del _recent_writes[key]
+
+
+def _wrote_recently(identity: str) -> bool:
+    with _recent_writes_lock:
+        last_write = _recent_writes.get(identity)
+    if last_write is None:
+        return False
+    return time.monotonic() - last_write < settings.REPLICA_READ_YOUR_WRITES_SECONDS
+
 
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+        if ReplicaSessionLocal is not None and request.method not in SAFE_METHODS:
+            identity = _request_identity(request)
+            if identity is not None:
+                _mark_recent_write(identity)
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints; uses the replica unless the caller has just written."""
+    if ReplicaSessionLocal is None:
+        db = SessionLocal()
+    else:
+        identity = _request_identity(request)
+        if identity is not None and _wrote_recently(identity):
+            db = SessionLocal()
+        else:
+            db = ReplicaSessionLocal()
+            db.info["read_only"] = True
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def is_read_only(db) -> bool:
+    return bool(db.info.get("read_only"))
@@ -0,0 +1,88 @@
+"""Per-student fee totals (``student_fee_balances``).
+
+Each student's row is recomputed from their fee records inside the transaction that changes
+those records, after locking the row, so concurrent writers for one student serialize and the
+committed totals always match the records. Student lists join this table to filter and sort
+by outstanding balance through its indexes instead of summing fee records per row.
+"""
+import logging
+from typing import Any, Iterable, List, Union
+
+from sqlalchemy import bindparam, case, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.db.models import Student, StudentCourseFee, StudentFeeBalance
+
+
+logger = logging.getLogger(__name__)
+
+balances = StudentFeeBalance.__table__
+fees = StudentCourseFee.__table__
+students = Student.__table__
+
+_TOTALS = ("fee_assigned", "fee_paid", "fee_outstanding", "fee_overdue_count")
+# Students per statement, well below the bind parameter limits of SQLite and Postgres drivers.
+_CHUNK = 1000
+
+
+def _totals(student_ids: Any) -> Any:
+    return (
+        select(
+            fees.c.student_id,
+            func.coalesce(func.sum(fees.c.total_amount), 0).label("fee_assigned"),
+            func.coalesce(func.sum(fees.c.paid_amount), 0).label("fee_paid"),
+            func.coalesce(func.sum(fees.c.balance_amount), 0).label("fee_outstanding"),
+            func.coalesce(func.sum(case((fees.c.status == "overdue", 1), else_=0)), 0).label("fee_overdue_count"),
+        )
+        .where(fees.c.student_id.in_(student_ids))
+        .group_by(fees.c.student_id)
+    )
+
+
+def refresh_fee_balances(db: Union[Session, Connection], student_ids: Iterable[int]) -> None:
+    """Recompute the balance rows of ``student_ids`` in the caller's transaction (not committed)."""
+    ids = sorted({student_id for student_id in student_ids if student_id is not None})
+    if not ids:
+        return
+    if isinstance(db, Session):
+        db.flush()
+        conn = db.connection()
+    else:
+        conn = db
+    for start in range(0, len(ids), _CHUNK):
+        _refresh_chunk(conn, ids[start:start + _CHUNK])
+
+
+def _refresh_chunk(conn: Connection, ids: List[int]) -> None:
+    # Create missing rows, then lock them (in id order, so concurrent refreshes cannot deadlock)
+    # before reading the records; on SQLite the insert already holds the database write lock.
+    # Chunks come in ascending id order too.
+    insert = postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert
+    conn.execute(insert(balances).values([{"student_id": i} for i in ids]).on_conflict_do_nothing(index_elements=["student_id"]))
+    conn.execute(select(balances.c.student_id).where(balances.c.student_id.in_(ids)).order_by(balances.c.student_id).with_for_update())
+
+    totals = {row.student_id: row._mapping for row in conn.execute(_totals(ids))}
+    conn.execute(
+        update(balances)
+        .where(balances.c.student_id == bindparam("b_student_id"))
+        .values({name: bindparam(name) for name in _TOTALS}),
+        [
+            {"b_student_id": student_id, **{name: totals[student_id][name] if student_id in totals else 0 for name in _TOTALS}}
+            for student_id in ids
+        ],
+    )
+
+
+def backfill_fee_balances(engine: Engine) -> None:
+    """Create balance rows for students that have none (new table, or rows lost to a restore)."""
+    with engine.begin() as conn:
+        missing = select(students.c.id).where(
+            ~select(balances.c.student_id).where(balances.c.student_id == students.c.id).exists()
+        )
+        student_ids = list(conn.execute(missing).scalars())
+        if not student_ids:
+            return
+        refresh_fee_balances(conn, student_ids)
+        logger.info("Backfilled fee balances for %s students", len(student_ids))
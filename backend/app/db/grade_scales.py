@@ -0,0 +1,73 @@
+"""Which letter grade scale applies to a grade.
+
+A course's own scale wins, then the scale of the student's program, then the scale with
+neither set, then the built-in ``DEFAULT_SCALE``. Scales are few and small, so they are read
+whole wherever grades are saved or recomputed.
+"""
+from typing import Any, Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.grading import DEFAULT_SCALE, LetterScale
+from app.db.models import GradeScale, GradeScaleStep, Student
+
+
+scales = GradeScale.__table__
+steps = GradeScaleStep.__table__
+
+
+class ScaleSet(NamedTuple):
+    by_course: Dict[int, LetterScale]
+    by_program: Dict[str, LetterScale]
+    default: LetterScale
+
+    def for_grade(self, course_id: int, program: Optional[str]) -> LetterScale:
+        return self.by_course.get(course_id) or self.by_program.get(program) or self.default
+
+    def letters(self, course_id: int, programs: Sequence[Optional[str]], percentages: np.ndarray) -> np.ndarray:
+        """Letter grades for one course's ``percentages`` of students in ``programs``."""
+        if course_id in self.by_course or not self.by_program:
+            return self.for_grade(course_id, None).letters_for(percentages)
+        programs = np.array(programs, dtype=object)
+        result = np.empty(len(programs), dtype=object)
+        for program in set(programs.tolist()):
+            mask = programs == program
+            result[mask] = self.for_grade(course_id, program).letters_for(percentages[mask])
+        return result
+
+
+def load_scales(conn: Any) -> ScaleSet:
+    """All scales, from a Session or Connection."""
+    cutoffs: Dict[int, list] = {}
+    owners: Dict[int, Any] = {}
+    rows = conn.execute(
+        select(scales.c.id, scales.c.course_id, scales.c.program, steps.c.min_percentage, steps.c.letter_grade)
+        .join(steps, steps.c.scale_id == scales.c.id)
+    )
+    for row in rows:
+        cutoffs.setdefault(row.id, []).append((row.min_percentage, row.letter_grade))
+        owners[row.id] = row
+
+    by_course: Dict[int, LetterScale] = {}
+    by_program: Dict[str, LetterScale] = {}
+    default = DEFAULT_SCALE
+    for scale_id, scale_cutoffs in cutoffs.items():
+        scale = LetterScale(scale_cutoffs)
+        owner = owners[scale_id]
+        if owner.course_id is not None:
+            by_course[owner.course_id] = scale
+        elif owner.program is not None:
+            by_program[owner.program] = scale
+        else:
+            default = scale
+    return ScaleSet(by_course, by_program, default)
+
+
+def scale_for_grade(db: Any, course_id: int, student_id: int) -> LetterScale:
+    """The scale for one grade; looks up the student's program only when a program scale could apply."""
+    scale_set = load_scales(db)
+    if course_id in scale_set.by_course or not scale_set.by_program:
+        return scale_set.for_grade(course_id, None)
+    program = db.execute(select(Student.program).where(Student.id == student_id)).scalar()
+    return scale_set.for_grade(course_id, program)
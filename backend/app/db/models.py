@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Date, Float, Numeric, UniqueConstraint
+from sqlalchemy import event, text, Column, Index, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Date, Float, Numeric, UniqueConstraint, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 import enum
 
 
+def _updated_at_index(table_name: str) -> Index:
+    # Lets the reporting snapshot find rows changed since its last run; most rows are never updated.
+    changed = text("updated_at IS NOT NULL")
+    return Index(f"ix_{table_name}_updated_at", "updated_at", postgresql_where=changed, sqlite_where=changed)
+
+
 class RoleEnum(str, enum.Enum):
     ADMIN = "admin"
     FACULTY = "faculty"
@@ -34,8 +40,8 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    student_profile = relationship("Student", back_populates="user", uselist=False, cascade="all, delete-orphan")
-    faculty_courses = relationship("Course", back_populates="faculty")
+    student_profile = relationship("Student", back_populates="user", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    faculty_courses = relationship("Course", back_populates="faculty", passive_deletes=True)
     
 
 class Student(Base):
@@ -49,24 +55,26 @@ class Student(Base):
     phone = Column(String(20), nullable=True)
     address = Column(Text, nullable=True)
     gender = Column(String(20), nullable=True)
-    enrollment_date = Column(Date, nullable=True)
+    enrollment_date = Column(Date, nullable=True, index=True)
     year_level = Column(Integer, nullable=True)
     
     enrollment_year = Column(Integer, nullable=True)
-    program = Column(String(100), nullable=True)
-    current_semester = Column(String(50), nullable=True)
-    gpa = Column(Float, nullable=True)
-    status = Column(String(20), nullable=False, default="active")
+    program = Column(String(100), nullable=True, index=True)
+    current_semester = Column(String(50), nullable=True, index=True)
+    current_semester_id = Column(Integer, ForeignKey("semesters.id", ondelete="SET NULL"), nullable=True, index=True)
+    gpa = Column(Float, nullable=True, index=True)
+    status = Column(String(20), nullable=False, default="active", index=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     user = relationship("User", back_populates="student_profile")
-    enrollments = relationship("Enrollment", back_populates="student", cascade="all, delete-orphan")
-    attendance_records = relationship("Attendance", back_populates="student", cascade="all, delete-orphan")
-    grades = relationship("Grade", back_populates="student", cascade="all, delete-orphan")
-    fee_records = relationship("StudentCourseFee", back_populates="student", cascade="all, delete-orphan")
-    fee_payments = relationship("StudentCourseFeePayment", back_populates="student", cascade="all, delete-orphan")
+    enrollments = relationship("Enrollment", back_populates="student", cascade="all, delete-orphan", passive_deletes=True)
+    attendance_records = relationship("Attendance", back_populates="student", cascade="all, delete-orphan", passive_deletes=True)
+    grades = relationship("Grade", back_populates="student", cascade="all, delete-orphan", passive_deletes=True)
+    fee_records = relationship("StudentCourseFee", back_populates="student", cascade="all, delete-orphan", passive_deletes=True)
+    fee_payments = relationship("StudentCourseFeePayment", back_populates="student", cascade="all, delete-orphan", passive_deletes=True)
+    fee_balance = relationship("StudentFeeBalance", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Course(Base):
@@ -81,6 +89,7 @@ class Course(Base):
     faculty_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     
     semester = Column(String(50), nullable=True)
+    semester_id = Column(Integer, ForeignKey("semesters.id", ondelete="SET NULL"), nullable=True, index=True)
     academic_year = Column(String(20), nullable=True)
     
     is_active = Column(Boolean, default=True)
@@ -88,21 +97,22 @@ class Course(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     faculty = relationship("User", back_populates="faculty_courses")
-    enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete-orphan")
-    attendance_records = relationship("Attendance", back_populates="course", cascade="all, delete-orphan")
-    grades = relationship("Grade", back_populates="course", cascade="all, delete-orphan")
-    fee_records = relationship("StudentCourseFee", back_populates="course", cascade="all, delete-orphan")
+    enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
+    attendance_records = relationship("Attendance", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
+    grades = relationship("Grade", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
+    fee_records = relationship("StudentCourseFee", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
+    __table_args__ = (_updated_at_index("enrollments"),)
     
     id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
-    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
     
-    enrollment_date = Column(Date, server_default=func.current_date())
-    status = Column(String(20), default="active")
+    enrollment_date = Column(Date, server_default=func.current_date(), index=True)
+    status = Column(String(20), default="active", index=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -113,12 +123,20 @@ class Enrollment(Base):
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        # Serves a course roster's lookup of each enrolled student's record for one day.
+        Index("ix_attendance_course_date_student", "course_id", "date", "student_id"),
+        # Serves a student's own attendance, newest first, without sorting.
+        Index("ix_attendance_student_date", "student_id", "date"),
+        _updated_at_index("attendance"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
+    # student_id and course_id lead the composite indexes above, so they need none of their own.
     student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     
-    date = Column(Date, nullable=False)
+    date = Column(Date, nullable=False, index=True)
     status = Column(String(20), nullable=False)
     notes = Column(Text, nullable=True)
     
@@ -131,19 +149,27 @@ class Attendance(Base):
 
 class Grade(Base):
     __tablename__ = "grades"
+    __table_args__ = (
+        # Serves per-assessment statistics and curves.
+        Index("ix_grades_course_assessment", "course_id", "assessment_name"),
+        _updated_at_index("grades"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Leads ix_grades_course_assessment.
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     
-    assessment_type = Column(String(50), nullable=False)
+    assessment_type = Column(String(50), nullable=False, index=True)
     assessment_name = Column(String(255), nullable=False)
     score = Column(Numeric(10, 2), nullable=False)
     max_score = Column(Numeric(10, 2), nullable=False)
     percentage = Column(Numeric(5, 2), nullable=True)
     letter_grade = Column(String(5), nullable=True)
+    # True when letter_grade was entered by hand; scale recomputes leave those letters alone.
+    letter_grade_manual = Column(Boolean, nullable=True)
     
-    date_assessed = Column(Date, nullable=True)
+    date_assessed = Column(Date, nullable=True, index=True)
     remarks = Column(Text, nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -155,7 +181,10 @@ class Grade(Base):
 
 class StudentCourseFee(Base):
     __tablename__ = "student_course_fees"
-    __table_args__ = (UniqueConstraint("student_id", "course_id", name="uq_student_course_fee"),)
+    __table_args__ = (
+        UniqueConstraint("student_id", "course_id", name="uq_student_course_fee"),
+        _updated_at_index("student_course_fees"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -179,7 +208,7 @@ class StudentCourseFee(Base):
 
     student = relationship("Student", back_populates="fee_records")
     course = relationship("Course", back_populates="fee_records")
-    payments = relationship("StudentCourseFeePayment", back_populates="fee_record", cascade="all, delete-orphan")
+    payments = relationship("StudentCourseFeePayment", back_populates="fee_record", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class StudentCourseFeePayment(Base):
@@ -196,12 +225,72 @@ class StudentCourseFeePayment(Base):
     notes = Column(Text, nullable=True)
     received_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     status = Column(String(20), nullable=False, default="posted")
+    idempotency_key = Column(String(100), nullable=True, unique=True, index=True)
+    voided_at = Column(DateTime(timezone=True), nullable=True)
+    voided_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    void_reason = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     fee_record = relationship("StudentCourseFee", back_populates="payments")
     student = relationship("Student", back_populates="fee_payments")
 
 
+class StudentFeeBalance(Base):
+    """Per-student totals over student_course_fees, kept in step by app.db.fee_balances."""
+    __tablename__ = "student_fee_balances"
+
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    fee_assigned = Column(Numeric(12, 2), nullable=False, default=0)
+    fee_paid = Column(Numeric(12, 2), nullable=False, default=0)
+    fee_outstanding = Column(Numeric(12, 2), nullable=False, default=0, index=True)
+    fee_overdue_count = Column(Integer, nullable=False, default=0, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+@event.listens_for(Student, "after_insert")
+def _create_fee_balance(mapper, connection, target):
+    # Every student has a balance row, so list queries can inner-join it.
+    connection.execute(StudentFeeBalance.__table__.insert().values(student_id=target.id))
+
+
+class AttendanceBitmap(Base):
+    """One bit per day from start_date of a student's attendance in a course, kept in step by app.db.attendance_bitmaps."""
+    __tablename__ = "attendance_bitmaps"
+
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True, index=True)
+    start_date = Column(Date, nullable=False)
+    recorded = Column(LargeBinary, nullable=False, default=b"")
+    present = Column(LargeBinary, nullable=False, default=b"")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class GradeScale(Base):
+    """Letter grade cutoffs for one course, one program, or (neither set) every other grade."""
+    __tablename__ = "grade_scales"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=True, unique=True)
+    program = Column(String(100), nullable=True, unique=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    steps = relationship(
+        "GradeScaleStep", cascade="all, delete-orphan", passive_deletes=True, order_by="GradeScaleStep.min_percentage.desc()"
+    )
+
+
+class GradeScaleStep(Base):
+    __tablename__ = "grade_scale_steps"
+    __table_args__ = (UniqueConstraint("scale_id", "min_percentage", name="uq_grade_scale_step"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    scale_id = Column(Integer, ForeignKey("grade_scales.id", ondelete="CASCADE"), nullable=False, index=True)
+    min_percentage = Column(Numeric(5, 2), nullable=False)
+    letter_grade = Column(String(5), nullable=False)
+
+
 class Semester(Base):
     __tablename__ = "semesters"
     
@@ -210,4 +299,6 @@ class Semester(Base):
     is_current = Column(Boolean, default=False)
     start_date = Column(Date, nullable=True)
     end_date = Column(Date, nullable=True)
+    # Set by the semester rollover once the term's courses and enrollments are closed
+    archived_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,156 @@
+"""Optional monthly range partitioning of ``attendance`` and ``grades`` on Postgres.
+
+Both tables only grow, and almost every query on them is bounded by a date. Partitioned by
+month on that date, Postgres skips the partitions a query's date filter excludes, and whole
+closed months can be archived by dropping a partition (see ``app.jobs.term_archive``).
+
+Converting an existing table is an explicit maintenance step, since it copies the table under
+an exclusive lock: ``python -m app.jobs.term_archive partition``. Afterwards the startup hook
+``ensure_partitions`` keeps ``PARTITION_MONTHS_AHEAD`` months of partitions ready; rows outside
+every monthly range (or with no date) land in the table's default partition. SQLite and
+unpartitioned tables are left alone.
+"""
+import logging
+from datetime import date
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.db.models import Attendance, Grade
+
+
+logger = logging.getLogger(__name__)
+
+# Partitioned tables and the date column they are partitioned on.
+PARTITION_KEYS: Dict[str, str] = {
+    "attendance": "date",
+    "grades": "date_assessed",
+}
+
+_TABLES: Dict[str, Table] = {"attendance": Attendance.__table__, "grades": Grade.__table__}
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def months(first: date, last: date) -> Iterator[date]:
+    """First days of the months from ``first``'s month through ``last``'s month."""
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = next_month(month)
+
+
+def partition_name(table_name: str, month: date) -> str:
+    return f"{table_name}_{month:%Y_%m}"
+
+
+def is_partitioned(conn: Connection, table_name: str) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {"name": table_name}).scalar() == "p"
+
+
+def partitions(conn: Connection, table_name: str) -> List[str]:
+    return list(conn.execute(
+        text("SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:name)"),
+        {"name": table_name},
+    ).scalars())
+
+
+def _create_partition(conn: Connection, parent: str, table_name: str, month: date) -> bool:
+    name = partition_name(table_name, month)
+    try:
+        # A savepoint, so a range the default partition already holds rows for only skips this month.
+        with conn.begin_nested():
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+            ))
+        return True
+    except DBAPIError as exc:
+        logger.warning("Could not create partition %s: %s", name, exc.orig)
+        return False
+
+
+def ensure_partitions(engine: Engine, months_ahead: Optional[int] = None) -> None:
+    """Create the monthly partitions from this month through ``months_ahead`` months from now."""
+    if engine.dialect.name != "postgresql":
+        return
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    this_month = month_start(date.today())
+    last = this_month
+    for _ in range(months_ahead):
+        last = next_month(last)
+    with engine.begin() as conn:
+        for table_name in PARTITION_KEYS:
+            if not is_partitioned(conn, table_name):
+                continue
+            existing = set(partitions(conn, table_name))
+            for month in months(this_month, last):
+                if partition_name(table_name, month) not in existing:
+                    _create_partition(conn, table_name, table_name, month)
+
+
+def partition_table(engine: Engine, table_name: str, months_ahead: Optional[int] = None) -> int:
+    """Rebuild ``table_name`` as a table partitioned by month, keeping its rows, ids, keys and indexes.
+
+    Runs in one transaction that holds an exclusive lock on the table while its rows are copied.
+    Returns the number of rows copied.
+    """
+    if engine.dialect.name != "postgresql":
+        raise ValueError("Partitioning is only supported on PostgreSQL")
+    table = _TABLES[table_name]
+    key = table.c[PARTITION_KEYS[table_name]]
+    staging = f"{table_name}_partitioned"
+
+    with engine.begin() as conn:
+        if is_partitioned(conn, table_name):
+            logger.info("%s is already partitioned", table_name)
+            return 0
+        conn.execute(text(f"LOCK TABLE {table_name} IN ACCESS EXCLUSIVE MODE"))
+        sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table_name}).scalar()
+        if sequence:
+            # Keep the id sequence when the old table is dropped.
+            conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+
+        conn.execute(text(
+            f"CREATE TABLE {staging} (LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({key.name})"
+        ))
+        # A partitioned table's primary key must include the partition key, which it can only
+        # do when that column is NOT NULL; ids stay unique through the sequence either way.
+        if not key.nullable:
+            conn.execute(text(f"ALTER TABLE {staging} ADD PRIMARY KEY (id, {key.name})"))
+        for fk in table.foreign_keys:
+            on_delete = f" ON DELETE {fk.ondelete}" if fk.ondelete else ""
+            conn.execute(text(
+                f"ALTER TABLE {staging} ADD FOREIGN KEY ({fk.parent.name}) "
+                f"REFERENCES {fk.column.table.name} ({fk.column.name}){on_delete}"
+            ))
+
+        first, last = conn.execute(select(func.min(key), func.max(key)).select_from(table)).one()
+        horizon = month_start(date.today())
+        for _ in range(settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead):
+            horizon = next_month(horizon)
+        for month in months(min(first or horizon, horizon), max(last or horizon, horizon)):
+            _create_partition(conn, staging, table_name, month)
+        conn.execute(text(f"CREATE TABLE {table_name}_default PARTITION OF {staging} DEFAULT"))
+
+        copied = conn.execute(text(f"INSERT INTO {staging} SELECT * FROM {table_name}")).rowcount
+        conn.execute(text(f"DROP TABLE {table_name}"))
+        conn.execute(text(f"ALTER TABLE {staging} RENAME TO {table_name}"))
+        if sequence:
+            conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {table_name}.id"))
+        for index in table.indexes:
+            index.create(bind=conn)
+    logger.info("Partitioned %s by month on %s (%s rows)", table_name, key.name, copied)
+    return copied
@@ -0,0 +1,134 @@
+"""Local DuckDB copy of the tables that term reports aggregate over.
+
+Term reports (attendance by program, grade distributions, fee aging) scan whole terms of
+attendance, grades and fee records. Run against the main database they compete with
+attendance marking, so ``app.jobs.reporting_snapshot`` copies those tables into a columnar
+DuckDB file at ``REPORTING_DB_PATH`` and the ``/api/reports`` endpoints query only that file.
+Reports are as fresh as the last snapshot, which each response reports as ``snapshot_at``.
+
+Only the columns reports use are copied (no contact details or notes). The large tables are
+copied incrementally (see ``INCREMENTAL``); the small lookup tables are reloaded in full.
+"""
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import duckdb
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, Integer, Numeric, Table
+
+from app.core.config import settings
+from app.db.models import Attendance, Course, Enrollment, Grade, Student, StudentCourseFee
+
+
+# Store table -> (source table, copied columns). ``id`` comes first and is the store's key.
+SNAPSHOT_TABLES: Dict[str, tuple] = {
+    "attendance": (Attendance.__table__, ["id", "student_id", "course_id", "date", "status", "updated_at"]),
+    "grades": (Grade.__table__, [
+        "id", "student_id", "course_id", "assessment_type", "score", "max_score", "percentage", "letter_grade",
+        "date_assessed", "updated_at",
+    ]),
+    "enrollments": (Enrollment.__table__, ["id", "student_id", "course_id", "enrollment_date", "status", "updated_at"]),
+    "student_course_fees": (StudentCourseFee.__table__, [
+        "id", "student_id", "course_id", "issue_date", "due_date", "fee_amount", "late_fee_amount", "total_amount",
+        "paid_amount", "balance_amount", "status", "updated_at",
+    ]),
+    "students": (Student.__table__, ["id", "program", "year_level", "current_semester_id", "status"]),
+    "courses": (Course.__table__, ["id", "course_code", "course_name", "credits", "semester_id", "is_active"]),
+}
+
+# Copied by id and updated_at watermarks; the others are small enough to reload every time.
+INCREMENTAL = ("attendance", "grades", "enrollments", "student_course_fees")
+
+_connection: Optional[duckdb.DuckDBPyConnection] = None
+_lock = threading.Lock()
+
+
+def _duck_type(column: Column) -> str:
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return "BOOLEAN"
+    if isinstance(column_type, Integer):
+        return "BIGINT"
+    if isinstance(column_type, Float):
+        return "DOUBLE"
+    if isinstance(column_type, Numeric):
+        return f"DECIMAL({column_type.precision}, {column_type.scale})"
+    if isinstance(column_type, DateTime):
+        # Stored as naive UTC.
+        return "TIMESTAMP"
+    if isinstance(column_type, Date):
+        return "DATE"
+    return "VARCHAR"
+
+
+def store_columns(name: str) -> Dict[str, str]:
+    """Column name -> DuckDB type of a store table."""
+    table, columns = SNAPSHOT_TABLES[name]
+    return {column: _duck_type(table.c[column]) for column in columns}
+
+
+def source_columns(name: str) -> List[Column]:
+    table, columns = SNAPSHOT_TABLES[name]
+    return [table.c[column] for column in columns]
+
+
+def source_table(name: str) -> Table:
+    return SNAPSHOT_TABLES[name][0]
+
+
+def _open() -> duckdb.DuckDBPyConnection:
+    global _connection
+    with _lock:
+        if _connection is None:
+            Path(settings.REPORTING_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+            _connection = duckdb.connect(settings.REPORTING_DB_PATH)
+            _ensure_schema(_connection)
+        return _connection
+
+
+@contextmanager
+def reporting_store() -> Iterator[duckdb.DuckDBPyConnection]:
+    """A cursor on the store for the calling thread (DuckDB connections are not shared across threads)."""
+    cursor = _open().cursor()
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+
+
+def _ensure_schema(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS snapshot_state ("
+        "table_name VARCHAR PRIMARY KEY, last_id BIGINT, last_updated TIMESTAMP, rows BIGINT, refreshed_at TIMESTAMP)"
+    )
+    for name in SNAPSHOT_TABLES:
+        wanted = store_columns(name)
+        existing = dict(conn.execute(
+            "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = ? ORDER BY ordinal_position",
+            [name],
+        ).fetchall())
+        if existing and list(existing) == list(wanted):
+            continue
+        # New table, or its copied columns changed: start it over from a full copy.
+        conn.execute(f"DROP TABLE IF EXISTS {name}")
+        conn.execute("DELETE FROM snapshot_state WHERE table_name = ?", [name])
+        definition = ", ".join(f"{column} {column_type}" + (" PRIMARY KEY" if column == "id" else "") for column, column_type in wanted.items())
+        conn.execute(f"CREATE TABLE {name} ({definition})")
+
+
+def snapshot_state(conn: duckdb.DuckDBPyConnection) -> Dict[str, Dict[str, Any]]:
+    rows = conn.execute("SELECT table_name, last_id, last_updated, rows, refreshed_at FROM snapshot_state").fetchall()
+    return {
+        row[0]: {"last_id": row[1], "last_updated": row[2], "rows": row[3], "refreshed_at": row[4]}
+        for row in rows
+    }
+
+
+def snapshot_time(conn: duckdb.DuckDBPyConnection, tables: Sequence[str]) -> Optional[datetime]:
+    """When the oldest of ``tables`` was last refreshed; None until all of them have been copied once."""
+    state = snapshot_state(conn)
+    if any(name not in state for name in tables):
+        return None
+    return min(state[name]["refreshed_at"] for name in tables)
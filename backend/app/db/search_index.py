@@ -0,0 +1,225 @@
+"""Ranked prefix/fuzzy search over students, courses and users.
+
+Postgres uses pg_trgm GIN indexes (prefix ILIKE plus trigram similarity for typos).
+SQLite keeps an FTS5 shadow table that triggers maintain, so every write path
+(ORM, bulk updates, cascades) stays in sync without application code.
+"""
+import logging
+import re
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_KINDS = ("student", "course", "user")
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_trigram_available = False
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        kind UNINDEXED, ref_id UNINDEXED, title, subtitle,
+        tokenize = 'unicode61', prefix = '2 3 4'
+    )
+    """,
+    # FTS rowids are id * 4 + kind (student=1, course=2, user=3) so trigger updates and
+    # deletes are rowid lookups instead of scans of the index.
+    """
+    CREATE TRIGGER IF NOT EXISTS search_students_ai AFTER INSERT ON students BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, title, subtitle)
+        SELECT new.id * 4 + 1, 'student', new.id, u.full_name, new.student_id || ' ' || u.email
+        FROM users u WHERE u.id = new.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_students_au AFTER UPDATE OF student_id, user_id ON students BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+        INSERT INTO search_index(rowid, kind, ref_id, title, subtitle)
+        SELECT new.id * 4 + 1, 'student', new.id, u.full_name, new.student_id || ' ' || u.email
+        FROM users u WHERE u.id = new.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_students_ad AFTER DELETE ON students BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_courses_ai AFTER INSERT ON courses BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, title, subtitle)
+        VALUES (new.id * 4 + 2, 'course', new.id, new.course_name, new.course_code);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_courses_au AFTER UPDATE OF course_name, course_code ON courses BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+        INSERT INTO search_index(rowid, kind, ref_id, title, subtitle)
+        VALUES (new.id * 4 + 2, 'course', new.id, new.course_name, new.course_code);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_courses_ad AFTER DELETE ON courses BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_users_ai AFTER INSERT ON users BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, title, subtitle)
+        VALUES (new.id * 4 + 3, 'user', new.id, new.full_name, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_users_au AFTER UPDATE OF full_name, email ON users BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+        INSERT INTO search_index(rowid, kind, ref_id, title, subtitle)
+        VALUES (new.id * 4 + 3, 'user', new.id, new.full_name, new.email);
+        DELETE FROM search_index WHERE rowid IN (SELECT s.id * 4 + 1 FROM students s WHERE s.user_id = new.id);
+        INSERT INTO search_index(rowid, kind, ref_id, title, subtitle)
+        SELECT s.id * 4 + 1, 'student', s.id, new.full_name, s.student_id || ' ' || new.email
+        FROM students s WHERE s.user_id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_users_ad AFTER DELETE ON users BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+    END
+    """,
+]
+
+_SQLITE_REBUILD = [
+    "DELETE FROM search_index",
+    """
+    INSERT INTO search_index(rowid, kind, ref_id, title, subtitle)
+    SELECT s.id * 4 + 1, 'student', s.id, u.full_name, s.student_id || ' ' || u.email
+    FROM students s JOIN users u ON u.id = s.user_id
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, ref_id, title, subtitle)
+    SELECT id * 4 + 2, 'course', id, course_name, course_code FROM courses
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, ref_id, title, subtitle)
+    SELECT id * 4 + 3, 'user', id, full_name, email FROM users
+    """,
+]
+
+_POSTGRES_INDEXES = {
+    "ix_users_full_name_trgm": "users USING gin (full_name gin_trgm_ops)",
+    "ix_users_email_trgm": "users USING gin (email gin_trgm_ops)",
+    "ix_students_student_id_trgm": "students USING gin (student_id gin_trgm_ops)",
+    "ix_courses_course_name_trgm": "courses USING gin (course_name gin_trgm_ops)",
+    "ix_courses_course_code_trgm": "courses USING gin (course_code gin_trgm_ops)",
+}
+
+
+def setup_search_index(engine: Engine) -> None:
+    """Create the search structures for the current dialect (idempotent; run at startup)."""
+    global _trigram_available
+    dialect = engine.dialect.name
+
+    if dialect == "sqlite":
+        with engine.begin() as conn:
+            existed = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'")
+            ).first() is not None
+            for statement in _SQLITE_DDL:
+                conn.execute(text(statement))
+            if not existed:
+                # First run on an existing database: backfill from the base tables.
+                for statement in _SQLITE_REBUILD:
+                    conn.execute(text(statement))
+                logger.info("Built SQLite FTS5 search index")
+        return
+
+    if dialect == "postgresql":
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                for name, definition in _POSTGRES_INDEXES.items():
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"))
+            _trigram_available = True
+        except Exception as exc:
+            # Managed databases may not allow CREATE EXTENSION; search still works via ILIKE.
+            logger.warning("pg_trgm unavailable, search falls back to prefix matching: %s", exc)
+
+
+def _tokens(query: str) -> List[str]:
+    return _TOKEN.findall(query.lower())
+
+
+def _search_sqlite(db: Session, query: str, kinds: List[str], limit: int) -> List[Dict[str, Any]]:
+    tokens = _tokens(query)
+    if not tokens:
+        return []
+    match = " AND ".join(f'"{token}"*' for token in tokens)
+    kind_params = {f"kind_{i}": kind for i, kind in enumerate(kinds)}
+    kind_filter = ", ".join(f":{name}" for name in kind_params)
+    rows = db.execute(
+        text(
+            f"""
+            SELECT kind, ref_id AS id, title, subtitle, -bm25(search_index, 0, 0, 10.0, 5.0) AS score
+            FROM search_index
+            WHERE search_index MATCH :match AND kind IN ({kind_filter})
+            ORDER BY score DESC
+            LIMIT :limit
+            """
+        ),
+        {"match": match, "limit": limit, **kind_params},
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def _search_postgres(db: Session, query: str, kinds: List[str], limit: int) -> List[Dict[str, Any]]:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    params = {"q": query, "prefix": escaped + "%", "contains": "%" + escaped + "%", "limit": limit}
+
+    def branch(kind: str, select: str, source: str, columns: List[str]) -> str:
+        prefix = " OR ".join(f"{col} ILIKE :prefix" for col in columns)
+        if _trigram_available:
+            # Prefix hits rank above fuzzy ones; similarity orders within each group and catches typos.
+            score = f"CASE WHEN {prefix} THEN 1 ELSE 0 END + GREATEST({', '.join(f'similarity({col}, :q)' for col in columns)})"
+            where = " OR ".join(f"{col} % :q OR {col} ILIKE :contains" for col in columns)
+        else:
+            score = f"CASE WHEN {prefix} THEN 1 ELSE 0 END"
+            where = " OR ".join(f"{col} ILIKE :contains" for col in columns)
+        return (
+            f"(SELECT '{kind}' AS kind, {select}, {score} AS score FROM {source} "
+            f"WHERE {where} ORDER BY score DESC LIMIT :limit)"
+        )
+
+    branches = {
+        "student": branch(
+            "student",
+            "s.id AS id, u.full_name AS title, s.student_id || ' ' || u.email AS subtitle",
+            "students s JOIN users u ON u.id = s.user_id",
+            ["u.full_name", "u.email", "s.student_id"],
+        ),
+        "course": branch(
+            "course",
+            "c.id AS id, c.course_name AS title, c.course_code AS subtitle",
+            "courses c",
+            ["c.course_name", "c.course_code"],
+        ),
+        "user": branch(
+            "user",
+            "u.id AS id, u.full_name AS title, u.email AS subtitle",
+            "users u",
+            ["u.full_name", "u.email"],
+        ),
+    }
+    union = " UNION ALL ".join(branches[kind] for kind in kinds)
+    rows = db.execute(text(f"SELECT * FROM ({union}) AS hits ORDER BY score DESC LIMIT :limit"), params)
+    return [dict(row._mapping) for row in rows]
+
+
+def search(db: Session, query: str, kinds: List[str], limit: int) -> List[Dict[str, Any]]:
+    """Return up to ``limit`` hits of the given kinds, best match first."""
+    if db.get_bind().dialect.name == "sqlite":
+        return _search_sqlite(db, query, kinds, limit)
+    return _search_postgres(db, query, kinds, limit)
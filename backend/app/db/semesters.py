@@ -0,0 +1,147 @@
+"""Semester lookups shared by courses and students.
+
+Courses and students reference a semester through an indexed ``semester_id`` foreign key;
+the semester name is still stored next to it for display and older clients. The semesters
+table is tiny and changes rarely, so its name -> id map and the current semester are cached
+per process and reloaded after ``invalidate``, which every semester write calls. Like the
+response cache, this assumes the single uvicorn worker the app is deployed with.
+"""
+import logging
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import event, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core import response_cache
+from app.db.models import Course, Semester, Student
+
+
+logger = logging.getLogger(__name__)
+
+semesters = Semester.__table__
+courses = Course.__table__
+students = Student.__table__
+
+
+class SemesterRef(NamedTuple):
+    id: int
+    name: str
+
+
+class _Snapshot(NamedTuple):
+    ids: Dict[str, int]
+    current: Optional[SemesterRef]
+
+
+_snapshot: Optional[_Snapshot] = None
+_generation = 0
+_lock = threading.Lock()
+
+
+def invalidate() -> None:
+    global _snapshot, _generation
+    with _lock:
+        _snapshot = None
+        _generation += 1
+
+
+def _load(db: Session) -> _Snapshot:
+    global _snapshot
+    with _lock:
+        if _snapshot is not None:
+            return _snapshot
+        generation = _generation
+    ids: Dict[str, int] = {}
+    current = None
+    for row in db.execute(select(semesters.c.id, semesters.c.name, semesters.c.is_current)):
+        ids[row.name] = row.id
+        if row.is_current:
+            current = SemesterRef(row.id, row.name)
+    snapshot = _Snapshot(ids, current)
+    with _lock:
+        # Only keep it if no write invalidated the cache while it was being read.
+        if generation == _generation:
+            _snapshot = snapshot
+    return snapshot
+
+
+def current_semester(db: Session) -> Optional[SemesterRef]:
+    return _load(db).current
+
+
+def find_semester(db: Session, name: Optional[str]) -> Optional[int]:
+    """Id of the semester called ``name``, or None if there is none."""
+    if not name:
+        return None
+    found = _load(db).ids.get(name)
+    if found is None:
+        # Created since the cache was loaded (e.g. by ``ensure_semester`` in another request).
+        found = db.execute(select(semesters.c.id).where(semesters.c.name == name)).scalar()
+        if found is not None:
+            invalidate()
+    return found
+
+
+def ensure_semester(db: Session, name: Optional[str]) -> Optional[int]:
+    """Id of the semester called ``name``, creating it (not current) in the caller's transaction if missing."""
+    if not name:
+        return None
+    found = find_semester(db, name)
+    if found is not None:
+        return found
+    semester = Semester(name=name, is_current=False)
+    db.add(semester)
+    db.flush()
+
+    @event.listens_for(db, "after_commit", once=True)
+    def _created(session: Session) -> None:
+        invalidate()
+        response_cache.invalidate("semesters")
+
+    return semester.id
+
+
+def _add_foreign_key(conn: Connection, table: str, column: str) -> None:
+    # add_missing_columns only adds the bare column; SQLite cannot add constraints afterwards,
+    # so there the endpoints clear references themselves when a semester is deleted.
+    if conn.dialect.name != "postgresql":
+        return
+    existing = {tuple(fk["constrained_columns"]) for fk in inspect(conn).get_foreign_keys(table)}
+    if (column,) not in existing:
+        conn.execute(text(
+            f"ALTER TABLE {table} ADD CONSTRAINT fk_{table}_{column} "
+            f"FOREIGN KEY ({column}) REFERENCES semesters (id) ON DELETE SET NULL"
+        ))
+        logger.info("Added foreign key %s.%s", table, column)
+
+
+def backfill_semester_ids(engine: Engine) -> None:
+    """Point courses and students stored with only a semester name at the matching semester row."""
+    pairs = ((courses, courses.c.semester, courses.c.semester_id), (students, students.c.current_semester, students.c.current_semester_id))
+    with engine.begin() as conn:
+        for table, name_column, id_column in pairs:
+            _add_foreign_key(conn, table.name, id_column.name)
+
+        unlinked = [
+            (table, name_column, id_column) for table, name_column, id_column in pairs
+            if conn.execute(select(table.c.id).where(id_column.is_(None), name_column.isnot(None)).limit(1)).first()
+        ]
+        if not unlinked:
+            return
+
+        names = set()
+        for table, name_column, id_column in unlinked:
+            names.update(conn.execute(select(name_column).where(id_column.is_(None), name_column.isnot(None)).distinct()).scalars())
+        known = set(conn.execute(select(semesters.c.name)).scalars())
+        missing = sorted(name for name in names if name and name not in known)
+        if missing:
+            conn.execute(semesters.insert(), [{"name": name, "is_current": False} for name in missing])
+            logger.info("Created semesters referenced by existing rows: %s", ", ".join(missing))
+
+        for table, name_column, id_column in unlinked:
+            matching = select(semesters.c.id).where(semesters.c.name == name_column).scalar_subquery()
+            result = conn.execute(update(table).where(id_column.is_(None), name_column.isnot(None)).values({id_column: matching}))
+            logger.info("Backfilled %s.%s for %s rows", table.name, id_column.name, result.rowcount)
+    invalidate()
@@ -0,0 +1,118 @@
+"""Chunked deletion of a course, student or user and everything that cascades from it.
+
+Small deletes simply remove the parent row and let the ``ON DELETE CASCADE`` foreign keys
+clear the dependents in the same statement. For parents with very many dependent rows, that
+single statement holds locks for a long time, so the delete endpoints hand those to this job
+instead: it walks the cascade tree bottom-up and deletes each table's rows in bounded chunks,
+one short transaction per chunk, reporting progress, then deletes the parent itself.
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Table, delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core import jobs, response_cache
+from app.core.config import settings
+from app.core.jobs import Job
+from app.db.database import engine
+from app.db.fee_balances import refresh_fee_balances
+from app.db.models import Base, Student, StudentCourseFee
+
+
+fees = StudentCourseFee.__table__
+students = Student.__table__
+
+# Tables whose cached responses go stale when rows under each kind of parent disappear.
+_INVALIDATES = {
+    "courses": ("courses",),
+    "students": ("students",),
+    "users": ("users", "students", "courses"),
+}
+
+
+def _cascade_children(table: Table) -> List[Tuple[Table, Any, Any]]:
+    children = []
+    for child in Base.metadata.sorted_tables:
+        for fk in child.foreign_keys:
+            if fk.column.table is table and (fk.ondelete or "").upper() == "CASCADE":
+                children.append((child, fk.parent, fk.column))
+    return children
+
+
+def _primary_key(table: Table) -> Any:
+    return list(table.primary_key.columns)[0]
+
+
+def _cascade_plan(table: Table, where: Any) -> List[Tuple[Table, Any]]:
+    """(table, condition) pairs for every row that deleting ``table`` rows matching ``where`` removes, leaves first."""
+    plan: List[Tuple[Table, Any]] = []
+    for child, fk_column, referenced in _cascade_children(table):
+        plan.extend(_cascade_plan(child, fk_column.in_(select(referenced).where(where))))
+    plan.append((table, where))
+    return plan
+
+
+def count_dependents(conn: Any, table_name: str, row_id: int, limit: int) -> int:
+    """Rows that deleting ``table_name`` row ``row_id`` would cascade to (excluding the row itself), counted up to ``limit`` + 1."""
+    table = Base.metadata.tables[table_name]
+    plan = _cascade_plan(table, _primary_key(table) == row_id)[:-1]
+    total = 0
+    for child, where in plan:
+        # Count at most the rows still needed to pass the limit, not every dependent row.
+        capped = select(_primary_key(child)).where(where).limit(limit + 1 - total).subquery()
+        total += conn.execute(select(func.count()).select_from(capped)).scalar()
+        if total > limit:
+            break
+    return total
+
+
+def _fee_students(conn: Any, plan: List[Tuple[Table, Any]]) -> Set[int]:
+    # Students whose fee records are removed but who may survive (course deletes) need their totals refreshed.
+    return {
+        student_id
+        for table, where in plan if table is fees
+        for student_id in conn.execute(select(fees.c.student_id).where(where).distinct()).scalars()
+    }
+
+
+def delete_with_dependents(job: Job, table_name: str, row_id: int, chunk_size: int = 1000) -> Dict[str, Any]:
+    table = Base.metadata.tables[table_name]
+    plan = _cascade_plan(table, _primary_key(table) == row_id)
+    with engine.connect() as conn:
+        fee_student_ids = _fee_students(conn, plan)
+
+    deleted: Dict[str, int] = {}
+    for child, where in plan[:-1]:
+        key = _primary_key(child)
+        while True:
+            with engine.begin() as conn:
+                ids = list(conn.execute(select(key).where(where).limit(chunk_size)).scalars())
+                # Keep the plan's condition: with a composite primary key (attendance_bitmaps) the
+                # first key column alone also matches rows under other parents.
+                removed = conn.execute(delete(child).where(where, key.in_(ids))).rowcount if ids else 0
+            if not ids:
+                break
+            deleted[child.name] = deleted.get(child.name, 0) + removed
+            job.update(deleted=deleted, table=child.name)
+
+    with engine.begin() as conn:
+        found = conn.execute(delete(table).where(_primary_key(table) == row_id)).rowcount
+        if fee_student_ids:
+            surviving = conn.execute(select(students.c.id).where(students.c.id.in_(fee_student_ids))).scalars()
+            refresh_fee_balances(conn, list(surviving))
+    response_cache.invalidate(*_INVALIDATES.get(table_name, (table_name,)))
+
+    job.update(deleted=deleted, table=table_name)
+    return {"table": table_name, "id": row_id, "deleted": bool(found), "dependents_deleted": deleted}
+
+
+def start_background_delete(db: Session, table_name: str, row_id: int) -> Optional[Job]:
+    """Queue the delete as a chunked job when it would cascade to more than ``BULK_DELETE_THRESHOLD`` rows."""
+    if count_dependents(db.connection(), table_name, row_id, settings.BULK_DELETE_THRESHOLD) <= settings.BULK_DELETE_THRESHOLD:
+        return None
+    # End this session's read transaction so it does not hold locks the job's deletes wait on.
+    db.rollback()
+    return jobs.submit(
+        f"delete_{table_name}", delete_with_dependents,
+        table_name=table_name, row_id=row_id, chunk_size=settings.BULK_DELETE_CHUNK_SIZE,
+    )
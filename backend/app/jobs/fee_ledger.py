@@ -0,0 +1,162 @@
+"""Reconcile fee records with their payments.
+
+``StudentCourseFee.paid_amount`` is a running total of the record's posted payments, and
+total, balance and status are derived from it. This job walks the fee records in id order,
+one chunk at a time, compares each chunk with a single grouped SUM over its payments,
+reports any drift and can repair it (refreshing the affected students' fee balances too).
+Memory stays bounded by the chunk size.
+
+    python -m app.jobs.fee_ledger              # report only; exits 1 when drift is found
+    python -m app.jobs.fee_ledger --repair --chunk-size 10000
+"""
+import argparse
+import json
+import sys
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from sqlalchemy import bindparam, func, select, text, update
+
+from app.core.fees import recalculate_fee_record, to_decimal
+from app.core.jobs import CommandLineJob, Job
+from app.core.logging_config import setup_logging
+from app.db.database import engine
+from app.db.fee_balances import refresh_fee_balances
+from app.db.models import StudentCourseFee, StudentCourseFeePayment
+
+
+fees = StudentCourseFee.__table__
+payments = StudentCourseFeePayment.__table__
+
+_LEDGER_COLUMNS = (
+    fees.c.id, fees.c.student_id, fees.c.due_date, fees.c.fee_amount, fees.c.late_fee_amount,
+    fees.c.total_amount, fees.c.paid_amount, fees.c.balance_amount, fees.c.status,
+)
+
+
+def _lock_for_repair(conn: Any) -> None:
+    # Postgres locks the chunk's rows with FOR UPDATE; SQLite needs a write statement to take
+    # its database lock before reading, so payments cannot land between the read and the fix.
+    if conn.dialect.name == "sqlite":
+        conn.execute(text("UPDATE student_course_fees SET id = id WHERE 0 = 1"))
+
+
+def check_fee_ledger(job: Job, repair: bool = False, chunk_size: int = 5000, max_report: int = 100) -> Dict[str, Any]:
+    checked = mismatched = stale = repaired = 0
+    recorded_paid = payments_total = Decimal("0.00")
+    mismatches: List[Dict[str, Any]] = []
+    last_id = 0
+
+    while True:
+        with (engine.begin() if repair else engine.connect()) as conn:
+            query = select(*_LEDGER_COLUMNS).where(fees.c.id > last_id).order_by(fees.c.id).limit(chunk_size)
+            if repair:
+                _lock_for_repair(conn)
+                query = query.with_for_update()
+            rows = conn.execute(query).all()
+            if not rows:
+                break
+
+            posted = dict(conn.execute(
+                select(payments.c.fee_record_id, func.sum(payments.c.amount))
+                .where(
+                    payments.c.fee_record_id.between(rows[0].id, rows[-1].id),
+                    payments.c.status == "posted",
+                )
+                .group_by(payments.c.fee_record_id)
+            ).all())
+
+            fixes = []
+            for row in rows:
+                expected = SimpleNamespace(**row._mapping)
+                expected.paid_amount = to_decimal(posted.get(row.id))
+                recalculate_fee_record(expected)
+
+                recorded_paid += to_decimal(row.paid_amount)
+                payments_total += expected.paid_amount
+
+                issues = []
+                if to_decimal(row.paid_amount) != expected.paid_amount:
+                    issues.append("paid_amount")
+                if (
+                    to_decimal(row.total_amount) != expected.total_amount
+                    or to_decimal(row.balance_amount) != expected.balance_amount
+                    or row.status != expected.status
+                ):
+                    # Late fees and overdue status are normally applied lazily on read, so this alone is staleness, not drift.
+                    issues.append("derived")
+                if not issues:
+                    continue
+
+                if "paid_amount" in issues:
+                    mismatched += 1
+                else:
+                    stale += 1
+                if len(mismatches) < max_report:
+                    mismatches.append({
+                        "fee_record_id": row.id,
+                        "issues": issues,
+                        "paid_amount": str(to_decimal(row.paid_amount)),
+                        "payments_total": str(expected.paid_amount),
+                        "balance_amount": str(to_decimal(row.balance_amount)),
+                        "expected_balance_amount": str(expected.balance_amount),
+                        "status": row.status,
+                        "expected_status": expected.status,
+                    })
+                fixes.append({
+                    "record_id": row.id,
+                    "student_id": row.student_id,
+                    "paid_amount": expected.paid_amount,
+                    "total_amount": expected.total_amount,
+                    "balance_amount": expected.balance_amount,
+                    "status": expected.status,
+                })
+
+            if repair and fixes:
+                conn.execute(
+                    update(fees)
+                    .where(fees.c.id == bindparam("record_id"))
+                    .values(
+                        paid_amount=bindparam("paid_amount"),
+                        total_amount=bindparam("total_amount"),
+                        balance_amount=bindparam("balance_amount"),
+                        status=bindparam("status"),
+                    ),
+                    fixes,
+                )
+                refresh_fee_balances(conn, (fix["student_id"] for fix in fixes))
+                repaired += len(fixes)
+
+            checked += len(rows)
+            last_id = rows[-1].id
+        job.update(checked=checked, mismatched=mismatched, stale=stale, repaired=repaired)
+
+    return {
+        "checked": checked,
+        "mismatched": mismatched,
+        "stale": stale,
+        "repaired": repaired,
+        "recorded_paid_total": str(recorded_paid),
+        "posted_payments_total": str(payments_total),
+        "mismatches": mismatches,
+        "mismatches_truncated": mismatched + stale > len(mismatches),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repair", action="store_true", help="Rewrite paid, total, balance and status from the payments")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--max-report", type=int, default=100, help="Cap on mismatches listed in the report")
+    args = parser.parse_args()
+
+    setup_logging()
+    result = check_fee_ledger(CommandLineJob("fee_ledger"), args.repair, args.chunk_size, args.max_report)
+    print(json.dumps(result, indent=2))
+    if result["mismatched"] and not args.repair:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
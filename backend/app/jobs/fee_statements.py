@@ -0,0 +1,181 @@
+"""Data for the fee statement and payment receipt PDFs, and the bulk statement job.
+
+A statement lists a student's fee records (with late fees applied as of today) and their
+payments; a receipt covers a single payment. Documents are built from plain dicts so they can
+be rendered in worker processes (by ``app.core.fee_pdfs``) and cached by content hash (see
+``app.core.documents``).
+The bulk job renders statements for every student with an outstanding balance, a chunk of
+students at a time, skipping any statement whose content is unchanged since it was last built.
+
+    python -m app.jobs.fee_statements              # pre-render outstanding statements
+"""
+import argparse
+import json
+from concurrent.futures import wait
+from datetime import date
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, func, or_, select
+
+from app.core import documents
+from app.core.config import settings
+from app.core.fee_pdfs import LAYOUT_VERSION, STATEMENT, render_statement
+from app.core.fees import recalculate_fee_record, to_decimal
+from app.core.jobs import CommandLineJob, Job
+from app.core.logging_config import setup_logging
+from app.db.database import engine
+from app.db.models import Course, Student, StudentCourseFee, StudentCourseFeePayment, User
+
+
+fees = StudentCourseFee.__table__
+payments = StudentCourseFeePayment.__table__
+students = Student.__table__
+users = User.__table__
+courses = Course.__table__
+
+
+def outstanding_condition(today: date) -> Any:
+    # Late fees are applied lazily, so a stored zero balance can still be overdue.
+    return or_(
+        fees.c.balance_amount > 0,
+        and_(
+            fees.c.late_fee_amount > 0,
+            fees.c.due_date < today,
+            fees.c.paid_amount < fees.c.fee_amount + fees.c.late_fee_amount,
+        ),
+    )
+
+
+def load_statements(conn: Any, student_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+    """Statement data for each existing student in ``student_ids``, in three queries."""
+    today = date.today()
+    statements: Dict[int, Dict[str, Any]] = {}
+    for row in conn.execute(
+        select(students.c.id, students.c.student_id, students.c.program, users.c.full_name)
+        .join(users, users.c.id == students.c.user_id)
+        .where(students.c.id.in_(student_ids))
+    ):
+        statements[row.id] = {
+            "as_of": today.isoformat(),
+            "student": {"code": row.student_id, "name": row.full_name, "program": row.program or ""},
+            "records": [],
+            "payments": [],
+        }
+
+    course_codes: Dict[int, str] = {}
+    for row in conn.execute(
+        select(
+            fees.c.id, fees.c.student_id, fees.c.issue_date, fees.c.due_date, fees.c.fee_amount,
+            fees.c.late_fee_amount, fees.c.total_amount, fees.c.paid_amount, fees.c.balance_amount,
+            fees.c.status, courses.c.course_code, courses.c.course_name,
+        )
+        .join(courses, courses.c.id == fees.c.course_id)
+        .where(fees.c.student_id.in_(student_ids))
+        .order_by(fees.c.student_id, fees.c.due_date, fees.c.id)
+    ):
+        record = SimpleNamespace(**row._mapping)
+        recalculate_fee_record(record)
+        course_codes[row.id] = row.course_code
+        statements[row.student_id]["records"].append({
+            "course": f"{row.course_code} {row.course_name}",
+            "issue_date": row.issue_date.isoformat(),
+            "due_date": row.due_date.isoformat(),
+            "total_amount": str(record.total_amount),
+            "paid_amount": str(to_decimal(record.paid_amount)),
+            "balance_amount": str(record.balance_amount),
+            "status": record.status,
+        })
+
+    for row in conn.execute(
+        select(
+            payments.c.student_id, payments.c.fee_record_id, payments.c.payment_no, payments.c.payment_date,
+            payments.c.amount, payments.c.mode, payments.c.status,
+        )
+        .where(payments.c.student_id.in_(student_ids))
+        .order_by(payments.c.student_id, payments.c.payment_date, payments.c.id)
+    ):
+        statements[row.student_id]["payments"].append({
+            "payment_no": row.payment_no,
+            "payment_date": row.payment_date.isoformat(),
+            "course": course_codes.get(row.fee_record_id, ""),
+            "amount": str(to_decimal(row.amount)),
+            "mode": row.mode,
+            "status": row.status,
+        })
+    return statements
+
+
+def load_receipt(conn: Any, payment_no: str) -> Optional[Dict[str, Any]]:
+    row = conn.execute(
+        select(
+            payments.c.payment_no, payments.c.payment_date, payments.c.amount, payments.c.mode,
+            payments.c.reference_no, payments.c.status, payments.c.void_reason, payments.c.student_id,
+            students.c.student_id.label("student_code"), users.c.full_name,
+            courses.c.course_code, courses.c.course_name,
+        )
+        .join(fees, fees.c.id == payments.c.fee_record_id)
+        .join(courses, courses.c.id == fees.c.course_id)
+        .join(students, students.c.id == payments.c.student_id)
+        .join(users, users.c.id == students.c.user_id)
+        .where(payments.c.payment_no == payment_no)
+    ).first()
+    if row is None:
+        return None
+    return {
+        "student_id": row.student_id,
+        "payment_no": row.payment_no,
+        "payment_date": row.payment_date.isoformat(),
+        "amount": str(to_decimal(row.amount)),
+        "mode": row.mode,
+        "reference_no": row.reference_no or "",
+        "status": row.status,
+        "void_reason": row.void_reason or "",
+        "student": {"code": row.student_code, "name": row.full_name},
+        "course": f"{row.course_code} {row.course_name}",
+    }
+
+
+def generate_outstanding_statements(job: Job, chunk_size: int = 200) -> Dict[str, Any]:
+    """Render (or find cached) statements for every student with an outstanding balance."""
+    with engine.connect() as conn:
+        student_ids: List[int] = list(conn.execute(
+            select(fees.c.student_id).where(outstanding_condition(date.today()))
+            .group_by(fees.c.student_id).order_by(fees.c.student_id)
+        ).scalars())
+
+    # Statements carry their date, so older copies are never served again once superseded.
+    pruned = documents.prune(STATEMENT, settings.DOCUMENT_CACHE_MAX_AGE_DAYS)
+    rendered = cached = failed = 0
+    job.update(students=len(student_ids), rendered=0, cached=0, failed=0, pruned=pruned)
+    for start in range(0, len(student_ids), chunk_size):
+        with engine.connect() as conn:
+            statements = load_statements(conn, student_ids[start:start + chunk_size])
+
+        futures = []
+        for data in statements.values():
+            digest = documents.content_hash(STATEMENT, LAYOUT_VERSION, data)
+            if documents.exists(STATEMENT, digest):
+                cached += 1
+            else:
+                futures.append(documents.render(STATEMENT, digest, render_statement, data))
+        # One chunk in flight at a time keeps memory bounded while the pool renders in parallel.
+        done, _ = wait(futures)
+        failed += sum(1 for future in done if future.exception() is not None)
+        rendered += sum(1 for future in done if future.exception() is None)
+        job.update(rendered=rendered, cached=cached, failed=failed)
+
+    return {"students": len(student_ids), "rendered": rendered, "cached": cached, "failed": failed, "pruned": pruned}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_logging()
+    print(json.dumps(generate_outstanding_statements(CommandLineJob("fee_statements"), args.chunk_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Recompute stored letter grades from the grade scales (``app.db.grade_scales``).
+
+A grade's letter is stored when it is saved, so changing a scale leaves the letters of
+existing grades stale. This job walks the grades in id order, ``chunk_size`` at a time, looks
+up each grade's letter from its (possibly curved) percentage and writes the ones that changed
+with ``app.db.bulk.update_rows``. Letters entered by hand (``letter_grade_manual``) are kept
+unless ``include_manual`` is set. Scope it to the grades a scale change can affect with a
+course or a program.
+
+    python -m app.jobs.grade_letters --dry-run
+    python -m app.jobs.grade_letters --program "Computer Science"
+    python -m app.jobs.grade_letters --course-id 12 --include-manual
+"""
+import argparse
+import json
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+
+from app.core.jobs import CommandLineJob, Job
+from app.core.logging_config import setup_logging
+from app.db.bulk import update_rows
+from app.db.database import engine
+from app.db.grade_scales import load_scales
+from app.db.models import Grade, Student
+
+
+grades = Grade.__table__
+students = Student.__table__
+
+
+def recompute_letter_grades(
+    job: Job,
+    course_id: Optional[int] = None,
+    program: Optional[str] = None,
+    dry_run: bool = False,
+    chunk_size: int = 5000,
+    include_manual: bool = False,
+) -> Dict[str, Any]:
+    pending = grades.c.percentage.isnot(None)
+    if not include_manual:
+        pending &= grades.c.letter_grade_manual.isnot(True)
+    if course_id is not None:
+        pending &= grades.c.course_id == course_id
+    if program is not None:
+        pending &= students.c.program == program
+
+    with engine.connect() as conn:
+        scale_set = load_scales(conn)
+
+    checked = changed = 0
+    last_id = 0
+    while True:
+        with (engine.connect() if dry_run else engine.begin()) as conn:
+            query = (
+                select(grades.c.id, grades.c.course_id, grades.c.percentage, grades.c.letter_grade, students.c.program)
+                .join(students, students.c.id == grades.c.student_id)
+                .where(pending, grades.c.id > last_id)
+                .order_by(grades.c.id)
+                .limit(chunk_size)
+            )
+            rows = conn.execute(query if dry_run else query.with_for_update(of=grades)).all()
+            if not rows:
+                break
+
+            fixes = []
+            for row in rows:
+                letter_grade = scale_set.for_grade(row.course_id, row.program).letter(float(row.percentage))
+                if letter_grade != row.letter_grade:
+                    fixes.append({"id": row.id, "letter_grade": letter_grade, "letter_grade_manual": False})
+            if not dry_run:
+                update_rows(conn, grades, "id", fixes)
+
+        checked += len(rows)
+        changed += len(fixes)
+        last_id = rows[-1].id
+        job.update(checked=checked, changed=changed, last_id=last_id)
+
+    return {
+        "course_id": course_id, "program": program, "dry_run": dry_run, "include_manual": include_manual,
+        "checked": checked, "changed": changed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--course-id", type=int, help="Only grades in this course")
+    parser.add_argument("--program", help="Only grades of students in this program")
+    parser.add_argument("--dry-run", action="store_true", help="Count the letters that would change without writing")
+    parser.add_argument("--include-manual", action="store_true", help="Also replace letters entered by hand")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_logging()
+    result = recompute_letter_grades(
+        CommandLineJob("grade_letters"), args.course_id, args.program, args.dry_run, args.chunk_size, args.include_manual
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Refresh the reporting store (``app.db.reporting``) from the database.
+
+Rows of the large tables are copied incrementally:
+
+1. rows with an id above the last copied id;
+2. older rows whose ``updated_at`` is at or after the newest one seen last time (less a minute
+   of overlap, for writes that committed late), found through a partial index on ``updated_at``;
+3. deletes and late commits: ids are compared per bucket of ``_BUCKET`` ids by count and sum,
+   and only the buckets that differ are reread, to drop the rows that are gone and copy the ones
+   missing from the store. Sequence ids are not handed out in commit order, so a row can commit
+   after a run has already moved past its id. Reading from a replica, every bucket is compared
+   each run. Reading from the primary, a run compares the buckets from the previous run's last
+   id onward plus the next ``_SWEEP_BUCKETS`` older ones in turn, so the grouped scan stays
+   bounded and a delete of an old row reaches the store within a few sweeps.
+
+Attendance and grades dated before the last month ``app.jobs.term_archive`` moved to files are
+kept in the store after they leave the database, so term reports still cover closed terms.
+
+Rows are read in id order, ``chunk_size`` at a time, from the read replica when one is
+configured. Each table is loaded into the store in one DuckDB transaction, so reports never
+see a half-copied table. ``full`` empties the store tables (except archived rows) and copies everything again.
+
+The API process refreshes the store every ``REPORTING_SNAPSHOT_INTERVAL_MINUTES``; DuckDB
+allows one writing process per file, so run the command line only while the API is stopped
+(or has the schedule turned off and does not serve reports).
+
+    python -m app.jobs.reporting_snapshot
+    python -m app.jobs.reporting_snapshot --full
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from app.core import jobs
+from app.core.config import settings
+from app.core.jobs import CommandLineJob, Job
+from app.core.logging_config import setup_logging
+from app.db.database import engine, replica_engine
+from app.db.partitioning import PARTITION_KEYS
+from app.db.reporting import INCREMENTAL, SNAPSHOT_TABLES, reporting_store, snapshot_state, source_columns, source_table, store_columns
+from app.jobs.term_archive import archived_before
+
+
+logger = logging.getLogger(__name__)
+
+_BUCKET = 10000
+# Older buckets compared per run when reading from the primary.
+_SWEEP_BUCKETS = 20
+_OVERLAP = timedelta(minutes=1)
+# NULL in the staging CSV files, as in PostgreSQL's COPY.
+_NULL = "\\N"
+
+# One refresh at a time per process; a scheduled run that finds one going is skipped.
+_running = threading.Lock()
+# Table -> first bucket of the next primary sweep (restarts from 0 with the process).
+_sweep_from: Dict[str, int] = {}
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _staged(store: Any, sql: str, columns: Dict[str, str], rows: Iterable[Any]) -> int:
+    """Run ``sql`` with ``{rows}`` standing for ``rows`` read back from a CSV file; returns the row count.
+
+    DuckDB reads a file far faster than it takes rows (or lists) as Python parameters.
+    """
+    handle, path = tempfile.mkstemp(suffix=".csv")
+    count = 0
+    try:
+        with os.fdopen(handle, "w", newline="", encoding="utf-8") as out:
+            writer = csv.writer(out)
+            for row in rows:
+                writer.writerow([_NULL if value is None else _naive_utc(value) if isinstance(value, datetime) else value for value in row])
+                count += 1
+        types = ", ".join(f"'{column}': '{column_type}'" for column, column_type in columns.items())
+        source = (
+            f"read_csv(?, auto_detect = false, header = false, delim = ',', quote = '\"', escape = '\"', "
+            f"nullstr = '{_NULL}', columns = {{{types}}})"
+        )
+        store.execute(sql.format(rows=source), [path])
+    finally:
+        os.unlink(path)
+    return count
+
+
+def _copy(conn: Any, store: Any, name: str, condition: Any, chunk_size: int) -> int:
+    table = source_table(name)
+    copied = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(*source_columns(name)).where(condition, table.c.id > last_id).order_by(table.c.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            return copied
+        copied += _staged(store, f"INSERT OR REPLACE INTO {name} SELECT * FROM {{rows}}", store_columns(name), rows)
+        last_id = rows[-1].id
+
+
+def _reconcile(conn: Any, store: Any, name: str, low: int, high: int, kept_before: Optional[date]) -> Tuple[int, int]:
+    """Make every bucket of ids from ``low`` to ``high`` match the source; returns (removed, restored).
+
+    Rows dated before ``kept_before`` have been archived out of the source and are left alone.
+    """
+    table = source_table(name)
+
+    def source_condition(first: int, last: int) -> List[Any]:
+        conditions = [table.c.id.between(first, last)]
+        if kept_before is not None:
+            conditions.append(table.c[PARTITION_KEYS[name]] >= kept_before)
+        return conditions
+
+    def store_condition(first: int, last: int) -> str:
+        sql = f"id BETWEEN {first} AND {last}"
+        if kept_before is not None:
+            sql += f" AND {PARTITION_KEYS[name]} >= DATE '{kept_before.isoformat()}'"
+        return sql
+
+    bucket = table.c.id // _BUCKET
+    source = {
+        row.bucket: (row.rows, row.ids)
+        for row in conn.execute(
+            select(bucket.label("bucket"), func.count().label("rows"), func.sum(table.c.id).label("ids"))
+            .where(*source_condition(low, high))
+            .group_by(bucket)
+        )
+    }
+    stored = {
+        row[0]: (row[1], row[2])
+        for row in store.execute(f"SELECT id // {_BUCKET}, count(*), sum(id) FROM {name} WHERE {store_condition(low, high)} GROUP BY 1").fetchall()
+    }
+    removed = restored = 0
+    for number in sorted(source.keys() | stored.keys()):
+        if source.get(number) == stored.get(number):
+            continue
+        first, last = max(number * _BUCKET, low), min((number + 1) * _BUCKET - 1, high)
+        _staged(
+            store,
+            "CREATE OR REPLACE TEMP TABLE bucket_rows AS SELECT * FROM {rows}",
+            store_columns(name),
+            conn.execute(select(*source_columns(name)).where(*source_condition(first, last)).order_by(table.c.id)),
+        )
+        removed += store.execute(
+            f"DELETE FROM {name} WHERE {store_condition(first, last)} AND id NOT IN (SELECT id FROM bucket_rows)"
+        ).fetchone()[0]
+        restored += store.execute(
+            f"INSERT INTO {name} SELECT * FROM bucket_rows WHERE id NOT IN (SELECT id FROM {name} WHERE id BETWEEN {first} AND {last})"
+        ).fetchone()[0]
+        store.execute("DROP TABLE bucket_rows")
+    return removed, restored
+
+
+def _reconcile_ranges(name: str, previous_id: int, up_to: int, sweep: bool) -> List[Tuple[int, int]]:
+    """Id ranges to compare this run: all of them, or the recent buckets plus the next slice of the sweep."""
+    if not sweep:
+        return [(0, up_to)]
+    recent = previous_id // _BUCKET
+    start = _sweep_from.get(name, 0)
+    if start >= recent:
+        start = 0
+    end = min(start + _SWEEP_BUCKETS, recent)
+    _sweep_from[name] = end
+    ranges = [(start * _BUCKET, end * _BUCKET - 1)] if start < end else []
+    return ranges + [(recent * _BUCKET, up_to)]
+
+
+def _snapshot_table(conn: Any, store: Any, name: str, state: Optional[Dict[str, Any]], chunk_size: int, sweep: bool) -> Dict[str, Any]:
+    table = source_table(name)
+    high_id, newest = conn.execute(select(func.max(table.c.id), func.max(table.c.updated_at))).one()
+    high_id = high_id or 0
+    result = {"inserted": 0, "updated": 0, "deleted": 0}
+
+    kept_before = archived_before(name) if name in PARTITION_KEYS else None
+    store.execute("BEGIN TRANSACTION")
+    try:
+        if name not in INCREMENTAL or state is None:
+            if kept_before is None:
+                store.execute(f"DELETE FROM {name}")
+            else:
+                store.execute(f"DELETE FROM {name} WHERE {PARTITION_KEYS[name]} >= ?", [kept_before])
+            result["inserted"] = _copy(conn, store, name, table.c.id <= high_id, chunk_size)
+            last_id = high_id
+        else:
+            last_id = state["last_id"]
+            result["inserted"] = _copy(conn, store, name, table.c.id.between(last_id + 1, high_id), chunk_size)
+            if state["last_updated"] is None:
+                # Nothing had been updated as of the last run.
+                changed = table.c.updated_at.isnot(None)
+            else:
+                changed = table.c.updated_at >= state["last_updated"].replace(tzinfo=timezone.utc) - _OVERLAP
+            result["updated"] = _copy(conn, store, name, (table.c.id <= last_id) & changed, chunk_size)
+            previous_id, last_id = last_id, max(last_id, high_id)
+            for low, high in _reconcile_ranges(name, previous_id, last_id, sweep):
+                removed, restored = _reconcile(conn, store, name, low, high, kept_before)
+                result["deleted"] += removed
+                result["inserted"] += restored
+
+        rows = store.execute(f"SELECT count(*) FROM {name}").fetchone()[0]
+        store.execute(
+            "INSERT OR REPLACE INTO snapshot_state VALUES (?, ?, ?, ?, ?)",
+            [name, last_id, _naive_utc(newest) if newest is not None else (state or {}).get("last_updated"), rows, _naive_utc(datetime.now(timezone.utc))],
+        )
+        store.execute("COMMIT")
+    except Exception:
+        store.execute("ROLLBACK")
+        raise
+    result["rows"] = rows
+    return result
+
+
+def snapshot_reporting_store(job: Job, full: bool = False, chunk_size: int = 50000) -> Dict[str, Any]:
+    if not _running.acquire(blocking=False):
+        return {"skipped": "A reporting snapshot is already running"}
+    try:
+        source = replica_engine or engine
+        result: Dict[str, Any] = {"full": full, "tables": {}}
+        with reporting_store() as store:
+            state = {} if full else snapshot_state(store)
+            for name in SNAPSHOT_TABLES:
+                with source.connect() as conn:
+                    result["tables"][name] = _snapshot_table(conn, store, name, state.get(name), chunk_size, replica_engine is None)
+                job.update(table=name, **result["tables"][name])
+        logger.info("Reporting snapshot finished: %s", result["tables"])
+        return result
+    finally:
+        _running.release()
+
+
+def _schedule(interval: float, stop: threading.Event) -> None:
+    while True:
+        jobs.submit("reporting_snapshot", snapshot_reporting_store)
+        if stop.wait(interval):
+            return
+
+
+def start_snapshot_schedule() -> Optional[threading.Event]:
+    """Refresh the store now and every ``REPORTING_SNAPSHOT_INTERVAL_MINUTES``; returns the event that stops it."""
+    if settings.REPORTING_SNAPSHOT_INTERVAL_MINUTES <= 0:
+        return None
+    stop = threading.Event()
+    threading.Thread(
+        target=_schedule,
+        args=(settings.REPORTING_SNAPSHOT_INTERVAL_MINUTES * 60, stop),
+        name="reporting-snapshot",
+        daemon=True,
+    ).start()
+    return stop
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Copy every row again instead of only the changes")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    setup_logging()
+    result = snapshot_reporting_store(CommandLineJob("reporting_snapshot"), args.full, args.chunk_size)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
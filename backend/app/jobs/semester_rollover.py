@@ -0,0 +1,321 @@
+"""Semester rollover: move students, enrollments and courses from one term to the next.
+
+The rollover runs four phases, each as short transactions of at most ``chunk_size`` rows:
+
+1. students: active students in the old term move to the new one. Unless disabled, their
+   year level advances, and students already in their program's final year are completed.
+2. enrollments: active enrollments in the old term's courses are marked completed.
+3. courses: each active offering of the old term is archived under a term-suffixed code
+   (``CS101`` -> ``CS101-Fall2026``) and cloned into the new term under its plain code. A
+   course's own grade scale is copied onto the clone; the old one keeps grading the archived
+   offering and takes the same suffix.
+4. archive: the old semester is marked archived and the new one becomes current.
+
+Each phase only selects rows it has not handled yet, so an interrupted rollover resumes by
+running it again with the same semesters. ``dry_run`` reports what every phase would change
+without writing anything.
+
+    python -m app.jobs.semester_rollover --to "Spring 2027" --dry-run
+    python -m app.jobs.semester_rollover --from "Fall 2026" --to "Spring 2027" --program-years MBA=2
+"""
+import argparse
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, case, func, insert, literal, select, update
+
+from app.core import response_cache
+from app.core.config import settings
+from app.core.jobs import CommandLineJob, Job
+from app.core.logging_config import setup_logging
+from app.db import semesters as semester_lookup
+from app.db.database import engine
+from app.db.models import Course, Enrollment, GradeScale, GradeScaleStep, Semester, Student
+
+
+students = Student.__table__
+enrollments = Enrollment.__table__
+courses = Course.__table__
+semesters = Semester.__table__
+grade_scales = GradeScale.__table__
+grade_scale_steps = GradeScaleStep.__table__
+
+_CODE_LENGTH = courses.c.course_code.type.length
+
+
+def resolve_semesters(conn: Any, from_semester_id: Optional[int], to_semester_id: int) -> Tuple[Any, Any]:
+    """The (from, to) semester rows; ``from`` defaults to the current semester. Raises ValueError."""
+    if from_semester_id is None:
+        from_semester_id = conn.execute(select(semesters.c.id).where(semesters.c.is_current.is_(True))).scalar()
+        if from_semester_id is None:
+            raise ValueError("No current semester is set; pass the semester to roll over from")
+    rows = {row.id: row for row in conn.execute(select(semesters).where(semesters.c.id.in_([from_semester_id, to_semester_id])))}
+    if from_semester_id not in rows or to_semester_id not in rows:
+        raise ValueError("Semester not found")
+    if from_semester_id == to_semester_id:
+        raise ValueError("Cannot roll a semester over into itself")
+    return rows[from_semester_id], rows[to_semester_id]
+
+
+def _term_tag(name: str) -> str:
+    return re.sub(r"[^0-9A-Za-z]", "", name)
+
+
+def _years(program_years: Dict[str, int]) -> Any:
+    default = literal(settings.DEFAULT_PROGRAM_YEARS)
+    return case(program_years, value=students.c.program, else_=default) if program_years else default
+
+
+def _chunks(conn_factory: Any, key: Any, pending: Any, chunk_size: int) -> Iterator[Tuple[Any, List[int]]]:
+    """Yield (connection, ids) for each chunk of rows matching ``pending``, one transaction per chunk."""
+    last_id = 0
+    while True:
+        with conn_factory() as conn:
+            ids = list(conn.execute(select(key).where(pending, key > last_id).order_by(key).limit(chunk_size)).scalars())
+            if not ids:
+                return
+            yield conn, ids
+        last_id = ids[-1]
+
+
+def _roll_students(job: Job, old: Any, new: Any, advance: bool, program_years: Dict[str, int], dry_run: bool, chunk_size: int) -> Dict[str, Any]:
+    pending = and_(students.c.status == "active", students.c.current_semester_id == old.id)
+    completing = students.c.year_level >= _years(program_years)
+
+    if dry_run:
+        with engine.connect() as conn:
+            by_program = [
+                {"program": row.program, "students": row.students, "completing": int(row.completing or 0) if advance else 0}
+                for row in conn.execute(
+                    select(
+                        students.c.program,
+                        func.count().label("students"),
+                        func.sum(case((completing, 1), else_=0)).label("completing"),
+                    ).where(pending).group_by(students.c.program).order_by(students.c.program)
+                )
+            ]
+        completed = sum(row["completing"] for row in by_program)
+        return {"moved": sum(row["students"] for row in by_program) - completed, "completed": completed, "by_program": by_program}
+
+    moved = completed = 0
+    for conn, ids in _chunks(engine.begin, students.c.id, pending, chunk_size):
+        if advance:
+            completed += conn.execute(
+                update(students).where(students.c.id.in_(ids), completing).values(status="completed")
+            ).rowcount
+        moved += conn.execute(
+            update(students)
+            .where(students.c.id.in_(ids), students.c.status == "active")
+            .values(
+                current_semester_id=new.id,
+                current_semester=new.name,
+                year_level=students.c.year_level + 1 if advance else students.c.year_level,
+            )
+        ).rowcount
+        job.update(phase="students", students_moved=moved, students_completed=completed)
+    return {"moved": moved, "completed": completed}
+
+
+def _close_enrollments(job: Job, old: Any, dry_run: bool, chunk_size: int) -> Dict[str, Any]:
+    pending = and_(
+        enrollments.c.status == "active",
+        enrollments.c.course_id.in_(select(courses.c.id).where(courses.c.semester_id == old.id)),
+    )
+    if dry_run:
+        with engine.connect() as conn:
+            return {"closed": conn.execute(select(func.count()).select_from(enrollments).where(pending)).scalar()}
+
+    closed = 0
+    for conn, ids in _chunks(engine.begin, enrollments.c.id, pending, chunk_size):
+        closed += conn.execute(update(enrollments).where(enrollments.c.id.in_(ids)).values(status="completed")).rowcount
+        job.update(phase="enrollments", enrollments_closed=closed)
+    return {"closed": closed}
+
+
+def _plan_courses(conn: Any, ids: List[int], old: Any, new: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Split a chunk of old-term courses into (planned, skipped) archive-and-clone steps."""
+    suffix = f"-{_term_tag(old.name)}"
+    rows = conn.execute(select(courses).where(courses.c.id.in_(ids)).order_by(courses.c.id)).all()
+    steps = []
+    for row in rows:
+        base = row.course_code[:-len(suffix)] if row.course_code.endswith(suffix) else row.course_code
+        steps.append({"row": row, "code": base, "archived_code": base + suffix})
+    codes = [step["code"] for step in steps] + [step["archived_code"] for step in steps]
+    taken = {row.course_code: row for row in conn.execute(select(courses.c.id, courses.c.course_code, courses.c.semester_id).where(courses.c.course_code.in_(codes)))}
+
+    planned, skipped = [], []
+    for step in steps:
+        row = step["row"]
+        holder = taken.get(step["archived_code"])
+        if len(step["archived_code"]) > _CODE_LENGTH:
+            skipped.append({"course_code": row.course_code, "reason": f"archived code {step['archived_code']} is longer than {_CODE_LENGTH} characters"})
+            continue
+        if holder is not None and holder.id != row.id:
+            skipped.append({"course_code": row.course_code, "reason": f"code {step['archived_code']} is already used"})
+            continue
+        holder = taken.get(step["code"])
+        # A course already holding the plain code in the new term counts as the clone.
+        step["clone"] = holder is None or holder.id == row.id
+        if not step["clone"] and holder.semester_id != new.id:
+            skipped.append({"course_code": row.course_code, "reason": f"code {step['code']} is used by another term's course"})
+            continue
+        planned.append(step)
+    return planned, skipped
+
+
+def _copy_grade_scales(conn: Any, clones: Dict[int, int], old: Any) -> int:
+    """Copy the grade scales of cloned courses onto their clones (``clones`` maps old id -> clone id)."""
+    scales = conn.execute(select(grade_scales).where(grade_scales.c.course_id.in_(clones)).order_by(grade_scales.c.id)).all()
+    if not scales:
+        return 0
+    suffix = f"-{_term_tag(old.name)}"
+    length = grade_scales.c.name.type.length
+    # Scale names are unique: the archived offering's scale is renamed like its course code.
+    conn.execute(
+        update(grade_scales).where(grade_scales.c.id == bindparam("b_id")).values(name=bindparam("b_name")),
+        [{"b_id": scale.id, "b_name": scale.name[:length - len(suffix)] + suffix} for scale in scales],
+    )
+    copy_ids = conn.execute(
+        insert(grade_scales).returning(grade_scales.c.id, sort_by_parameter_order=True),
+        [{"name": scale.name, "course_id": clones[scale.course_id]} for scale in scales],
+    ).scalars().all()
+    copies = dict(zip([scale.id for scale in scales], copy_ids))
+    conn.execute(insert(grade_scale_steps), [
+        {"scale_id": copies[step.scale_id], "min_percentage": step.min_percentage, "letter_grade": step.letter_grade}
+        for step in conn.execute(select(grade_scale_steps).where(grade_scale_steps.c.scale_id.in_(copies)))
+    ])
+    return len(scales)
+
+
+def _clone_courses(job: Job, old: Any, new: Any, academic_year: Optional[str], dry_run: bool, chunk_size: int, max_report: int) -> Dict[str, Any]:
+    pending = and_(courses.c.semester_id == old.id, courses.c.is_active.is_(True))
+    archived = cloned = scales_copied = 0
+    report: List[Dict[str, Any]] = []
+    skipped: List[Dict[str, Any]] = []
+
+    for conn, ids in _chunks(engine.connect if dry_run else engine.begin, courses.c.id, pending, chunk_size):
+        planned, chunk_skipped = _plan_courses(conn, ids, old, new)
+        skipped.extend(chunk_skipped)
+        clones = [step for step in planned if step["clone"]]
+        report.extend(
+            {"course_code": step["row"].course_code, "archived_as": step["archived_code"], "cloned_as": step["code"] if step["clone"] else None}
+            for step in planned[:max(max_report - len(report), 0)]
+        )
+        if not dry_run and planned:
+            # Rename the old offerings first so their plain codes are free for the clones.
+            conn.execute(
+                update(courses).where(courses.c.id == bindparam("b_id")).values(course_code=bindparam("b_code"), is_active=False),
+                [{"b_id": step["row"].id, "b_code": step["archived_code"]} for step in planned],
+            )
+            if clones:
+                clone_ids = conn.execute(insert(courses).returning(courses.c.id, sort_by_parameter_order=True), [
+                    {
+                        "course_code": step["code"],
+                        "course_name": step["row"].course_name,
+                        "description": step["row"].description,
+                        "credits": step["row"].credits,
+                        "faculty_id": step["row"].faculty_id,
+                        "semester": new.name,
+                        "semester_id": new.id,
+                        "academic_year": academic_year or step["row"].academic_year,
+                        "is_active": True,
+                    }
+                    for step in clones
+                ]).scalars().all()
+                scales_copied += _copy_grade_scales(conn, {step["row"].id: clone_id for step, clone_id in zip(clones, clone_ids)}, old)
+        elif clones:
+            scales_copied += conn.execute(
+                select(func.count()).select_from(grade_scales).where(grade_scales.c.course_id.in_([step["row"].id for step in clones]))
+            ).scalar()
+        archived += len(planned)
+        cloned += len(clones)
+        if not dry_run:
+            job.update(phase="courses", courses_archived=archived, courses_cloned=cloned, courses_skipped=len(skipped), grade_scales_copied=scales_copied)
+
+    return {
+        "archived": archived,
+        "cloned": cloned,
+        "grade_scales_copied": scales_copied,
+        "offerings": report,
+        "offerings_truncated": archived > len(report),
+        "skipped": skipped,
+    }
+
+
+def _archive_semester(old: Any, new: Any) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            update(semesters).where(semesters.c.id == old.id, semesters.c.archived_at.is_(None))
+            .values(archived_at=datetime.now(timezone.utc))
+        )
+        conn.execute(update(semesters).where(semesters.c.id != new.id, semesters.c.is_current.is_(True)).values(is_current=False))
+        conn.execute(update(semesters).where(semesters.c.id == new.id).values(is_current=True))
+
+
+def roll_over_semester(
+    job: Job,
+    to_semester_id: int,
+    from_semester_id: Optional[int] = None,
+    advance_year_level: bool = True,
+    program_years: Optional[Dict[str, int]] = None,
+    academic_year: Optional[str] = None,
+    dry_run: bool = False,
+    chunk_size: int = 1000,
+    max_report: int = 100,
+) -> Dict[str, Any]:
+    with engine.connect() as conn:
+        old, new = resolve_semesters(conn, from_semester_id, to_semester_id)
+    result: Dict[str, Any] = {"from": old.name, "to": new.name, "dry_run": dry_run}
+
+    try:
+        result["students"] = _roll_students(job, old, new, advance_year_level, program_years or {}, dry_run, chunk_size)
+        result["enrollments"] = _close_enrollments(job, old, dry_run, chunk_size)
+        result["courses"] = _clone_courses(job, old, new, academic_year, dry_run, chunk_size, max_report)
+        if not dry_run:
+            _archive_semester(old, new)
+        result["archived"] = not dry_run
+    finally:
+        if not dry_run:
+            semester_lookup.invalidate()
+            response_cache.invalidate("semesters", "students", "courses", "enrollments")
+    if not dry_run:
+        job.update(phase="done")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--to", required=True, help="Name of the semester to roll over into")
+    parser.add_argument("--from", dest="from_", help="Name of the semester to roll over from (default: the current one)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--no-advance", action="store_true", help="Keep year levels (mid-year rollover)")
+    parser.add_argument("--program-years", action="append", default=[], metavar="PROGRAM=YEARS",
+                        help=f"Length of a program in years (default {settings.DEFAULT_PROGRAM_YEARS}); repeatable")
+    parser.add_argument("--academic-year", help="Academic year for the cloned courses (default: copied)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    program_years = {}
+    for value in args.program_years:
+        program, _, years = value.rpartition("=")
+        if not program or not years.isdigit():
+            parser.error(f"--program-years expects PROGRAM=YEARS, got {value!r}")
+        program_years[program] = int(years)
+
+    setup_logging()
+    with engine.connect() as conn:
+        ids = dict(conn.execute(select(semesters.c.name, semesters.c.id).where(semesters.c.name.in_([args.to, args.from_]))).all())
+    if args.to not in ids or (args.from_ and args.from_ not in ids):
+        parser.error("Semester not found")
+
+    result = roll_over_semester(
+        CommandLineJob("semester_rollover"), ids[args.to], ids.get(args.from_), not args.no_advance,
+        program_years, args.academic_year, args.dry_run, args.chunk_size,
+    )
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
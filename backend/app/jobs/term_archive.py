@@ -0,0 +1,174 @@
+"""Archive attendance and grades of closed terms to compressed files.
+
+Rows dated before the cutoff are written a calendar month at a time to gzip-compressed JSON
+Lines files under ``ARCHIVE_DIR/<table>/`` and then removed from the database. On a
+partitioned Postgres table (see ``app.db.partitioning``) a month with its own partition is
+exported under a lock and the partition is dropped, instead of deleting its rows. The cutoff
+defaults to the start of the month in which the latest archived semester ended.
+
+A file is finished (renamed into place) before its rows are removed, so an interrupted run
+can leave an archived month both on disk and in the database, but never in neither; running
+again archives what is left into a new file.
+
+    python -m app.jobs.term_archive archive --dry-run
+    python -m app.jobs.term_archive archive --before 2025-07-01 --table attendance
+    python -m app.jobs.term_archive partition attendance grades
+"""
+import argparse
+import gzip
+import json
+import os
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Table, delete, func, select, text
+
+from app.core.config import settings
+from app.core.jobs import CommandLineJob, Job
+from app.core.logging_config import setup_logging
+from app.db.database import engine
+from app.db.models import Attendance, Grade, Semester
+from app.db.partitioning import PARTITION_KEYS, is_partitioned, month_start, next_month, partition_name, partition_table, partitions
+
+
+semesters = Semester.__table__
+
+TABLES: Dict[str, Table] = {"attendance": Attendance.__table__, "grades": Grade.__table__}
+
+
+def default_cutoff(conn: Any) -> Optional[date]:
+    """Start of the month in which the most recently ended archived semester ended."""
+    end = conn.execute(select(func.max(semesters.c.end_date)).where(semesters.c.archived_at.isnot(None))).scalar()
+    return month_start(end) if end else None
+
+
+def _archive_path(table_name: str, month: date) -> Path:
+    # Timestamped, so rows backdated into an already archived month go to a file of their own.
+    return Path(settings.ARCHIVE_DIR) / table_name / f"{month:%Y-%m}.{int(time.time())}.jsonl.gz"
+
+
+def archived_before(table_name: str) -> Optional[date]:
+    """End of the latest month of ``table_name`` with a finished archive file; None before the first archive run."""
+    months = [
+        date.fromisoformat(f"{path.name.split('.')[0]}-01")
+        for path in (Path(settings.ARCHIVE_DIR) / table_name).glob("*.jsonl.gz")
+    ]
+    return next_month(max(months)) if months else None
+
+
+def _export(conn: Any, table: Table, condition: Any, path: Path, chunk_size: int) -> List[int]:
+    """Write the rows matching ``condition`` to ``path``; returns their ids."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    ids: List[int] = []
+    with gzip.open(tmp, "wt", encoding="utf-8") as out:
+        last_id = 0
+        while True:
+            rows = conn.execute(select(table).where(condition, table.c.id > last_id).order_by(table.c.id).limit(chunk_size)).all()
+            if not rows:
+                break
+            for row in rows:
+                out.write(json.dumps(dict(row._mapping), default=str, separators=(",", ":")))
+                out.write("\n")
+            ids.extend(row.id for row in rows)
+            last_id = rows[-1].id
+    if ids:
+        os.replace(tmp, path)
+    else:
+        tmp.unlink()
+    return ids
+
+
+def _archive_month(table_name: str, month: date, partitioned: bool, chunk_size: int) -> int:
+    table = TABLES[table_name]
+    key = table.c[PARTITION_KEYS[table_name]]
+    in_month = (key >= month) & (key < next_month(month))
+    path = _archive_path(table_name, month)
+
+    with engine.begin() as conn:
+        if partitioned and partition_name(table_name, month) in partitions(conn, table_name):
+            partition = partition_name(table_name, month)
+            # Block writes to the month until its partition is gone, so nothing lands unexported.
+            conn.execute(text(f"LOCK TABLE {partition} IN SHARE MODE"))
+            ids = _export(conn, table, in_month, path, chunk_size)
+            conn.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {partition}"))
+            conn.execute(text(f"DROP TABLE {partition}"))
+            return len(ids)
+        ids = _export(conn, table, in_month, path, chunk_size)
+
+    # Only the exported rows are removed; any written meanwhile stay for the next run.
+    for start in range(0, len(ids), chunk_size):
+        with engine.begin() as conn:
+            conn.execute(delete(table).where(table.c.id.in_(ids[start:start + chunk_size])))
+    return len(ids)
+
+
+def archive_closed_terms(
+    job: Job,
+    before: Optional[date] = None,
+    tables: Sequence[str] = tuple(TABLES),
+    dry_run: bool = False,
+    chunk_size: int = 5000,
+) -> Dict[str, Any]:
+    with engine.connect() as conn:
+        cutoff = month_start(before) if before else default_cutoff(conn)
+        if cutoff is None:
+            raise ValueError("No archived semester with an end date; pass the date to archive before")
+        plan = {}
+        for table_name in tables:
+            key = TABLES[table_name].c[PARTITION_KEYS[table_name]]
+            counts = {
+                row.month: row.rows
+                for row in conn.execute(
+                    select(func.min(key).label("month"), func.count().label("rows"))
+                    .where(key < cutoff)
+                    .group_by(func.extract("year", key), func.extract("month", key))
+                )
+            }
+            plan[table_name] = {
+                "partitioned": is_partitioned(conn, table_name),
+                "months": {month_start(day).isoformat(): rows for day, rows in sorted(counts.items())},
+            }
+
+    result: Dict[str, Any] = {"before": cutoff.isoformat(), "dry_run": dry_run, "tables": {}}
+    for table_name, table_plan in plan.items():
+        archived: Dict[str, int] = {}
+        if not dry_run:
+            for month in table_plan["months"]:
+                archived[month] = _archive_month(table_name, date.fromisoformat(month), table_plan["partitioned"], chunk_size)
+                job.update(table=table_name, month=month, archived=sum(archived.values()))
+        result["tables"][table_name] = {
+            "partitioned": table_plan["partitioned"],
+            "months": table_plan["months"] if dry_run else archived,
+            "rows": sum((table_plan["months"] if dry_run else archived).values()),
+        }
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive = commands.add_parser("archive", help="Move rows of closed terms to compressed files")
+    archive.add_argument("--before", type=date.fromisoformat, help="Archive rows dated before this month (default: end of the last archived semester)")
+    archive.add_argument("--table", action="append", choices=sorted(TABLES), help="Limit to a table; repeatable")
+    archive.add_argument("--dry-run", action="store_true", help="Report the rows per month without archiving")
+    archive.add_argument("--chunk-size", type=int, default=5000)
+    partition = commands.add_parser("partition", help="Convert tables to monthly partitions (PostgreSQL; locks each table while copying)")
+    partition.add_argument("tables", nargs="+", choices=sorted(TABLES))
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        if args.command == "partition":
+            result: Any = {table_name: partition_table(engine, table_name) for table_name in args.tables}
+        else:
+            result = archive_closed_terms(CommandLineJob("term_archive"), args.before, args.table or tuple(TABLES), args.dry_run, args.chunk_size)
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
 from datetime import datetime, date as DateType
 
 
@@ -38,6 +38,16 @@ class AttendanceWithDetails(AttendanceResponse):
     course_code: Optional[str] = None
 
 
+class AttendanceSummary(BaseModel):
+    student_id: int
+    course_id: int
+    sessions: int
+    present: int
+    absent: int
+    percentage: Optional[float] = None
+    current_streak: int
+
+
 class GradeBase(BaseModel):
     student_id: int
     course_id: int
@@ -80,3 +90,91 @@ class GradeWithDetails(GradeResponse):
     student_code: Optional[str] = None
     course_name: Optional[str] = None
     course_code: Optional[str] = None
+
+
+class GradeHistogram(BaseModel):
+    edges: List[float]
+    counts: List[int]
+
+
+class GradeScoreStatistics(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    std: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    percentiles: Dict[str, float]
+    histogram: GradeHistogram
+
+
+class GradeStatistics(GradeScoreStatistics):
+    course_id: int
+    assessment_type: str
+    assessment_name: str
+
+
+class GradeCurveRequest(BaseModel):
+    course_id: int
+    assessment_name: str
+    method: Literal["none", "linear", "zscore"]
+    target_mean: Optional[float] = Field(default=None, ge=0, le=100)
+    target_max: float = Field(default=100, gt=0, le=100)
+    target_std: Optional[float] = Field(default=None, ge=0, le=50)
+    dry_run: bool = False
+
+
+class GradeCurveResult(BaseModel):
+    course_id: int
+    assessment_name: str
+    method: str
+    dry_run: bool
+    updated: int
+    letter_grades: Dict[str, int]
+    before: GradeScoreStatistics
+    after: GradeScoreStatistics
+
+
+# Most marks one bulk request or CSV import may carry.
+GRADE_BULK_MAX_ROWS = 5000
+
+
+class GradeBulkRow(BaseModel):
+    student_id: Optional[int] = None
+    student_code: Optional[str] = None  # STU001 format, when student_id is not given
+    score: float = Field(..., ge=0)
+    letter_grade: Optional[str] = Field(default=None, max_length=5)
+    remarks: Optional[str] = None
+
+
+class GradeBulkAssessment(BaseModel):
+    course_id: int
+    assessment_type: str
+    assessment_name: str = Field(..., min_length=1, max_length=255)
+    max_score: float = Field(..., gt=0)
+    date_assessed: Optional[DateType] = None
+    dry_run: bool = False
+
+
+class GradeBulkCreate(GradeBulkAssessment):
+    grades: List[GradeBulkRow] = Field(..., min_length=1, max_length=GRADE_BULK_MAX_ROWS)
+
+
+class GradeBulkRowResult(BaseModel):
+    row: int
+    student_id: Optional[int] = None
+    grade_id: Optional[int] = None
+    status: Literal["created", "updated", "error"]
+    percentage: Optional[float] = None
+    letter_grade: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class GradeBulkResult(BaseModel):
+    course_id: int
+    assessment_name: str
+    dry_run: bool
+    created: int
+    updated: int
+    errors: int
+    rows: List[GradeBulkRowResult]
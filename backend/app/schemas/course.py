@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 
 
 class CourseBase(BaseModel):
@@ -29,6 +29,7 @@ class CourseUpdate(BaseModel):
 
 class CourseResponse(CourseBase):
     id: int
+    semester_id: Optional[int] = None
     faculty_id: Optional[int] = None
     is_active: bool
     created_at: datetime
@@ -41,3 +42,15 @@ class CourseResponse(CourseBase):
 class CourseWithFaculty(CourseResponse):
     faculty_name: Optional[str] = None
     faculty_email: Optional[str] = None
+
+
+class CourseRosterEntry(BaseModel):
+    student_id: int
+    student_code: str
+    full_name: str
+    email: str
+    enrollment_status: str
+    enrollment_date: Optional[date] = None
+    attendance_id: Optional[int] = None
+    attendance_status: Optional[str] = None
+    attendance_notes: Optional[str] = None
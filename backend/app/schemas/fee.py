@@ -81,9 +81,15 @@ class FeeRecordPaymentResponse(BaseModel):
     reference_no: Optional[str] = None
     notes: Optional[str] = None
     status: str
+    voided_at: Optional[datetime] = None
+    void_reason: Optional[str] = None
     created_at: datetime
 
 
+class FeePaymentVoid(BaseModel):
+    reason: str = Field(..., min_length=1, max_length=500)
+
+
 class FeeSummaryResponse(BaseModel):
     total_fee_assigned: Decimal
     total_collected: Decimal
@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class GradeStep(BaseModel):
+    min_percentage: float = Field(..., ge=0, le=100)
+    letter_grade: str = Field(..., min_length=1, max_length=5)
+
+    class Config:
+        from_attributes = True
+
+
+class GradeScaleBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    steps: List[GradeStep] = Field(..., min_length=1, description="Lowest percentage for each letter grade")
+
+
+class GradeScaleCreate(GradeScaleBase):
+    course_id: Optional[int] = Field(default=None, description="Scale for this course only")
+    program: Optional[str] = Field(default=None, description="Scale for students in this program")
+
+
+class GradeScaleUpdate(BaseModel):
+    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    steps: Optional[List[GradeStep]] = Field(default=None, min_length=1)
+
+
+class GradeScaleResponse(GradeScaleBase):
+    id: int
+    course_id: Optional[int] = None
+    program: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    recompute_job_id: Optional[str] = Field(
+        default=None,
+        description="Job rewriting the stored letters this scale covers; letters entered by hand are kept",
+    )
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,58 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+from datetime import date, datetime
+
+
+class JobResponse(BaseModel):
+    id: str
+    name: str
+    status: str
+    params: Dict[str, Any]
+    progress: Dict[str, Any]
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class FeeLedgerCheckRequest(BaseModel):
+    repair: bool = False
+    chunk_size: int = Field(default=5000, ge=100, le=50000)
+
+
+class FeeStatementsRequest(BaseModel):
+    chunk_size: int = Field(default=200, ge=10, le=5000)
+
+
+class SemesterRolloverRequest(BaseModel):
+    to_semester_id: int
+    from_semester_id: Optional[int] = None
+    dry_run: bool = False
+    advance_year_level: bool = True
+    program_years: Dict[str, int] = Field(default_factory=dict, description="Program length in years, by program")
+    academic_year: Optional[str] = None
+    chunk_size: int = Field(default=1000, ge=100, le=50000)
+
+
+class TermArchiveRequest(BaseModel):
+    before: Optional[date] = Field(default=None, description="Archive rows dated before this month; defaults to the end of the last archived semester")
+    tables: List[Literal["attendance", "grades"]] = Field(default_factory=lambda: ["attendance", "grades"], min_length=1)
+    dry_run: bool = False
+    chunk_size: int = Field(default=5000, ge=100, le=50000)
+
+
+class ReportingSnapshotRequest(BaseModel):
+    full: bool = False
+    chunk_size: int = Field(default=50000, ge=1000, le=200000)
+
+
+class GradeLettersRequest(BaseModel):
+    course_id: Optional[int] = None
+    program: Optional[str] = None
+    dry_run: bool = False
+    chunk_size: int = Field(default=5000, ge=100, le=50000)
+    include_manual: bool = Field(default=False, description="Also replace letters entered by hand")
@@ -0,0 +1,62 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+
+
+class SnapshotTableStatus(BaseModel):
+    table: str
+    rows: int
+    refreshed_at: datetime
+
+
+class AttendanceByProgramRow(BaseModel):
+    program: Optional[str] = None
+    students: int
+    sessions: int
+    present: int
+    percentage: Optional[float] = None
+
+
+class AttendanceByProgramReport(BaseModel):
+    snapshot_at: datetime
+    rows: List[AttendanceByProgramRow]
+
+
+class GradeBucket(BaseModel):
+    letter_grade: Optional[str] = None
+    count: int
+    share: float
+
+
+class GradeDistributionReport(BaseModel):
+    snapshot_at: datetime
+    count: int
+    mean: Optional[float] = None
+    p25: Optional[float] = None
+    median: Optional[float] = None
+    p75: Optional[float] = None
+    grades: List[GradeBucket]
+
+
+class FeeAgingBucket(BaseModel):
+    bucket: str
+    records: int
+    outstanding: Decimal
+
+
+class FeeAgingReport(BaseModel):
+    snapshot_at: datetime
+    as_of: date
+    buckets: List[FeeAgingBucket]
+
+
+class EnrollmentByProgramRow(BaseModel):
+    program: Optional[str] = None
+    status: Optional[str] = None
+    enrollments: int
+
+
+class EnrollmentByProgramReport(BaseModel):
+    snapshot_at: datetime
+    rows: List[EnrollmentByProgramRow]
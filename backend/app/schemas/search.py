@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    type: str
+    id: int
+    title: str
+    subtitle: str
+    score: float
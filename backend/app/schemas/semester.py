@@ -24,7 +24,12 @@ class SemesterResponse(SemesterBase):
     is_current: bool
     start_date: Optional[date] = None
     end_date: Optional[date] = None
+    archived_at: Optional[datetime] = None
     created_at: datetime
     
     class Config:
         from_attributes = True
+
+
+class CurrentSemesterResponse(SemesterBase):
+    id: int
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, Literal
 from datetime import datetime, date
+from decimal import Decimal
 
 
 class StudentBase(BaseModel):
@@ -44,6 +45,7 @@ class StudentUpdate(BaseModel):
 class StudentResponse(StudentBase):
     id: int
     user_id: int
+    current_semester_id: Optional[int] = None
     gpa: Optional[float] = None
     status: Optional[str] = "active"
     created_at: datetime
@@ -59,3 +61,10 @@ class StudentWithUser(StudentResponse):
     profile_picture: Optional[str] = None
     is_active: bool
     status: Optional[str] = "active"
+
+
+class StudentListItem(StudentWithUser):
+    fee_assigned: Decimal
+    fee_paid: Decimal
+    fee_outstanding: Decimal
+    fee_overdue_count: int
@@ -0,0 +1,152 @@
+"""Compare attendance percentages from the raw rows with popcounts on the attendance bitmaps.
+
+Builds a throwaway SQLite database of synthetic marks (the defaults make 10M: 20000 students,
+5 courses each, 100 days), the bitmaps for it, and times a student's per-course summary and a
+course's per-student summary over a date range both ways:
+
+    python -m benchmarks.attendance_bitmaps
+    python -m benchmarks.attendance_bitmaps --students 2000 --days 60 --samples 50
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, case, create_engine, func, select, text
+
+from app.db.attendance_bitmaps import attendance, bitmaps, load_bitmaps, rebuild_attendance_bitmaps, summarize
+from app.db.database import Base
+
+
+FIRST_DAY = date(2026, 1, 5)
+
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def _seed(conn: Any, students: int, courses: int, days: int) -> None:
+    # Generated in SQL: every student takes `courses` of the courses, with a mark on each day.
+    conn.execute(text(f"""
+        WITH RECURSIVE
+            s(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM s WHERE n < {students}),
+            c(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM c WHERE n < {courses - 1}),
+            d(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM d WHERE n < {days - 1})
+        INSERT INTO attendance (student_id, course_id, date, status)
+        SELECT s.n, (s.n + c.n * 7) % 40 + 1, date('{FIRST_DAY.isoformat()}', '+' || d.n || ' days'),
+               CASE WHEN (s.n * 7 + c.n * 13 + d.n * 31) % 10 < 8 THEN 'present' ELSE 'absent' END
+        FROM s, c, d
+    """))
+
+
+def _table_bytes(conn: Any, *names: str) -> Optional[int]:
+    try:
+        return conn.execute(
+            text(f"SELECT sum(pgsize) FROM dbstat WHERE name IN ({', '.join(repr(name) for name in names)})")
+        ).scalar()
+    except Exception:
+        return None
+
+
+def _rows_by_student(conn: Any, student_id: int, date_from: date, date_to: date) -> List[Dict[str, Any]]:
+    present = func.sum(case((attendance.c.status == "present", 1), else_=0))
+    rows = conn.execute(
+        select(attendance.c.course_id, func.count().label("sessions"), present.label("present"))
+        .where(attendance.c.student_id == student_id, attendance.c.date.between(date_from, date_to))
+        .group_by(attendance.c.course_id)
+        .order_by(attendance.c.course_id)
+    )
+    return [{"student_id": student_id, "course_id": row.course_id, "sessions": row.sessions, "present": row.present} for row in rows]
+
+
+def _rows_by_course(conn: Any, course_id: int, date_from: date, date_to: date) -> List[Dict[str, Any]]:
+    present = func.sum(case((attendance.c.status == "present", 1), else_=0))
+    rows = conn.execute(
+        select(attendance.c.student_id, func.count().label("sessions"), present.label("present"))
+        .where(and_(attendance.c.course_id == course_id, attendance.c.date.between(date_from, date_to)))
+        .group_by(attendance.c.student_id)
+        .order_by(attendance.c.student_id)
+    )
+    return [{"student_id": row.student_id, "course_id": course_id, "sessions": row.sessions, "present": row.present} for row in rows]
+
+
+def _bitmap_summaries(conn: Any, date_from: date, date_to: date, student_id: Optional[int] = None, course_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    result = []
+    for row in load_bitmaps(conn, student_id, [course_id] if course_id else None):
+        summary = summarize(row, date_from, date_to)
+        if summary["sessions"]:
+            result.append({"student_id": row.student_id, "course_id": row.course_id, "sessions": summary["sessions"], "present": summary["present"]})
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--courses", type=int, default=5, help="Courses per student (out of 40)")
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=200, help="Students queried per timing")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database", help="SQLite file to build (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.database or os.path.join(tempfile.mkdtemp(), "attendance_bitmaps.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[attendance, bitmaps])
+    report: Dict[str, Any] = {"marks": args.students * args.courses * args.days}
+
+    with engine.begin() as conn:
+        started = time.perf_counter()
+        _seed(conn, args.students, args.courses, args.days)
+        report["seed_s"] = round(time.perf_counter() - started, 1)
+    with engine.begin() as conn:
+        started = time.perf_counter()
+        report["bitmap_rows"] = rebuild_attendance_bitmaps(conn)
+        report["build_bitmaps_s"] = round(time.perf_counter() - started, 1)
+
+    date_from = FIRST_DAY + timedelta(days=args.days // 4)
+    date_to = FIRST_DAY + timedelta(days=args.days * 3 // 4)
+    sample = random.Random(0).sample(range(1, args.students + 1), min(args.samples, args.students))
+    course_id = 1
+
+    with engine.connect() as conn:
+        report["attendance_bytes"] = _table_bytes(conn, "attendance", *[index.name for index in attendance.indexes])
+        report["bitmap_bytes"] = _table_bytes(conn, "attendance_bitmaps", *[index.name for index in bitmaps.indexes])
+        for student_id in sample:
+            if _rows_by_student(conn, student_id, date_from, date_to) != _bitmap_summaries(conn, date_from, date_to, student_id=student_id):
+                raise SystemExit(f"student {student_id}: bitmap summary differs from the row aggregate")
+        if _rows_by_course(conn, course_id, date_from, date_to) != sorted(_bitmap_summaries(conn, date_from, date_to, course_id=course_id), key=lambda row: row["student_id"]):
+            raise SystemExit(f"course {course_id}: bitmap summary differs from the row aggregate")
+
+        cases = {
+            f"student_summary_x{len(sample)}": (
+                lambda: [_rows_by_student(conn, student_id, date_from, date_to) for student_id in sample],
+                lambda: [_bitmap_summaries(conn, date_from, date_to, student_id=student_id) for student_id in sample],
+            ),
+            "course_summary": (
+                lambda: _rows_by_course(conn, course_id, date_from, date_to),
+                lambda: _bitmap_summaries(conn, date_from, date_to, course_id=course_id),
+            ),
+        }
+        for name, (rows_fn, bitmap_fn) in cases.items():
+            rows_s = _best_of(args.repeat, rows_fn)
+            bitmap_s = _best_of(args.repeat, bitmap_fn)
+            report[name] = {
+                "rows_ms": round(rows_s * 1000, 2),
+                "bitmap_ms": round(bitmap_s * 1000, 2),
+                "speedup": round(rows_s / bitmap_s, 1) if bitmap_s else None,
+            }
+    report["database"] = path
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
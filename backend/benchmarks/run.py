@@ -0,0 +1,220 @@
+"""Drive the key API endpoints with concurrent clients and report latency percentiles as JSON.
+
+Seed the database first (``python -m benchmarks.seed``), start the server against the same
+DATABASE_URL and SECRET_KEY, then run from the backend directory:
+
+    python -m benchmarks.run --base-url http://127.0.0.1:8000 --concurrency 16 --duration 15
+    python -m benchmarks.run --in-process --scenario students_list --output results.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core.security import create_access_token
+from app.db.database import engine
+from app.db.models import Course, Enrollment, Student, StudentCourseFee, User
+from benchmarks.seed import BENCH_ADMIN_EMAIL
+
+
+RequestSpec = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+class Fixtures:
+    """Ids sampled from the seeded database so requests hit real rows."""
+
+    def __init__(self, sample_size: int = 2000):
+        with engine.connect() as conn:
+            admin_id = conn.execute(select(User.id).where(User.email == BENCH_ADMIN_EMAIL)).scalar()
+            if admin_id is None:
+                raise SystemExit("No benchmark data found; run `python -m benchmarks.seed` first.")
+            self.token = create_access_token({"sub": admin_id, "email": BENCH_ADMIN_EMAIL, "role": "admin"})
+            self.student_ids = list(conn.execute(select(Student.id).limit(sample_size)).scalars())
+            self.course_ids = list(conn.execute(select(Course.id).limit(sample_size)).scalars())
+            self.enrollments = [tuple(row) for row in conn.execute(
+                select(Enrollment.student_id, Enrollment.course_id).limit(sample_size)
+            )]
+            self.open_fee_ids = list(conn.execute(
+                select(StudentCourseFee.id).where(StudentCourseFee.balance_amount >= 100).limit(sample_size)
+            ).scalars())
+            self.counts = {
+                model.__tablename__: conn.execute(select(func.count()).select_from(model)).scalar()
+                for model in (Student, Course, Enrollment, StudentCourseFee)
+            }
+        self.rng = random.Random(7)
+        # Attendance marks go to far-future dates so each request creates a new row.
+        self.attendance_days = itertools.count()
+
+
+def _scenarios(fx: Fixtures) -> Dict[str, Callable[[], RequestSpec]]:
+    rng = fx.rng
+
+    def mark_attendance() -> RequestSpec:
+        student_id, course_id = rng.choice(fx.enrollments)
+        day = date(2030, 1, 1) + timedelta(days=next(fx.attendance_days))
+        return "POST", "/api/academic/attendance/", {
+            "student_id": student_id, "course_id": course_id, "date": day.isoformat(), "status": "present",
+        }
+
+    def post_payment() -> RequestSpec:
+        record_id = rng.choice(fx.open_fee_ids)
+        return "POST", f"/api/fees/records/{record_id}/payments", {
+            "payment_date": date.today().isoformat(), "amount": "1.00", "mode": "cash",
+        }
+
+    return {
+        "students_list": lambda: ("GET", "/api/students/?limit=100", None),
+        "students_detail": lambda: ("GET", f"/api/students/{rng.choice(fx.student_ids)}", None),
+        "courses_list": lambda: ("GET", "/api/courses/?limit=100", None),
+        "enrollments_list": lambda: ("GET", "/api/enrollments/?limit=100", None),
+        "attendance_list": lambda: ("GET", f"/api/academic/attendance/?course_id={rng.choice(fx.course_ids)}&limit=100", None),
+        "grades_list": lambda: ("GET", f"/api/academic/grades/?course_id={rng.choice(fx.course_ids)}&limit=100", None),
+        "fee_records_list": lambda: ("GET", "/api/fees/records?limit=100", None),
+        "fee_summary": lambda: ("GET", "/api/fees/summary", None),
+        "attendance_mark": mark_attendance,
+        "fee_payment": post_payment,
+    }
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient,
+    build: Callable[[], RequestSpec],
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int],
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    issued = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            if max_requests is not None and next(issued) >= max_requests:
+                return
+            method, path, body = build()
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            key = str(response.status_code)
+            statuses[key] = statuses.get(key, 0) + 1
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "status_codes": statuses,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+            "p50": round(_percentile(ordered, 50) * 1000, 2),
+            "p95": round(_percentile(ordered, 95) * 1000, 2),
+            "p99": round(_percentile(ordered, 99) * 1000, 2),
+            "max": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        },
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    fx = Fixtures()
+    scenarios = _scenarios(fx)
+    selected = args.scenario or list(scenarios)
+    unknown = [name for name in selected if name not in scenarios]
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(unknown)}. Choose from: {', '.join(scenarios)}")
+
+    headers = {"Authorization": f"Bearer {fx.token}"}
+    if args.in_process:
+        from main import app
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://benchmark", headers=headers, timeout=60)
+    else:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=60, limits=limits)
+
+    results: Dict[str, Any] = {}
+    async with client:
+        for name in selected:
+            # A short warm-up keeps connection setup and first-query compilation out of the numbers.
+            await _run_scenario(client, scenarios[name], min(args.concurrency, 4), 1.0, 20)
+            results[name] = await _run_scenario(client, scenarios[name], args.concurrency, args.duration, args.requests)
+            summary = results[name]
+            print(
+                f"{name:<18} {summary['requests']:>7} req  {summary['throughput_rps']:>8} rps  "
+                f"p50 {summary['latency_ms']['p50']:>8} ms  p95 {summary['latency_ms']['p95']:>8} ms  "
+                f"p99 {summary['latency_ms']['p99']:>8} ms  errors {summary['errors']}",
+                file=sys.stderr,
+            )
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "target": "in-process" if args.in_process else args.base_url,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "dataset": fx.counts,
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--in-process", action="store_true", help="Call the ASGI app directly instead of over HTTP")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument("--requests", type=int, default=None, help="Cap on requests per scenario")
+    parser.add_argument("--scenario", action="append", help="Scenario to run (repeatable); defaults to all")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(payload + "\n")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
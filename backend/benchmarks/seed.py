@@ -0,0 +1,257 @@
+"""Seed the configured database with synthetic data for benchmarking.
+
+Usage (from the backend directory, against DATABASE_URL or the local SQLite file):
+
+    python -m benchmarks.seed --scale small
+    python -m benchmarks.seed --scale large --students 80000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List
+
+from sqlalchemy import insert, select
+
+from app.db.database import engine
+from app.db.fee_balances import refresh_fee_balances
+from app.db.models import (
+    Attendance,
+    Base,
+    Course,
+    Enrollment,
+    Grade,
+    RoleEnum,
+    Semester,
+    Student,
+    StudentCourseFee,
+    StudentCourseFeePayment,
+    User,
+)
+
+
+BENCH_ADMIN_EMAIL = "bench-admin@example.com"
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "tiny": {
+        "students": 500, "courses": 40, "enrollments": 3000, "attendance": 30000,
+        "grades": 6000, "fee_records": 2000,
+    },
+    "small": {
+        "students": 5000, "courses": 200, "enrollments": 50000, "attendance": 500000,
+        "grades": 100000, "fee_records": 20000,
+    },
+    "large": {
+        "students": 50000, "courses": 2000, "enrollments": 500000, "attendance": 5000000,
+        "grades": 1000000, "fee_records": 200000,
+    },
+}
+
+PROGRAMS = ["Computer Science", "Electrical Engineering", "Mechanical Engineering", "Business", "Mathematics", "Physics"]
+SEMESTERS = ["Spring 2025", "Fall 2025", "Spring 2026", "Fall 2026"]
+ASSESSMENTS = [("quiz", "Quiz"), ("assignment", "Assignment"), ("midterm", "Midterm"), ("project", "Project"), ("final", "Final")]
+PAYMENT_MODES = ["cash", "upi", "card", "bank_transfer", "cheque", "online"]
+TERM_START = date(2026, 1, 5)
+CHUNK_SIZE = 10000
+
+
+def _chunks(rows: Iterable[dict], size: int = CHUNK_SIZE) -> Iterator[List[dict]]:
+    chunk: List[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bulk_insert(conn, model, rows: Iterable[dict]) -> int:
+    started = time.perf_counter()
+    total = 0
+    for chunk in _chunks(rows):
+        conn.execute(insert(model), chunk)
+        total += len(chunk)
+    print(f"  {model.__tablename__:<30} {total:>10} rows in {time.perf_counter() - started:6.1f}s")
+    return total
+
+
+def _ids(conn, statement) -> List[int]:
+    return list(conn.execute(statement).scalars())
+
+
+def _letter(percentage: float) -> str:
+    for threshold, letter in ((90, "A+"), (80, "A"), (75, "B+"), (70, "B"), (65, "C+"), (60, "C"), (50, "D")):
+        if percentage >= threshold:
+            return letter
+    return "F"
+
+
+def seed(counts: Dict[str, int], rng_seed: int = 42) -> None:
+    rng = random.Random(rng_seed)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        if conn.execute(select(User.id).where(User.email == BENCH_ADMIN_EMAIL)).first():
+            raise SystemExit("Benchmark data already present; seed into an empty database.")
+
+        n_students = counts["students"]
+        n_courses = counts["courses"]
+        n_faculty = max(1, n_courses // 4)
+
+        print(f"Seeding with {counts}")
+        _bulk_insert(conn, Semester, (
+            {"name": name, "is_current": name == SEMESTERS[-1]} for name in SEMESTERS
+        ))
+        semester_id = conn.execute(select(Semester.id).where(Semester.name == SEMESTERS[-1])).scalar()
+
+        def users() -> Iterator[dict]:
+            yield {"email": BENCH_ADMIN_EMAIL, "full_name": "Benchmark Admin", "role": RoleEnum.ADMIN, "is_active": True}
+            for i in range(n_faculty):
+                yield {"email": f"faculty{i}@bench.example.com", "full_name": f"Faculty {i}", "role": RoleEnum.FACULTY, "is_active": True}
+            for i in range(n_students):
+                yield {"email": f"student{i}@bench.example.com", "full_name": f"Student {i:06d}", "role": RoleEnum.STUDENT, "is_active": True}
+        _bulk_insert(conn, User, users())
+
+        faculty_ids = _ids(conn, select(User.id).where(User.email.like("faculty%@bench.example.com")).order_by(User.id))
+        student_user_ids = _ids(conn, select(User.id).where(User.email.like("student%@bench.example.com")).order_by(User.id))
+
+        _bulk_insert(conn, Student, ({
+            "user_id": student_user_ids[i],
+            "student_id": f"BENCH{i:07d}",
+            "program": rng.choice(PROGRAMS),
+            "current_semester": SEMESTERS[-1],
+            "current_semester_id": semester_id,
+            "year_level": rng.randint(1, 4),
+            "enrollment_year": rng.randint(2022, 2026),
+            "enrollment_date": TERM_START - timedelta(days=rng.randint(0, 1400)),
+            "gpa": round(rng.uniform(2.0, 4.0), 2),
+            "status": "active",
+            "address": f"{rng.randint(1, 999)} Benchmark Street",
+        } for i in range(n_students)))
+
+        _bulk_insert(conn, Course, ({
+            "course_code": f"BC{i:05d}",
+            "course_name": f"Benchmark Course {i}",
+            "credits": rng.randint(1, 6),
+            "faculty_id": faculty_ids[i % n_faculty],
+            "semester": SEMESTERS[-1],
+            "semester_id": semester_id,
+            "academic_year": "2026-27",
+            "is_active": True,
+        } for i in range(n_courses)))
+
+        student_ids = _ids(conn, select(Student.id).where(Student.student_id.like("BENCH%")).order_by(Student.id))
+        course_ids = _ids(conn, select(Course.id).where(Course.course_code.like("BC%")).order_by(Course.id))
+
+        # Every (student, course) pair is unique, matching what the enrollment API allows.
+        per_student = max(1, min(n_courses, counts["enrollments"] // n_students))
+        pairs = [
+            (student_id, course_id)
+            for student_id in student_ids
+            for course_id in rng.sample(course_ids, per_student)
+        ]
+        _bulk_insert(conn, Enrollment, ({
+            "student_id": student_id,
+            "course_id": course_id,
+            "enrollment_date": TERM_START,
+            "status": "active",
+        } for student_id, course_id in pairs))
+
+        sessions_per_pair = max(1, counts["attendance"] // len(pairs))
+        _bulk_insert(conn, Attendance, ({
+            "student_id": student_id,
+            "course_id": course_id,
+            "date": TERM_START + timedelta(days=day),
+            "status": "present" if rng.random() < 0.85 else "absent",
+        } for student_id, course_id in pairs for day in range(sessions_per_pair)))
+
+        grades_per_pair = max(1, counts["grades"] // len(pairs))
+
+        def grades() -> Iterator[dict]:
+            for student_id, course_id in pairs:
+                for index in range(grades_per_pair):
+                    assessment_type, label = ASSESSMENTS[index % len(ASSESSMENTS)]
+                    score = round(rng.uniform(30, 100), 2)
+                    yield {
+                        "student_id": student_id,
+                        "course_id": course_id,
+                        "assessment_type": assessment_type,
+                        "assessment_name": f"{label} {index // len(ASSESSMENTS) + 1}",
+                        "score": score,
+                        "max_score": 100,
+                        "percentage": score,
+                        "letter_grade": _letter(score),
+                        "date_assessed": TERM_START + timedelta(days=7 * (index + 1)),
+                    }
+        _bulk_insert(conn, Grade, grades())
+
+        fee_pairs = pairs[: counts["fee_records"]]
+        paid_amounts = [Decimal(rng.choice([0, 0, 250, 500, 1000])) for _ in fee_pairs]
+        today = date.today()
+
+        def fee_records() -> Iterator[dict]:
+            for (student_id, course_id), paid in zip(fee_pairs, paid_amounts):
+                due_date = today + timedelta(days=rng.randint(-30, 60))
+                balance = Decimal("1000.00") - paid
+                status = "paid" if balance <= 0 else ("overdue" if due_date < today else "pending")
+                yield {
+                    "student_id": student_id,
+                    "course_id": course_id,
+                    "issue_date": due_date - timedelta(days=30),
+                    "due_date": due_date,
+                    "fee_amount": Decimal("1000.00"),
+                    "late_fee_amount": Decimal("50.00"),
+                    "total_amount": Decimal("1000.00"),
+                    "paid_amount": paid,
+                    "balance_amount": balance,
+                    "status": status,
+                }
+        _bulk_insert(conn, StudentCourseFee, fee_records())
+        fee_ids = {
+            (student_id, course_id): fee_id
+            for fee_id, student_id, course_id in conn.execute(
+                select(StudentCourseFee.id, StudentCourseFee.student_id, StudentCourseFee.course_id)
+                .where(StudentCourseFee.student_id.in_(select(Student.id).where(Student.student_id.like("BENCH%"))))
+            )
+        }
+
+        def payments() -> Iterator[dict]:
+            for index, (pair, paid) in enumerate(zip(fee_pairs, paid_amounts)):
+                if paid > 0:
+                    yield {
+                        "payment_no": f"BENCHPAY{index:09d}",
+                        "fee_record_id": fee_ids[pair],
+                        "student_id": pair[0],
+                        "payment_date": today - timedelta(days=rng.randint(0, 30)),
+                        "amount": paid,
+                        "mode": rng.choice(PAYMENT_MODES),
+                        "status": "posted",
+                    }
+        _bulk_insert(conn, StudentCourseFeePayment, payments())
+        # Core inserts skip the ORM hook that gives each student a balance row; student lists inner-join it.
+        refresh_fee_balances(conn, student_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible data")
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name, help=f"Override {name} count")
+    args = parser.parse_args()
+
+    counts = dict(SCALES[args.scale])
+    for name in counts:
+        override = getattr(args, name)
+        if override is not None:
+            counts[name] = override
+
+    started = time.perf_counter()
+    seed(counts, rng_seed=args.seed)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
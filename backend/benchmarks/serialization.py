@@ -0,0 +1,145 @@
+"""Compare the per-row model serialization path with the single-pass row serializer.
+
+Runs without a database on synthetic rows shaped like the list endpoints return:
+
+    python -m benchmarks.serialization --rows 1000 --repeat 20
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.serialization import dump_json
+from app.schemas.academic import AttendanceWithDetails, GradeWithDetails
+from app.schemas.enrollment import EnrollmentResponse, EnrollmentWithDetails
+from app.schemas.student import StudentResponse, StudentWithUser
+
+
+NOW = datetime(2026, 1, 5, 9, 30, tzinfo=timezone.utc)
+
+_response_fields: Dict[Any, TypeAdapter] = {}
+
+
+def _fastapi_response(result: List[Any], response_model: Any) -> bytes:
+    # What FastAPI does with a returned list: validate against response_model, encode, json.dumps.
+    field = _response_fields.get(response_model)
+    if field is None:
+        field = _response_fields.setdefault(response_model, TypeAdapter(response_model))
+    validated = field.validate_python(result)
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _student_rows(n: int) -> List[Dict[str, Any]]:
+    return [{
+        "id": i, "user_id": i, "student_id": f"S{i:06d}", "date_of_birth": date(2004, 1, 1), "phone": "555-0100",
+        "address": "1 Benchmark Street", "gender": "F", "enrollment_date": date(2024, 8, 1), "year_level": 2,
+        "enrollment_year": 2024, "program": "Computer Science", "current_semester": "Fall 2026", "gpa": 3.4,
+        "status": "active", "created_at": NOW, "updated_at": None,
+        "email": f"s{i}@example.com", "full_name": f"Student {i}", "profile_picture": None, "is_active": True,
+    } for i in range(n)]
+
+
+def _enrollment_rows(n: int) -> List[Dict[str, Any]]:
+    return [{
+        "id": i, "student_id": i, "course_id": i % 50, "enrollment_date": date(2026, 1, 5), "status": "active",
+        "created_at": NOW, "updated_at": None, "student_name": f"Student {i}", "student_email": f"s{i}@example.com",
+        "student_code": f"S{i:06d}", "course_name": "Algorithms", "course_code": "CS201",
+    } for i in range(n)]
+
+
+def _attendance_rows(n: int) -> List[Dict[str, Any]]:
+    return [{
+        "id": i, "student_id": i, "course_id": 1, "date": date(2026, 2, 1), "status": "present", "notes": None,
+        "created_at": NOW, "updated_at": None, "student_name": f"Student {i}", "student_code": f"S{i:06d}",
+        "course_name": "Algorithms", "course_code": "CS201",
+    } for i in range(n)]
+
+
+def _grade_rows(n: int) -> List[Dict[str, Any]]:
+    return [{
+        "id": i, "student_id": i, "course_id": 1, "assessment_type": "quiz", "assessment_name": "Quiz 1",
+        "score": Decimal("42.50"), "max_score": Decimal("50.00"), "percentage": Decimal("85.00"), "letter_grade": "A",
+        "date_assessed": date(2026, 2, 1), "remarks": None, "created_at": NOW, "updated_at": None,
+        "student_name": f"Student {i}", "student_code": f"S{i:06d}", "course_name": "Algorithms", "course_code": "CS201",
+    } for i in range(n)]
+
+
+def _legacy_students(rows: List[Dict[str, Any]]) -> bytes:
+    result = []
+    for row in rows:
+        user = SimpleNamespace(email=row["email"], full_name=row["full_name"], profile_picture=row["profile_picture"], is_active=row["is_active"])
+        student = SimpleNamespace(**row, user=user)
+        student_dict = StudentResponse.model_validate(student).model_dump()
+        student_dict.update({
+            "email": student.user.email,
+            "full_name": student.user.full_name,
+            "profile_picture": student.user.profile_picture,
+            "is_active": student.user.is_active,
+        })
+        result.append(StudentWithUser(**student_dict))
+    return _fastapi_response(result, List[StudentWithUser])
+
+
+def _legacy_enrollments(rows: List[Dict[str, Any]]) -> bytes:
+    result = []
+    for row in rows:
+        enrollment_dict = EnrollmentResponse.model_validate(SimpleNamespace(**row)).model_dump()
+        enrollment_dict.update({key: row[key] for key in ("student_name", "student_email", "student_code", "course_name", "course_code")})
+        result.append(EnrollmentWithDetails(**enrollment_dict))
+    return _fastapi_response(result, List[EnrollmentWithDetails])
+
+
+def _legacy_rows(model: Any) -> Callable[[List[Dict[str, Any]]], bytes]:
+    def serialize(rows: List[Dict[str, Any]]) -> bytes:
+        return _fastapi_response([model(**row) for row in rows], List[model])
+    return serialize
+
+
+CASES = {
+    "students": (_student_rows, _legacy_students, List[StudentWithUser]),
+    "enrollments": (_enrollment_rows, _legacy_enrollments, List[EnrollmentWithDetails]),
+    "attendance": (_attendance_rows, _legacy_rows(AttendanceWithDetails), List[AttendanceWithDetails]),
+    "grades": (_grade_rows, _legacy_rows(GradeWithDetails), List[GradeWithDetails]),
+}
+
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    report = {}
+    for name, (make_rows, legacy, response_model) in CASES.items():
+        rows = make_rows(args.rows)
+        if json.loads(legacy(rows)) != json.loads(dump_json(rows, response_model)):
+            raise SystemExit(f"{name}: fast path output differs from the legacy path")
+        legacy_s = _best_of(args.repeat, lambda: legacy(rows))
+        fast_s = _best_of(args.repeat, lambda: dump_json(rows, response_model))
+        report[name] = {
+            "rows": args.rows,
+            "legacy_ms": round(legacy_s * 1000, 2),
+            "fast_ms": round(fast_s * 1000, 2),
+            "speedup": round(legacy_s / fast_s, 1) if fast_s else None,
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,25 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from sqlalchemy import inspect, text
 from app.core.config import settings
+from app.core import metrics, query_inspector
+from app.core.list_query import NEXT_CURSOR_HEADER
+from app.core.logging_config import setup_logging
 from app.api.v1.router import api_router
-from app.db.database import engine
+from app.api.v1.endpoints.fees import IDEMPOTENT_REPLAY_HEADER
+from app.db.database import engine, replica_engine
 from app.db import models
+from app.db.attendance_bitmaps import backfill_attendance_bitmaps
+from app.db.fee_balances import backfill_fee_balances
+from app.db.partitioning import ensure_partitions
+from app.db.search_index import setup_search_index
+from app.db.semesters import backfill_semester_ids
+from app.jobs.reporting_snapshot import start_snapshot_schedule
 import logging
+import time
 
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -39,8 +50,63 @@ def drop_legacy_fee_tables() -> None:
     logger.info("Dropped legacy fee tables: %s", ", ".join(tables_to_drop))
 
 
+# Single-column indexes made redundant by composite indexes that lead with the same column.
+REDUNDANT_INDEXES = {
+    "attendance": ["ix_attendance_student_id", "ix_attendance_course_id"],
+    "grades": ["ix_grades_course_id"],
+}
+
+
+def drop_redundant_indexes() -> None:
+    """Drop indexes that older versions created and the models no longer declare."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table_name, index_names in REDUNDANT_INDEXES.items():
+            if table_name not in existing_tables:
+                continue
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+            for index_name in index_names:
+                if index_name in existing_indexes:
+                    conn.execute(text(f"DROP INDEX {index_name}"))
+                    logger.info("Dropped redundant index %s", index_name)
+
+
+def add_missing_columns() -> None:
+    """create_all skips tables that already exist, so add nullable columns declared after a table was created."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table in models.Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                logger.info("Added column %s.%s", table.name, column.name)
+
+
+def create_missing_indexes() -> None:
+    """create_all skips tables that already exist, so add indexes declared after a table was created."""
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 drop_legacy_fee_tables()
 models.Base.metadata.create_all(bind=engine)
+add_missing_columns()
+create_missing_indexes()
+drop_redundant_indexes()
+ensure_partitions(engine)
+backfill_semester_ids(engine)
+setup_search_index(engine)
+backfill_fee_balances(engine)
+backfill_attendance_bitmaps(engine)
+start_snapshot_schedule()
 
 def check_oauth_config():
     providers = {
@@ -99,8 +165,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, IDEMPOTENT_REPLAY_HEADER],
 )
 
+metrics.instrument_engine(engine, "primary")
+if replica_engine is not None:
+    metrics.instrument_engine(replica_engine, "replica")
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    stats = metrics.begin_request()
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # Label by route template (e.g. /api/students/{student_id}) to keep cardinality bounded.
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        metrics.observe_request(request.method, route_path, status_code, time.perf_counter() - start, stats)
+
+
+if settings.QUERY_INSPECTOR_ENABLED:
+    query_inspector.inspect_engine(engine)
+    if replica_engine is not None:
+        query_inspector.inspect_engine(replica_engine)
+
+    @app.middleware("http")
+    async def inspect_request_queries(request: Request, call_next):
+        query_log = query_inspector.begin_request()
+        response = await call_next(request)
+        query_inspector.report_request(request.method, request.url.path, query_log)
+        db_ms = query_log.db_seconds * 1000
+        response.headers["X-DB-Query-Count"] = str(query_log.query_count)
+        response.headers["X-DB-Time-Ms"] = f"{db_ms:.1f}"
+        response.headers["Server-Timing"] = f"db;dur={db_ms:.1f}"
+        return response
+
+
 app.include_router(api_router, prefix="/api")
 
 
@@ -117,9 +222,23 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        logger.error("Health check database probe failed: %s", exc)
+        return JSONResponse(
+            status_code=503,
+            content={"status": "❌ Unhealthy", "database": "Unavailable"},
+        )
     return {"status": "✅ Healthy", "database": "Connected"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/favicon.ico")
 async def favicon():
     return Response(status_code=204)
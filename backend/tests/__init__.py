@@ -0,0 +1,6 @@
+"""Tests run against a scratch SQLite database: app.db.database builds its engine from DATABASE_URL on import."""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
@@ -0,0 +1,47 @@
+import unittest
+from datetime import date
+
+from app.core.jobs import Job
+from app.db.database import SessionLocal, engine
+from app.db.models import AttendanceBitmap, Base, Course, Student, User
+from app.jobs.cascade_delete import count_dependents, delete_with_dependents
+
+
+class DeleteWithDependentsTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        user = User(email="s1@example.com", full_name="Student One")
+        self.db.add(user)
+        self.db.flush()
+        self.student = Student(user_id=user.id, student_id="S1")
+        self.courses = [Course(course_code=f"C{n}", course_name=f"Course {n}") for n in (1, 2)]
+        self.db.add_all([self.student, *self.courses])
+        self.db.flush()
+        self.db.add_all([
+            AttendanceBitmap(student_id=self.student.id, course_id=course.id, start_date=date(2026, 9, 1))
+            for course in self.courses
+        ])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_course_delete_keeps_bitmaps_of_other_courses(self):
+        removed, kept = self.courses
+        result = delete_with_dependents(Job("delete_courses", {}), "courses", removed.id, chunk_size=1)
+
+        self.assertEqual(result["dependents_deleted"]["attendance_bitmaps"], 1)
+        remaining = self.db.query(AttendanceBitmap.student_id, AttendanceBitmap.course_id).all()
+        self.assertEqual(remaining, [(self.student.id, kept.id)])
+
+    def test_count_dependents_stops_past_the_limit(self):
+        with engine.connect() as conn:
+            # Two bitmaps and the fee balance row.
+            self.assertEqual(count_dependents(conn, "students", self.student.id, 10), 3)
+            self.assertEqual(count_dependents(conn, "students", self.student.id, 1), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,20 @@
+import unittest
+
+import numpy as np
+
+from app.core.grading import curve
+
+
+class CurveTest(unittest.TestCase):
+    def test_linear_moves_top_and_mean(self):
+        curved = curve(np.array([50, 70, 90]), "linear", target_mean=80, target_max=95)
+        self.assertEqual(curved.tolist(), [65.0, 80.0, 95.0])
+
+    def test_linear_rejects_target_mean_not_below_target_max(self):
+        for target_mean in (90, 95):
+            with self.assertRaises(ValueError):
+                curve(np.array([50, 70, 90]), "linear", target_mean=target_mean, target_max=90)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -41,7 +41,7 @@ export default function CreateFeeRecordPage() {
 
   const { data: students = [] } = useQuery({
     queryKey: ['fee-students'],
-    queryFn: () => studentsApi.getStudents({ limit: 1000 }),
+    queryFn: () => studentsApi.getStudents({ limit: 1000, fields: 'student_id,full_name' }),
   })
 
   const { data: studentCourses = [] } = useQuery({
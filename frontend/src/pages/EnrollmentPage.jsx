@@ -33,7 +33,7 @@ const EnrollmentPage = () => {
 
   const fetchStudents = async () => {
     try {
-      const response = await api.get('/students/');
+      const response = await api.get('/students/', { params: { fields: 'student_id,full_name' } });
       const sorted = [...response.data].sort((a, b) =>
         (a.student_id || '').localeCompare(b.student_id || '', undefined, { numeric: true, sensitivity: 'base' })
       );
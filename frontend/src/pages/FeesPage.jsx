@@ -1,12 +1,16 @@
 import { useState } from 'react'
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
 import { useNavigate } from 'react-router-dom'
-import { CreditCard, Edit, Plus, Trash2, Wallet, X } from 'lucide-react'
+import { CreditCard, Download, Edit, Plus, Trash2, Wallet, X } from 'lucide-react'
 import { feesApi } from '../services/api'
 import { useAuthStore } from '../store/authStore'
 
 const todayDate = () => new Date().toISOString().split('T')[0]
 
+// One key per payment dialog, so a resubmitted or retried payment is not posted twice.
+const newIdempotencyKey = () =>
+  globalThis.crypto?.randomUUID?.() ?? `${Date.now()}-${Math.random().toString(36).slice(2)}`
+
 export default function FeesPage() {
   const navigate = useNavigate()
   const queryClient = useQueryClient()
@@ -46,7 +50,7 @@ export default function FeesPage() {
   })
 
   const paymentMutation = useMutation({
-    mutationFn: ({ id, payload }) => feesApi.addPayment(id, payload),
+    mutationFn: ({ id, payload, idempotencyKey }) => feesApi.addPayment(id, payload, idempotencyKey),
     onSuccess: () => {
       queryClient.invalidateQueries(['fee-records'])
       queryClient.invalidateQueries(['fee-summary'])
@@ -91,7 +95,7 @@ export default function FeesPage() {
   }
 
   const openPaymentModal = (record) => {
-    setPaymentModal({ open: true, record })
+    setPaymentModal({ open: true, record, idempotencyKey: newIdempotencyKey() })
     setPaymentForm((prev) => ({ ...prev, amount: String(record.balance_amount) }))
   }
 
@@ -101,6 +105,7 @@ export default function FeesPage() {
 
     paymentMutation.mutate({
       id: paymentModal.record.id,
+      idempotencyKey: paymentModal.idempotencyKey,
       payload: {
         payment_date: paymentForm.payment_date,
         amount: Number(paymentForm.amount),
@@ -111,15 +116,28 @@ export default function FeesPage() {
     })
   }
 
+  const downloadStatement = async () => {
+    const blob = await feesApi.getMyStatement()
+    const url = URL.createObjectURL(blob)
+    window.open(url, '_blank')
+    setTimeout(() => URL.revokeObjectURL(url), 60000)
+  }
+
   if (isStudent) {
     const studentRecords = studentDashboard?.records || []
     const studentSummary = studentDashboard?.summary
 
     return (
       <div className="space-y-6">
-        <div>
-          <h1 className="text-2xl font-bold text-white">My Fees</h1>
-          <p className="text-slate-400 mt-1">You can view fees only for courses in which you are enrolled.</p>
+        <div className="flex items-center justify-between gap-4">
+          <div>
+            <h1 className="text-2xl font-bold text-white">My Fees</h1>
+            <p className="text-slate-400 mt-1">You can view fees only for courses in which you are enrolled.</p>
+          </div>
+          <button type="button" onClick={downloadStatement} className="btn-primary">
+            <Download className="w-4 h-4 mr-1" />
+            Download Statement
+          </button>
         </div>
 
         <div className="grid grid-cols-1 md:grid-cols-3 gap-3">
@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react';
 import { useNavigate, useLocation } from 'react-router-dom';
 import { ArrowLeft, ClipboardCheck, BookOpen, User, ChevronLeft, ChevronRight, CheckCircle, XCircle, Calendar } from 'lucide-react';
 import api from '../lib/api';
+import { coursesApi } from '../services/api';
 
 const MarkAttendancePage = () => {
   const navigate = useNavigate();
@@ -9,18 +10,18 @@ const MarkAttendancePage = () => {
   const backPath = location.state?.from || '/dashboard';
   const backLabel = backPath === '/dashboard/attendance' ? 'Back to Attendance' : 'Back to Dashboard';
   
-  const [students, setStudents] = useState([]);
-  const [selectedStudent, setSelectedStudent] = useState(null);
-  const [enrolledCourses, setEnrolledCourses] = useState([]);
+  const [courses, setCourses] = useState([]);
   const [selectedCourse, setSelectedCourse] = useState(null);
+  const [roster, setRoster] = useState([]);
+  const [selectedStudent, setSelectedStudent] = useState(null);
   const [currentMonth, setCurrentMonth] = useState(new Date());
   const [attendanceRecords, setAttendanceRecords] = useState({});
   const [existingAttendance, setExistingAttendance] = useState({});
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
   const [loading, setLoading] = useState(false);
-  const [fetchingStudents, setFetchingStudents] = useState(true);
-  const [fetchingCourses, setFetchingCourses] = useState(false);
+  const [fetchingCourses, setFetchingCourses] = useState(true);
+  const [fetchingRoster, setFetchingRoster] = useState(false);
   const [saving, setSaving] = useState(false);
 
   const toLocalISODate = (date) => {
@@ -37,14 +38,14 @@ const MarkAttendancePage = () => {
   };
 
   useEffect(() => {
-    fetchStudents();
+    fetchCourses();
   }, []);
 
   useEffect(() => {
-    if (selectedStudent) {
-      fetchEnrolledCourses();
+    if (selectedCourse) {
+      fetchRoster();
     }
-  }, [selectedStudent]);
+  }, [selectedCourse]);
 
   useEffect(() => {
     if (selectedStudent && selectedCourse) {
@@ -52,42 +53,39 @@ const MarkAttendancePage = () => {
     }
   }, [selectedStudent, selectedCourse, currentMonth]);
 
-  const fetchStudents = async () => {
-    setFetchingStudents(true);
+  const fetchCourses = async () => {
+    setFetchingCourses(true);
     try {
-      const response = await api.get('/students/', { params: { limit: 1000 } });
-      const sorted = [...response.data].sort((a, b) =>
-        (a.student_id || '').localeCompare(b.student_id || '', undefined, { numeric: true, sensitivity: 'base' })
+      const data = await coursesApi.getCourses({ limit: 1000 });
+      const sorted = [...data].sort((a, b) =>
+        (a.course_code || '').localeCompare(b.course_code || '', undefined, { numeric: true, sensitivity: 'base' })
       );
-      setStudents(sorted);
+      setCourses(sorted);
     } catch (err) {
-      console.error('Failed to fetch students:', err);
-      setError('Failed to load students');
+      console.error('Failed to fetch courses:', err);
+      setError('Failed to load courses');
     } finally {
-      setFetchingStudents(false);
+      setFetchingCourses(false);
     }
   };
 
-  const fetchEnrolledCourses = async () => {
-    setFetchingCourses(true);
-    setEnrolledCourses([]);
-    setSelectedCourse(null);
+  const fetchRoster = async () => {
+    setFetchingRoster(true);
+    setRoster([]);
+    setSelectedStudent(null);
     try {
-      const response = await api.get('/enrollments/', { params: { student_id: selectedStudent.id } });
-      const activeEnrollments = response.data.filter(e => e.status === 'active' || e.status === 'completed');
-      
-      const coursesWithDetails = activeEnrollments.map(enrollment => ({
-        id: enrollment.course_id,
-        course_code: enrollment.course_code,
-        course_name: enrollment.course_name,
-        enrollment_date: enrollment.enrollment_date
-      }));
-      
-      setEnrolledCourses(coursesWithDetails);
+      // Only the course's enrolled students, already ordered by student code.
+      const entries = await coursesApi.getRoster(selectedCourse.id);
+      setRoster(entries.map(entry => ({
+        id: entry.student_id,
+        student_id: entry.student_code,
+        full_name: entry.full_name,
+        enrollment_date: entry.enrollment_date
+      })));
     } catch (err) {
-      console.error('Failed to fetch enrolled courses:', err);
+      console.error('Failed to fetch course roster:', err);
     } finally {
-      setFetchingCourses(false);
+      setFetchingRoster(false);
     }
   };
 
@@ -136,7 +134,7 @@ const MarkAttendancePage = () => {
   };
 
   const handleDateClick = (day) => {
-    if (!selectedCourse) return;
+    if (!selectedCourse || !selectedStudent) return;
     
     const dateKey = formatDateKey(day);
     const today = new Date();
@@ -146,8 +144,8 @@ const MarkAttendancePage = () => {
     if (clickedDate > today) return;
     
     // Check if date is before enrollment date
-    if (selectedCourse.enrollment_date) {
-      const enrollmentDate = parseISODateToLocal(selectedCourse.enrollment_date);
+    if (selectedStudent.enrollment_date) {
+      const enrollmentDate = parseISODateToLocal(selectedStudent.enrollment_date);
       enrollmentDate.setHours(0, 0, 0, 0);
       if (clickedDate < enrollmentDate) return;
     }
@@ -185,8 +183,8 @@ const MarkAttendancePage = () => {
 
   const handlePrevMonth = () => {
     // Check if we can go to previous month based on enrollment date
-    if (selectedCourse?.enrollment_date) {
-      const enrollmentDate = parseISODateToLocal(selectedCourse.enrollment_date);
+    if (selectedStudent?.enrollment_date) {
+      const enrollmentDate = parseISODateToLocal(selectedStudent.enrollment_date);
       const prevMonth = new Date(currentMonth.getFullYear(), currentMonth.getMonth() - 1, 1);
       const enrollmentMonthStart = new Date(enrollmentDate.getFullYear(), enrollmentDate.getMonth(), 1);
       if (prevMonth < enrollmentMonthStart) return;
@@ -255,8 +253,8 @@ const MarkAttendancePage = () => {
 
   // Check if we can navigate to previous month
   const canGoPrevMonth = (() => {
-    if (!selectedCourse?.enrollment_date) return true;
-    const enrollmentDate = parseISODateToLocal(selectedCourse.enrollment_date);
+    if (!selectedStudent?.enrollment_date) return true;
+    const enrollmentDate = parseISODateToLocal(selectedStudent.enrollment_date);
     const prevMonth = new Date(currentMonth.getFullYear(), currentMonth.getMonth() - 1, 1);
     const enrollmentMonthStart = new Date(enrollmentDate.getFullYear(), enrollmentDate.getMonth(), 1);
     return prevMonth >= enrollmentMonthStart;
@@ -284,7 +282,7 @@ const MarkAttendancePage = () => {
             </div>
             <div>
               <h1 className="text-3xl font-bold text-white">Mark Attendance</h1>
-              <p className="text-slate-400">Select student, course and mark attendance on calendar</p>
+              <p className="text-slate-400">Select course, student and mark attendance on calendar</p>
             </div>
           </div>
 
@@ -301,34 +299,34 @@ const MarkAttendancePage = () => {
           )}
 
           <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
-            {/* Left Panel - Student & Course Selection */}
+            {/* Left Panel - Course & Student Selection */}
             <div className="space-y-6">
-              {/* Student Selection */}
+              {/* Course Selection */}
               <div>
                 <label className="block text-sm font-medium text-slate-300 mb-2">
-                  <User className="inline w-4 h-4 mr-2" />
-                  Select Student
+                  <BookOpen className="inline w-4 h-4 mr-2" />
+                  Select Course
                 </label>
-                {fetchingStudents ? (
+                {fetchingCourses ? (
                   <div className="flex items-center justify-center py-4">
                     <div className="w-6 h-6 border-2 border-amber-500 border-t-transparent rounded-full animate-spin" />
                   </div>
                 ) : (
                   <div className="relative">
                     <select
-                      value={selectedStudent?.id || ''}
+                      value={selectedCourse?.id || ''}
                       onChange={(e) => {
-                        const student = students.find(s => s.id === parseInt(e.target.value));
-                        setSelectedStudent(student || null);
+                        const course = courses.find(c => c.id === parseInt(e.target.value));
+                        setSelectedCourse(course || null);
                         setAttendanceRecords({});
                         setExistingAttendance({});
                       }}
                       className="w-full px-4 pr-10 py-3 bg-slate-700 border border-slate-600 rounded-lg text-white focus:outline-none focus:ring-2 focus:ring-amber-500 focus:border-transparent appearance-none cursor-pointer"
                     >
-                      <option value="">Choose a student...</option>
-                      {students.map((student) => (
-                        <option key={student.id} value={student.id}>
-                          {student.full_name} ({student.student_id})
+                      <option value="">Choose a course...</option>
+                      {courses.map((course) => (
+                        <option key={course.id} value={course.id}>
+                          {course.course_code} - {course.course_name}
                         </option>
                       ))}
                     </select>
@@ -341,34 +339,34 @@ const MarkAttendancePage = () => {
                 )}
               </div>
 
-              {/* Course Selection */}
-              {selectedStudent && (
+              {/* Student Selection */}
+              {selectedCourse && (
                 <div>
                   <label className="block text-sm font-medium text-slate-300 mb-2">
-                    <BookOpen className="inline w-4 h-4 mr-2" />
-                    Enrolled Courses
+                    <User className="inline w-4 h-4 mr-2" />
+                    Enrolled Students
                   </label>
-                  {fetchingCourses ? (
+                  {fetchingRoster ? (
                     <div className="flex items-center justify-center py-4">
                       <div className="w-6 h-6 border-2 border-amber-500 border-t-transparent rounded-full animate-spin" />
                     </div>
-                  ) : enrolledCourses.length === 0 ? (
+                  ) : roster.length === 0 ? (
                     <div className="p-4 bg-slate-700/50 rounded-lg text-slate-400 text-center">
                       No active enrollments found
                     </div>
                   ) : (
                     <div className="space-y-2 max-h-64 overflow-y-auto custom-scrollbar">
-                      {enrolledCourses.map((course) => (
+                      {roster.map((student) => (
                         <button
-                          key={course.id}
+                          key={student.id}
                           type="button"
                           onClick={() => {
-                            setSelectedCourse(course);
+                            setSelectedStudent(student);
                             setAttendanceRecords({});
                             setExistingAttendance({});
                             // Navigate to enrollment month if current month is before it
-                            if (course.enrollment_date) {
-                              const enrollmentDate = parseISODateToLocal(course.enrollment_date);
+                            if (student.enrollment_date) {
+                              const enrollmentDate = parseISODateToLocal(student.enrollment_date);
                               const enrollmentMonthStart = new Date(enrollmentDate.getFullYear(), enrollmentDate.getMonth(), 1);
                               const currentMonthStart = new Date(currentMonth.getFullYear(), currentMonth.getMonth(), 1);
                               if (currentMonthStart < enrollmentMonthStart) {
@@ -377,16 +375,16 @@ const MarkAttendancePage = () => {
                             }
                           }}
                           className={`w-full p-3 rounded-lg border text-left transition-all ${
-                            selectedCourse?.id === course.id
+                            selectedStudent?.id === student.id
                               ? 'bg-amber-500/20 border-amber-500 text-white'
                               : 'bg-slate-700/50 border-slate-600 text-slate-300 hover:bg-slate-700 hover:border-slate-500'
                           }`}
                         >
-                          <p className="font-medium">{course.course_code}</p>
-                          <p className="text-sm text-slate-400">{course.course_name}</p>
-                          {course.enrollment_date && (
+                          <p className="font-medium">{student.full_name}</p>
+                          <p className="text-sm text-slate-400">{student.student_id}</p>
+                          {student.enrollment_date && (
                             <p className="text-xs text-amber-400 mt-1">
-                              Enrolled: {parseISODateToLocal(course.enrollment_date).toLocaleDateString('en-GB')}
+                              Enrolled: {parseISODateToLocal(student.enrollment_date).toLocaleDateString('en-GB')}
                             </p>
                           )}
                         </button>
@@ -397,7 +395,7 @@ const MarkAttendancePage = () => {
               )}
 
               {/* Legend */}
-              {selectedCourse && (
+              {selectedStudent && (
                 <div className="p-4 bg-slate-700/30 rounded-lg border border-slate-600">
                   <h4 className="text-sm font-medium text-slate-300 mb-3">Legend (Click to cycle)</h4>
                   <div className="space-y-2">
@@ -424,23 +422,23 @@ const MarkAttendancePage = () => {
 
             {/* Right Panel - Calendar */}
             <div className="lg:col-span-2">
-              {!selectedStudent ? (
+              {!selectedCourse ? (
                 <div className="flex flex-col items-center justify-center h-full min-h-[400px] text-slate-400">
-                  <User className="w-16 h-16 mb-4 opacity-50" />
-                  <p>Select a student to begin</p>
+                  <BookOpen className="w-16 h-16 mb-4 opacity-50" />
+                  <p>Select a course to begin</p>
                 </div>
-              ) : !selectedCourse ? (
+              ) : !selectedStudent ? (
                 <div className="flex flex-col items-center justify-center h-full min-h-[400px] text-slate-400">
-                  <BookOpen className="w-16 h-16 mb-4 opacity-50" />
-                  <p>Select a course to view calendar</p>
+                  <User className="w-16 h-16 mb-4 opacity-50" />
+                  <p>Select a student to view calendar</p>
                 </div>
               ) : (
                 <div className="bg-slate-700/30 rounded-xl border border-slate-600 p-6">
                   {/* Enrollment Date Info */}
-                  {selectedCourse?.enrollment_date && (
+                  {selectedStudent?.enrollment_date && (
                     <div className="mb-4 p-3 bg-amber-500/10 border border-amber-500/30 rounded-lg text-amber-400 text-sm">
                       <Calendar className="w-4 h-4 inline mr-2" />
-                      Enrollment started: {parseISODateToLocal(selectedCourse.enrollment_date).toLocaleDateString('en-GB')}
+                      Enrollment started: {parseISODateToLocal(selectedStudent.enrollment_date).toLocaleDateString('en-GB')}
                     </div>
                   )}
 
@@ -503,8 +501,8 @@ const MarkAttendancePage = () => {
                                        attendanceRecords[dateKey] !== existingAttendance[dateKey];
                       
                       // Check if date is before enrollment date
-                      const isBeforeEnrollment = selectedCourse?.enrollment_date 
-                        ? dateObj < parseISODateToLocal(selectedCourse.enrollment_date)
+                      const isBeforeEnrollment = selectedStudent?.enrollment_date 
+                        ? dateObj < parseISODateToLocal(selectedStudent.enrollment_date)
                         : false;
                       const isDisabled = isFuture || isBeforeEnrollment;
                       
@@ -117,6 +117,11 @@ export const coursesApi = {
     return response.data
   },
 
+  getRoster: async (id, date) => {
+    const response = await api.get(`/courses/${id}/roster`, { params: { date } })
+    return response.data
+  },
+
   bulkUpdateSemester: async (semester) => {
     const response = await api.patch(`/courses/bulk/semester?semester=${encodeURIComponent(semester)}`)
     return response.data
@@ -222,8 +227,9 @@ export const feesApi = {
     await api.delete(`/fees/records/${id}`)
   },
 
-  addPayment: async (recordId, data) => {
-    const response = await api.post(`/fees/records/${recordId}/payments`, data)
+  addPayment: async (recordId, data, idempotencyKey) => {
+    const headers = idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined
+    const response = await api.post(`/fees/records/${recordId}/payments`, data, { headers })
     return response.data
   },
 
@@ -232,6 +238,11 @@ export const feesApi = {
     return response.data
   },
 
+  getMyStatement: async () => {
+    const response = await api.get('/fees/my-statement', { responseType: 'blob' })
+    return response.data
+  },
+
   getSummary: async () => {
     const response = await api.get('/fees/summary')
     return response.data
@@ -244,6 +255,11 @@ export const semestersApi = {
     return response.data
   },
 
+  getCurrentSemester: async () => {
+    const response = await api.get('/semesters/current')
+    return response.data
+  },
+
   createSemester: async (data) => {
     const response = await api.post('/semesters/', data)
     return response.data